@@ -0,0 +1,79 @@
+# coding: utf-8
+
+"""Compare decoding a large 'nodes' collection with each JSON codec.
+
+Usage:
+    python benchmarks/bench_json_decode.py [number_of_nodes]
+
+The 'repeated json()' row mimics the previous behavior of
+SConnect._get_result, which decoded the body up to four times.
+"""
+
+from __future__ import print_function
+import json
+import sys
+import timeit
+
+import requests
+
+import steelconnection
+from steelconnection.jsoncodec import CODECS, get_codec
+
+
+def make_response(count):
+    """Build a requests.Response holding a synthetic realm-wide node list."""
+    nodes = [
+        {
+            "id": "node-{:016x}".format(index),
+            "org": "org-Org{}-{:016x}".format(index % 50, index % 50),
+            "site": "site-Site{}-{:016x}".format(index % 2000, index % 2000),
+            "serial": "XN{:014X}".format(index),
+            "model": ("yogi", "panda", "ewok", "grizzly")[index % 4],
+            "location": "Building {}, Floor {}".format(index % 20, index % 5),
+            "sw_version": "2.12.1.{}".format(index % 30),
+            "uplinks": ["uplink-{:016x}".format(index)],
+        }
+        for index in range(count)
+    ]
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps({"items": nodes}).encode("utf-8")
+    return response
+
+
+def repeated_json(response):
+    """Decode the way _get_result used to: up to four parses per response."""
+    if not response.json():
+        return {}
+    elif "items" in response.json():
+        return response.json()["items"]
+    return response.json()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    response = make_response(count)
+    sc = steelconnection.SConnect("bench.realm", connection_attempts=0)
+    size = len(response.content) / 1e6
+    print("Decoding {} nodes ({:.1f} MB)".format(count, size))
+    rows = [("repeated json()", lambda: repeated_json(response))]
+    for name in CODECS:
+        try:
+            sc.codec = get_codec(name)
+        except ImportError:
+            print("{:>16}: not installed".format(name))
+            continue
+        rows.append((name, lambda codec=sc.codec: _decode(sc, codec, response)))
+    for name, func in rows:
+        best = min(timeit.repeat(func, number=1, repeat=5))
+        print("{:>16}: {:8.1f} ms".format(name, best * 1000))
+
+
+def _decode(sc, codec, response):
+    sc.codec = codec
+    return sc._get_result(response)
+
+
+if __name__ == "__main__":
+    main()
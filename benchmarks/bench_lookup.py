@@ -0,0 +1,86 @@
+# coding: utf-8
+
+"""Compare looking up many serials with and without an indexed inventory.
+
+Usage:
+    python benchmarks/bench_lookup.py [number_of_nodes] [number_of_lookups]
+
+The network is replaced by a session returning a prebuilt 'nodes' body,
+so the figures show the client side cost: one download and decode
+per lookup without an inventory, one in total with it.
+"""
+
+from __future__ import print_function
+import json
+import sys
+import timeit
+
+import requests
+
+import steelconnection
+
+
+def make_body(count):
+    """Return a synthetic realm-wide node list as JSON bytes."""
+    nodes = [
+        {
+            "id": "node-{:016x}".format(index),
+            "org": "org-Org{}-{:016x}".format(index % 50, index % 50),
+            "site": "site-Site{}-{:016x}".format(index % 2000, index % 2000),
+            "serial": "XN{:014X}".format(index),
+            "model": ("yogi", "panda", "ewok", "grizzly")[index % 4],
+        }
+        for index in range(count)
+    ]
+    return json.dumps({"items": nodes}).encode("utf-8")
+
+
+def make_sconnect(body, inventory):
+    """Return an SConnect object whose session answers every GET with body."""
+    sc = steelconnection.SConnect(
+        "bench.realm", connection_attempts=0, inventory=inventory
+    )
+    downloads = [0]
+
+    def get(url, params=None, data=None, timeout=None, stream=False):
+        downloads[0] += 1
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers["Content-Type"] = "application/json"
+        response._content = body
+        response._content_consumed = True
+        response.request = requests.Request("GET", url).prepare()
+        return response
+
+    sc.session.get = get
+    return sc, downloads
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    body = make_body(count)
+    step = max(1, count // lookups)
+    serials = ["XN{:014X}".format(index) for index in range(0, count, step)]
+    serials = serials[:lookups]
+    print("Looking up {} serials among {} nodes".format(len(serials), count))
+    for name, inventory in (("streamed scan", None), ("inventory", True)):
+        downloads = []
+
+        def run():
+            sc, counter = make_sconnect(body, inventory)
+            for serial in serials:
+                assert sc.lookup.node(serial) is not None
+            downloads.append(counter[0])
+
+        best = min(timeit.repeat(run, number=1, repeat=3))
+        print(
+            "{:>14}: {:9.1f} ms, {:8.1f} us per lookup, {} downloads".format(
+                name, best * 1000, best / len(serials) * 1e6, downloads[-1]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
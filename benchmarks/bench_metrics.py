@@ -0,0 +1,36 @@
+# coding: utf-8
+
+"""Measure the cost of recording one request in SConnect.stats.
+
+Usage:
+    python benchmarks/bench_metrics.py [number_of_records]
+"""
+
+from __future__ import print_function
+import sys
+import timeit
+
+from steelconnection.metrics import Metrics
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    metrics = Metrics()
+    urls = [
+        "https://realm/api/scm.reporting/1.0/port/port-{:016x}".format(index)
+        for index in range(1000)
+    ]
+
+    def record():
+        for index in range(count):
+            metrics.record("GET", urls[index % 1000], 200, 0.05, 0, 1500)
+
+    best = min(timeit.repeat(record, number=1, repeat=3))
+    print("record(): {:.2f} us per request".format(best / count * 1e6))
+    print("endpoints tracked: {}".format(len(metrics._endpoints)))
+    best = min(timeit.repeat(metrics.prometheus, number=1, repeat=3))
+    print("prometheus(): {:.2f} ms".format(best * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# coding: utf-8
+
+"""Compare filtering a large node list with a compiled Query and a plain loop.
+
+Usage:
+    python benchmarks/bench_query.py [number_of_nodes]
+
+The 'interpreted' row mimics the previous LookUp.iter_find,
+which walked search.items() again for every object.
+"""
+
+from __future__ import print_function
+import sys
+import timeit
+
+from steelconnection.query import Query
+
+
+def make_nodes(count):
+    """Return a synthetic realm-wide node list."""
+    return [
+        {
+            "id": "node-{:016x}".format(index),
+            "site": "site-Site{}-{:016x}".format(index % 2000, index % 2000),
+            "serial": "XN{:014X}".format(index),
+            "model": ("yogi", "panda", "ewok", "grizzly")[index % 4],
+            "state": ("online", "offline")[index % 7 == 0],
+            "location": {"city": "City {}".format(index % 300)},
+        }
+        for index in range(count)
+    ]
+
+
+def interpreted(nodes, search):
+    return [
+        obj for obj in nodes if all(obj[key] == value for key, value in search.items())
+    ]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    nodes = make_nodes(count)
+    search = {"model": "panda", "state": "offline"}
+    richer = {
+        "model": {"$in": ["panda", "yogi"]},
+        "serial": {"$regex": "^XN0000000"},
+        "location.city": {"$ne": "City 1"},
+    }
+    print("Filtering {} nodes".format(count))
+    rows = [
+        ("interpreted", lambda: interpreted(nodes, search)),
+        ("compiled", lambda query=Query(search): list(query.filter(nodes))),
+        ("compiled, richer", lambda query=Query(richer): list(query.filter(nodes))),
+    ]
+    for name, func in rows:
+        best = min(timeit.repeat(func, number=1, repeat=5))
+        print("{:>17}: {:8.1f} ms".format(name, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
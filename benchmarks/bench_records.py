@@ -0,0 +1,75 @@
+# coding: utf-8
+
+"""Compare the memory of a large node list as dicts and as compact records.
+
+Usage:
+    python benchmarks/bench_records.py [number_of_nodes]
+
+Both lists are decoded from the same JSON body, as SConnect does.
+Memory is measured with tracemalloc, so Python 3 is required.
+"""
+
+from __future__ import print_function
+import json
+import sys
+import timeit
+import tracemalloc
+
+from steelconnection.records import Compactor
+
+
+def make_body(count):
+    """Return a synthetic realm-wide node list as JSON text."""
+    nodes = [
+        {
+            "id": "node-{:016x}".format(index),
+            "org": "org-Org{}-{:016x}".format(index % 50, index % 50),
+            "site": "site-Site{}-{:016x}".format(index % 2000, index % 2000),
+            "serial": "XN{:014X}".format(index),
+            "model": ("yogi", "panda", "ewok", "grizzly")[index % 4],
+            "location": "Building {}, Floor {}".format(index % 20, index % 5),
+            "sw_version": "2.12.1.{}".format(index % 30),
+            "state": ("online", "offline")[index % 7 == 0],
+            "uplinks": ["uplink-{:016x}".format(index)],
+        }
+        for index in range(count)
+    ]
+    return json.dumps({"items": nodes})
+
+
+def measure(build):
+    """Return the bytes still allocated by the object that build returns."""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    body = make_body(count)
+    print("Memory of {} nodes".format(count))
+    plain, plain_size = measure(lambda: json.loads(body)["items"])
+    records, records_size = measure(
+        lambda: Compactor().compact("nodes", json.loads(body)["items"])
+    )
+    assert records == plain
+    for name, size in (("dicts", plain_size), ("compact records", records_size)):
+        print("{:>16}: {:7.1f} MB, {:5.0f} bytes per node".format(
+            name, size / 1e6, float(size) / count
+        ))
+    print("{:>16}: {:7.1f} %".format("saved", 100 - 100.0 * records_size / plain_size))
+
+    def read(objects):
+        return sum(1 for obj in objects if obj.get("model") == "panda" and obj["state"])
+
+    for name, objects in (("dicts", plain), ("compact records", records)):
+        best = min(timeit.repeat(lambda: read(objects), number=1, repeat=3))
+        print("{:>16}: {:7.1f} ms to read two fields of every node".format(
+            name, best * 1000
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# coding: utf-8
+
+"""Compare prefix and substring searches with a scan of the collection.
+
+Usage:
+    python benchmarks/bench_search.py [number_of_nodes]
+
+Each figure is the average time of one search, so the scans show the
+cost of filtering every node and the indexes the cost of a binary
+search or an n-gram intersection plus the matches read.
+"""
+
+from __future__ import print_function
+import sys
+import timeit
+
+from steelconnection.search import SearchIndex
+
+
+def make_nodes(count):
+    """Return a synthetic realm-wide node list."""
+    return [
+        {
+            "id": "node-{:016x}".format(index),
+            "serial": "XN{:014X}".format(index * 7919),
+            "name": "{} branch {}".format(
+                ("Skypad", "Hoth", "Endor", "Bespin")[index % 4], index
+            ),
+        }
+        for index in range(count)
+    ]
+
+
+def scan_prefix(nodes, prefix):
+    prefix = prefix.lower()
+    return [
+        node
+        for node in nodes
+        if node["serial"].lower().startswith(prefix)
+        or node["name"].lower().startswith(prefix)
+    ]
+
+
+def scan_contains(nodes, text):
+    text = text.lower()
+    return [
+        node
+        for node in nodes
+        if text in node["serial"].lower() or text in node["name"].lower()
+    ]
+
+
+def measure(label, function, repeat):
+    seconds = min(timeit.repeat(function, number=repeat, repeat=3)) / repeat
+    print("{:<28} {:10.3f} ms".format(label, seconds * 1000))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    nodes = make_nodes(count)
+    prefix = nodes[count // 2]["serial"][:8]
+    text = "branch {}".format(count // 3)
+
+    start = timeit.default_timer()
+    prefixes = SearchIndex(nodes, ("serial", "name"))
+    print(
+        "{:<28} {:10.3f} ms".format(
+            "build prefix index", (timeit.default_timer() - start) * 1000
+        )
+    )
+    start = timeit.default_timer()
+    substrings = SearchIndex(nodes, ("serial", "name"), substring=True)
+    print(
+        "{:<28} {:10.3f} ms".format(
+            "build substring index", (timeit.default_timer() - start) * 1000
+        )
+    )
+    found = prefixes.startswith(prefix)
+    assert sorted(n["id"] for n in found) == sorted(
+        n["id"] for n in scan_prefix(nodes, prefix)
+    )
+    assert substrings.contains(text) == scan_contains(nodes, text)
+
+    measure("prefix, scan", lambda: scan_prefix(nodes, prefix)[:10], 5)
+    measure("prefix, index", lambda: prefixes.startswith(prefix, limit=10), 1000)
+    measure("substring, scan", lambda: scan_contains(nodes, text), 5)
+    measure("substring, index", lambda: substrings.contains(text), 1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# coding: utf-8
+
+"""Compare fleet reports on a list of dicts and on a columnar Snapshot.
+
+Usage:
+    python benchmarks/bench_snapshot.py [number_of_nodes]
+
+Reports: nodes per model, offline nodes per site, and translated model names.
+Memory is measured with tracemalloc on Python 3.
+"""
+
+from __future__ import print_function
+from collections import Counter
+import sys
+import timeit
+
+from steelconnection.lookup import model
+from steelconnection.snapshot import Snapshot, numpy
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+def make_nodes(count):
+    """Return a synthetic realm-wide node list."""
+    return [
+        {
+            "id": "node-{:016x}".format(index),
+            "org": "org-Org{}-{:016x}".format(index % 50, index % 50),
+            "site": "site-Site{}-{:016x}".format(index % 2000, index % 2000),
+            "serial": "XN{:014X}".format(index),
+            "model": ("yogi", "panda", "ewok", "grizzly")[index % 4],
+            "state": ("online", "offline")[index % 7 == 0],
+            "sw_version": "2.12.1.{}".format(index % 30),
+        }
+        for index in range(count)
+    ]
+
+
+def loop_reports(nodes):
+    per_model = Counter(node["model"] for node in nodes)
+    offline = Counter(node["site"] for node in nodes if node["state"] == "offline")
+    names = Counter(model.get(node["model"], node["model"]) for node in nodes)
+    return per_model, offline, names
+
+
+def snapshot_reports(snap):
+    per_model = snap.group_count("model")
+    offline = snap.filter(state="offline").group_count("site")
+    names = snap.map("model", model).group_count("model")
+    return per_model, offline, names
+
+
+def measure(build):
+    """Return the object built and the bytes it allocated."""
+    if tracemalloc is None:
+        return build(), None
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    nodes, list_size = measure(lambda: make_nodes(count))
+    print("Reports over {} nodes".format(count))
+    rows = [("list of dicts", lambda: loop_reports(nodes), list_size)]
+    for use_numpy in (False, True):
+        if use_numpy and numpy is None:
+            print("{:>20}: NumPy not installed".format("snapshot (numpy)"))
+            continue
+        snap, size = measure(lambda: Snapshot.from_objects(nodes, use_numpy=use_numpy))
+        name = "snapshot (numpy)" if use_numpy else "snapshot (array)"
+        rows.append((name, lambda snap=snap: snapshot_reports(snap), size))
+        assert snapshot_reports(snap) == loop_reports(nodes)
+    for name, func, size in rows:
+        best = min(timeit.repeat(func, number=1, repeat=5))
+        memory = "{:7.1f} MB".format(size / 1e6) if size is not None else "n/a"
+        print("{:>20}: {:8.1f} ms, {}".format(name, best * 1000, memory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# coding: utf-8
+
+"""Measure the size and speed of the time series recorder.
+
+Usage:
+    python benchmarks/bench_timeseries.py [number_of_ports] [number_of_minutes]
+
+Each port reports link, speed and state once a minute. The figures show
+the bytes per sample on disk, compared with the JSON lines a script
+would otherwise append, and the time to record, reload and query.
+"""
+
+from __future__ import print_function
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+from steelconnection.timeseries import Recorder
+
+
+def sample(port, minute):
+    """Return a synthetic port status, mostly steady with a few flaps."""
+    flapping = (port + minute) % 97 == 0
+    return {
+        "link": not flapping,
+        "speed": 100 if port % 10 == 0 else 1000,
+        "state": "down" if flapping else "up",
+    }
+
+
+def main():
+    ports = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    minutes = int(sys.argv[2]) if len(sys.argv) > 2 else 1440
+    count = ports * minutes * 3
+    folder = tempfile.mkdtemp()
+    try:
+        path = os.path.join(folder, "fleet.tsr")
+        started = timeit.default_timer()
+        json_size = 0
+        with Recorder(path, capacity=None) as recorder:
+            for minute in range(minutes):
+                timestamp = 1.5e9 + minute * 60
+                for port in range(ports):
+                    status = sample(port, minute)
+                    recorder.record(
+                        "port/port-{}".format(port), status, timestamp=timestamp
+                    )
+                    json_size += len(json.dumps(dict(status, t=timestamp))) + 1
+        record_time = timeit.default_timer() - started
+        size = os.path.getsize(path)
+        print("{} samples".format(count))
+        print(
+            "{:<24} {:10.2f} bytes/sample".format(
+                "JSON lines", float(json_size) / count
+            )
+        )
+        print(
+            "{:<24} {:10.2f} bytes/sample".format("recorder file", float(size) / count)
+        )
+        print("{:<24} {:10.3f} s".format("record", record_time))
+
+        started = timeit.default_timer()
+        loaded = Recorder(path, capacity=None)
+        print("{:<24} {:10.3f} s".format("reload", timeit.default_timer() - started))
+        loaded.close()
+        end = 1.5e9 + minutes * 60
+        seconds = min(
+            timeit.repeat(
+                lambda: loaded.query("port/port-7", "link", start=end - 3600),
+                number=100,
+                repeat=3,
+            )
+        )
+        print("{:<24} {:10.3f} ms".format("query last hour", seconds * 10))
+        seconds = min(
+            timeit.repeat(
+                lambda: loaded.downsample("port/port-7", "link", 3600, how="mean"),
+                number=10,
+                repeat=3,
+            )
+        )
+        print("{:<24} {:10.3f} ms".format("hourly downsample", seconds * 100))
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,15 +27,21 @@ def main():
     appliance = steelconnection.get_input("Enter appliance serial number: ")
     node = sc.lookup.node(appliance)
 
-    ports = sc.get("node/" + node["id"] + "/ports")
+    ports = sc.node_ports(node["id"])
 
     line = "{:14}{:10}{:8}{:8}{:8}"
     print(line.format("\nPort ID", "ifname", "Link", "Speed", "Duplex"))
     print(line.format("-------", "------", "----", "-----", "------"))
 
     for port in ports:
-        resource = "port/{}".format(port["id"])
-        port_status = sc.getstatus(resource)
+        if port["status_error"] is not None:
+            print(
+                line.format(port["port_id"], port["ifname"], "?", "", ""),
+                "status failed:",
+                port["status_error"],
+            )
+            continue
+        port_status = port["status"]
         print(
             line.format(
                 port["port_id"],
@@ -48,15 +48,12 @@ def main(argv):
     org = sc.lookup.org(organization)
     print("\nOrg:", organization, "\tID:", org["id"])
 
-    # Get list of all sites in target organization.
-    sites = sc.get("org/{}/sites".format(org["id"]))
+    # Get all sites and nodes in target organization, joined by id.
+    graph = sc.lookup.graph(orgid=org["id"], collections=("sites", "nodes"))
+    sites = graph.all("sites")
     print(status("site", sites, "in '{}'".format(organization)))
 
-    # Create a map of site id to site name.
-    site_names = {site["id"]: site["name"] for site in sites}
-
-    # Get list of all nodes in target organization.
-    nodes = sc.get("org/{}/nodes".format(org["id"]))
+    nodes = graph.all("nodes")
     print(status("node", nodes, "in '{}'".format(organization)))
 
     # Reduce list of nodes to those assigned to a site.
@@ -68,10 +65,10 @@ def main(argv):
     print(status("node", nodes, "with no specified location"))
 
     # Update location for the remaining nodes.
-    return update_nodes(nodes, sc, organization, org["id"], site_names)
+    return update_nodes(nodes, sc, organization)
 
 
-def update_nodes(nodes, sc, organization, org_id, site_names):
+def update_nodes(nodes, sc, organization):
     """Loop through nodes and push location to SCM where applicable."""
     for node in nodes:
         print("=" * 75)
@@ -80,11 +77,10 @@ def update_nodes(nodes, sc, organization, org_id, site_names):
         print("site:", node["site"])
         print("location:", node["location"])
 
-        site_id = node["site"]
-        site_name = site_names[site_id]
+        site_name = node.site.name
         print("\nSetting location to '{}'".format(site_name))
-        node["location"] = site_name
-        result = sc.put("node/" + node["id"], data=node)
+        data = dict(node.data, location=site_name)
+        result = sc.put("node/" + node["id"], data=data)
         print("updated location:", result["location"])
         print("Response:", sc.response.status_code, sc.response.reason, "\n")
         print()
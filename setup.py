@@ -28,6 +28,7 @@ setup(
     long_description_content_type="text/x-rst",
     long_description=long_description,
     install_requires=["requests>=2.12.1"],
+    extras_require={"async": ["aiohttp>=3.3"], "numpy": ["numpy"]},
     keywords=["SteelConnect CX", "REST", "API", "Riverbed", "Grelleum"],
     packages=["steelconnection"],
     classifiers=[
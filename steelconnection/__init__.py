@@ -29,6 +29,23 @@ Full documentation available at https://pypi.org/project/steelconnection/
 
 __all__ = (
     "SConnect",
+    "ChangeSet",
+    "Hooks",
+    "Inventory",
+    "Metrics",
+    "Poller",
+    "Query",
+    "Record",
+    "Recorder",
+    "RealmGraph",
+    "RequestLogger",
+    "ResponseCache",
+    "SearchIndex",
+    "Snapshot",
+    "SpanRecorder",
+    "Retry",
+    "TokenBucket",
+    "FileTokenBucket",
     "Timer",
     "ConnectionError",
     "RequestException",
@@ -45,17 +62,38 @@ __all__ = (
 
 
 import logging
+import sys
 
 from requests import ConnectionError, RequestException
 
 from .api import SConnect, ASCII_ART, Timer
+from .cache import ResponseCache
+from .changes import ChangeSet
 from .exceptions import AuthenticationError, APINotEnabled
 from .exceptions import BadRequest, InvalidResource, ResourceGone
+from .graph import RealmGraph
+from .hooks import Hooks, SpanRecorder
+from .inventory import Inventory
 from .input_tools import get_input, get_username, get_password
 from .lookup import LookUp
+from .metrics import Metrics
+from .poller import Poller
+from .query import Query
+from .records import Record
+from .ratelimit import TokenBucket, FileTokenBucket
+from .retry import Retry
+from .search import SearchIndex
+from .snapshot import Snapshot
+from .timeseries import Recorder
+from .tracing import RequestLogger
 
 from . import about
 
+if sys.version_info >= (3, 6):
+    from .aio import AsyncSConnect, AsyncLookUp
+
+    __all__ += ("AsyncSConnect",)
+
 version = __version__ = about.version
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -0,0 +1,399 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Asynchronous counterpart of the SConnect object, built on asyncio.
+
+Requires Python 3.6+ and the optional ``aiohttp`` package.
+
+Usage:
+    async with steelconnection.AsyncSConnect(realm, username, password) as sc:
+        orgs = await sc.get('orgs')
+        node = await sc.lookup.node(serial)
+
+    Each call is a coroutine, so many requests can share one event loop:
+    statuses = await asyncio.gather(*(sc.getstatus(r) for r in resources))
+
+    Unlike SConnect, credentials are never prompted for interactively.
+    Errors are handled according to ``on_error``, exactly as in SConnect.
+"""
+
+import json
+import logging
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from .about import version as __version__
+from .api import ASCII_ART, SConnect
+from .jsoncodec import get_codec
+from .records import Compactor, to_plain
+from .tracing import RequestLogger
+from .lookup import model
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSConnect(object):
+    r"""Make asynchronous REST API calls to Riverbed SteelConnect CX Manager.
+
+    Attributes:
+        realm (str): FQDN of SteelConnect CX Manager.
+        api_version (str): SteelConnect CX Manager REST API version.
+        ascii_art (str): Project logo.
+        timeout (float or tuple): Timeout values for requests.
+        result: Contains last result returned from a request.
+        response: Response object from last request.
+        session: aiohttp ClientSession used to access REST API.
+    """
+
+    def __init__(
+        self,
+        realm,
+        username=None,
+        password=None,
+        api_version="1.0",
+        proxy=None,
+        on_error="raise",
+        timeout=(5, 60),
+        connection_limit=100,
+        session=None,
+        codec=None,
+        request_logger=None,
+        compact=False,
+    ):
+        r"""Initialize a new asynchronous steelconnection object.
+
+        Args:
+            realm (str): FQDN of SteelConnect CX Manager.
+            username (str): (optional) Admin account name.
+            password (str): (optional) Admin account password.
+            api_version (str): (optional) REST API version.
+            proxy (str): (optional) URL of proxy server.
+            on_error (str): (optional) Define behavior for failed requests.
+            timeout (float or tuple): (optional)
+                As a float: The number of seconds to wait for the server
+                            to send data before giving up
+                or a (connect timeout, read timeout) tuple.
+            connection_limit (int): (optional) Maximum simultaneous connections.
+            session: (optional) Pre-built aiohttp.ClientSession to use.
+            codec (str): (optional) JSON codec: 'json', 'orjson' or 'ujson'.
+            request_logger (RequestLogger): (optional) Logs each request.
+            compact (bool): (optional) Return the items of collections as
+                compact read-only records instead of dictionaries.
+        """
+        if not realm:
+            raise ValueError("Must supply realm for AsyncSConnect.")
+        self.__version__ = __version__
+        self.realm = realm
+        self.api_version = api_version
+        self.ascii_art = ASCII_ART
+        self.timeout = timeout
+        self.proxy = proxy
+        self.connection_limit = connection_limit
+        self.result = None
+        self.response = None
+        self.lookup = AsyncLookUp(self)
+        self.session = session
+        self.codec = get_codec(codec)
+        self.request_logger = (
+            request_logger if request_logger else RequestLogger(logger)
+        )
+        self.compactor = Compactor() if compact else None
+        self._auth = (username, password) if username and password else None
+        self._raise_exception = self._exception_handling(on_error)
+
+    # Session management:
+
+    def _get_session(self):
+        """Create the aiohttp session on first use, inside the running loop."""
+        if self.session is None:
+            if aiohttp is None:
+                raise RuntimeError("AsyncSConnect requires the aiohttp package.")
+            auth = aiohttp.BasicAuth(*self._auth) if self._auth else None
+            self.session = aiohttp.ClientSession(
+                auth=auth,
+                headers={
+                    "Accept": "application/json",
+                    "Content-type": "application/json",
+                },
+                connector=aiohttp.TCPConnector(limit=self.connection_limit),
+            )
+        return self.session
+
+    async def close(self):
+        """Close the underlying aiohttp session."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # Primary methods:
+
+    async def get(self, resource, params=None, api="scm.config"):
+        r"""Send a GET request to the SteelConnect CX.Config API.
+
+        :param str resource: api resource to get.
+        :param dict params: (optional) Dictionary of query parameters.
+        :returns: Dictionary or List of Dictionaries based on request.
+        :rtype: dict, or list
+        """
+        return await self._call("GET", api, resource, params=params)
+
+    async def getstatus(self, resource, params=None):
+        r"""Send a GET request to the SteelConnect CX.Reporting API.
+
+        :param str resource: api resource to get.
+        :param dict params: (optional) Dictionary of query parameters.
+        :returns: Dictionary or List of Dictionaries based on request.
+        :rtype: dict, or list
+        """
+        return await self.get(resource, params, api="scm.reporting")
+
+    async def delete(self, resource, data=None, params=None, api="scm.config"):
+        r"""Send a DELETE request to the SteelConnect CX.Config API.
+
+        :param str resource: api resource to get.
+        :param dict data: (optional) Dictionary of 'body' data to be sent.
+        :param dict params: (optional) Dictionary of query parameters.
+        :returns: Dictionary or List of Dictionaries based on request.
+        :rtype: dict, or list
+        """
+        return await self._call("DELETE", api, resource, params=params, data=data)
+
+    async def post(self, resource, data=None, api="scm.config"):
+        r"""Send a POST request to the SteelConnect CX.Config API.
+
+        :param str resource: api resource to get.
+        :param dict data: (optional) Dictionary of 'body' data to be sent.
+        :returns: Dictionary or List of Dictionaries based on request.
+        :rtype: dict, or list
+        """
+        return await self._call("POST", api, resource, data=data)
+
+    async def put(self, resource, data=None, params=None, api="scm.config"):
+        r"""Send a PUT request to the SteelConnect CX.Config API.
+
+        :param str resource: api resource to get.
+        :param dict data: (optional) Dictionary of 'body' data to be sent.
+        :param dict params: (optional) Dictionary of query parameters.
+        :returns: Dictionary or List of Dictionaries based on request.
+        :rtype: dict, or list
+        """
+        return await self._call("PUT", api, resource, params=params, data=data)
+
+    async def stream(self, resource, params=None, api="scm.config"):
+        r"""Send a GET request with streaming binary data.
+
+        Use as ``async for chunk in sc.stream(resource): ...``
+
+        :param str resource: api resource to get.
+        :param dict params: (optional) Dictionary of query parameters.
+        :returns: Asynchronous generator of binary chunks.
+        :rtype: async_generator
+        """
+        url = self.make_url(api, resource)
+        session = self._get_session()
+        async with session.request(
+            "GET", url, params=params, timeout=self._client_timeout(), proxy=self.proxy
+        ) as resp:
+            self.response = _AsyncResponse(resp, b"", "GET", url, None)
+            async for chunk in resp.content.iter_chunked(65536):
+                yield chunk
+
+    # These do the heavy lifting.
+
+    make_url = SConnect.make_url
+
+    async def _call(self, method, api, resource, params=None, data=None):
+        """Send a request, record it, and return the decoded result."""
+        response = await self._request(
+            method, self.make_url(api, resource), params=params, data=data
+        )
+        # No await between here and _raise_exception,
+        # so self.response is still this call's response when it is reported.
+        self.response = response
+        self.result = self._get_result(response)
+        if self.result is None:
+            self._raise_exception(response)
+        return self.result
+
+    async def _request(self, method, url, data=None, params=None):
+        r"""Send a request using the specified method.
+
+        :param str method: HTTP verb.
+        :param str url: complete url and path.
+        :param dict data: (optional) Dictionary of 'body' data to be sent.
+        :param dict params: (optional) Dictionary of query parameters.
+        :returns: Response with the body already read.
+        :rtype: _AsyncResponse
+        """
+        data = to_plain(data)
+        data = self.codec.encode(data) if data and isinstance(data, dict) else data
+        session = self._get_session()
+        async with session.request(
+            method,
+            url,
+            params=params,
+            data=data,
+            timeout=self._client_timeout(),
+            proxy=self.proxy,
+        ) as resp:
+            body = await resp.read()
+        response = _AsyncResponse(resp, body, method, url, data)
+        self._log_request(response)
+        return response
+
+    def _client_timeout(self):
+        """Translate the requests style timeout into an aiohttp timeout."""
+        if aiohttp is None:
+            return self.timeout
+        if isinstance(self.timeout, tuple):
+            connect, read = self.timeout
+            return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+        return aiohttp.ClientTimeout(sock_read=self.timeout)
+
+    _log_request = SConnect._log_request
+    _get_result = SConnect._get_result
+
+    # Properties and error handling are shared with SConnect.
+
+    sent = SConnect.sent
+    received = SConnect.received
+    _exception_handling = SConnect._exception_handling
+    _on_error_raise_exception = SConnect._on_error_raise_exception
+    _on_error_exit = SConnect._on_error_exit
+    _on_error_do_nothing = SConnect._on_error_do_nothing
+
+    # Gratuitous __dunder__ methods.
+
+    __bool__ = SConnect.__bool__
+
+    def __repr__(self):
+        """Return a string consisting of class name, realm, and api.
+
+        :returns: Information about this object.
+        :rtype: str
+        """
+        details = ", ".join(
+            [
+                "realm: '{}'".format(self.realm),
+                "api version: '{}'".format(self.api_version),
+                "package version: '{}'".format(self.__version__),
+            ]
+        )
+        return "{}({})".format(self.__class__.__name__, details)
+
+
+class AsyncLookUp(object):
+    """Provide asynchronous convienience tools to lookup objects."""
+
+    def __init__(self, sconnect):
+        """Obtain access to SteelConect Manager."""
+        self.sconnect = sconnect
+        self._model = model
+
+    async def iter_find(self, domain, search):
+        """
+        Generic search function.
+        Given a resource type (domain)
+        and a dictionary of {keyword: value} pairs to match,
+        returns an asynchronous generator of dictionaries matching the search.
+        """
+        for obj in await self.sconnect.get(domain):
+            if all(obj[key] == value for key, value in search.items()):
+                yield obj
+
+    async def find(self, domain, search):
+        """
+        Generic search function.
+        Returns a list of dictionaries matching the search criteria.
+        """
+        return [obj async for obj in self.iter_find(domain, search)]
+
+    async def find_one(self, domain, search):
+        """
+        Generic lookup function.
+        Returns the first dictionary matching the search criteria, or None.
+        """
+        async for obj in self.iter_find(domain, search):
+            return obj
+        return None
+
+    async def node(self, pattern, key="serial"):
+        """
+        Returns a node matching a provided appliance serial number.
+        """
+        return await self.find_one(domain="nodes", search={key: pattern.upper()})
+
+    async def org(self, pattern, key="name"):
+        """
+        Returns a org matching a provided organization short name.
+        """
+        return await self.find_one(domain="orgs", search={key: pattern})
+
+    async def site(self, pattern, orgid=None, key="name"):
+        """
+        Returns a site matching a provided site short name and org_id.
+        """
+        if not orgid:
+            raise ValueError("orgid required when looking up a site.")
+        resource = "/".join(("org", orgid, "sites"))
+        return await self.find_one(domain=resource, search={key: pattern})
+
+    async def wan(self, pattern, orgid=None, key="name"):
+        """
+        Returns a wan matching a provided wan name and org_id.
+        """
+        if not orgid:
+            raise ValueError("orgid required when looking up a wan.")
+        resource = "/".join(("org", orgid, "wans"))
+        return await self.find_one(domain=resource, search={key: pattern})
+
+    def model(self, value, default=None):
+        """
+        Translates a model code name to real name and visa versa.
+        """
+        default = default if default else value
+        return self._model.get(value, default)
+
+
+class _AsyncResponse(object):
+    """Fully read aiohttp response exposing the requests.Response interface."""
+
+    def __init__(self, resp, body, method, url, data):
+        self.url = str(resp.url)
+        self.status_code = resp.status
+        self.reason = resp.reason
+        self.ok = resp.status < 400
+        self.headers = resp.headers
+        self.content = body
+        self.encoding = resp.charset or "utf-8"
+        request_info = getattr(resp, "request_info", None)
+        headers = dict(request_info.headers) if request_info else {}
+        self.request = _AsyncRequest(method, url, headers, data)
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class _AsyncRequest(object):
+    """Minimal stand-in for requests.PreparedRequest."""
+
+    def __init__(self, method, url, headers, body):
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
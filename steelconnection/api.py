@@ -27,6 +27,7 @@ from __future__ import print_function
 import logging
 import json
 import sys
+import threading
 import time
 
 import requests
@@ -34,7 +35,19 @@ import requests
 from .about import version as __version__
 from .exceptions import AuthenticationError, APINotEnabled
 from .exceptions import BadRequest, ResourceGone, InvalidResource
+from .bulk import BulkResult, TunnelResult, _bulk, _iter_concurrently
+from .cache import ResponseCache, _make_key
+from .hooks import Hooks
+from .inventory import Inventory
+from .jsoncodec import get_codec
+from .retry import NO_RETRY, Retry
+from .singleflight import SingleFlight
+from .streaming import _iter_items
+from .metrics import Metrics, resource_template
+from .records import Compactor, to_plain
+from .tracing import RequestLogger, _response_size
 from .image_download import _download_image
+from .watch import _watch
 from .lookup import LookUp
 from .input_tools import get_input, get_username, get_password_once
 
@@ -56,6 +69,12 @@ BINARY_DATA_MESSAGE = (
 
 logger = logging.getLogger(__name__)
 
+_timer = getattr(time, "perf_counter", time.time)
+
+# Polling of sshtunnel status: first wait, doubled each poll up to the cap.
+SSHTUNNEL_POLL = 0.25
+SSHTUNNEL_MAX_POLL = 2.0
+
 
 class SConnect(object):
     r"""Make REST API calls to Riverbed SteelConnect CX Manager.
@@ -68,6 +87,16 @@ class SConnect(object):
         result: Contains last result returned from a request.
         response: Response object from last request.
         session: Request session object used to access REST API.
+        thread_safe (bool): Whether result and response are kept per thread.
+        retry (Retry): Policy used to resend failed requests.
+        retries (int): Number of retries made by the last request.
+        rate_limit (TokenBucket): Limiter applied to every request, or None.
+        cache (ResponseCache): Cache of GET results, or None.
+        singleflight (SingleFlight): Coalesces identical GETs, or None.
+        codec: Encodes request bodies and decodes responses.
+        request_logger (RequestLogger): Logs each request.
+        stats (Metrics): Per-endpoint request metrics, or None.
+        hooks (Hooks): Functions called as requests are sent.
     """
 
     def __init__(
@@ -81,6 +110,18 @@ class SConnect(object):
         on_error="raise",
         timeout=(5, 60),
         connection_attempts=3,
+        max_workers=10,
+        thread_safe=False,
+        retry=None,
+        rate_limit=None,
+        cache=None,
+        coalesce=False,
+        codec=None,
+        request_logger=None,
+        metrics=True,
+        hooks=None,
+        inventory=None,
+        compact=False,
     ):
         r"""Initialize a new steelconnection object.
 
@@ -97,6 +138,27 @@ class SConnect(object):
                             to send data before giving up
                 or a :ref:`(connect timeout, read timeout) <timeouts>` tuple.
             connection_attempts (str): (optional) Number of login attemps.
+            max_workers (int): (optional) Concurrency of bulk methods,
+                also used to size the connection pool.
+            thread_safe (bool): (optional) Keep response and result per thread,
+                so one object can be shared by many threads.
+            retry (Retry, int or bool): (optional) Retry policy for failed
+                requests, the maximum number of attempts, or True for the
+                default policy. Default is a single attempt.
+            rate_limit (TokenBucket): (optional) Limiter that every request,
+                including retries, must acquire a token from.
+            cache (ResponseCache or bool): (optional) Cache for GET results,
+                True for a cache with default settings.
+            coalesce (bool): (optional) Share one request between threads
+                that GET the same resource at the same time.
+            codec (str): (optional) JSON codec: 'json', 'orjson' or 'ujson'.
+            request_logger (RequestLogger): (optional) Logs each request.
+            metrics (bool): (optional) Record per-endpoint metrics in stats.
+            hooks (Hooks): (optional) Functions called as requests are sent.
+            inventory (Inventory or bool): (optional) Indexed collections
+                used by lookup, True for an inventory with default settings.
+            compact (bool): (optional) Return the items of collections as
+                compact read-only records instead of dictionaries.
         """
 
         self.__scm_version = None
@@ -104,13 +166,36 @@ class SConnect(object):
         self.api_version = api_version
         self.ascii_art = ASCII_ART
         self.timeout = timeout
-        self.result = None
-        self.response = None
+        self.thread_safe = thread_safe
+        self._context = _ThreadContext() if thread_safe else _Context()
+        if retry is True:
+            retry = Retry()
+        elif retry is False or (isinstance(retry, int) and retry < 1):
+            retry = None  # No retries, rather than an error from Retry.
+        self.retry = Retry(attempts=retry) if isinstance(retry, int) else retry
+        self.retry = self.retry if self.retry else NO_RETRY
+        self.rate_limit = rate_limit
+        self.cache = ResponseCache() if cache is True else cache
+        # Not "cache or None": an empty ResponseCache is falsy, as it has a length.
+        self.cache = None if cache is False else self.cache
+        self.singleflight = SingleFlight() if coalesce else None
+        self.codec = get_codec(codec)
+        self.request_logger = (
+            request_logger if request_logger else RequestLogger(logger)
+        )
+        self.stats = Metrics() if metrics else None
+        self.hooks = hooks if hooks else Hooks()
+        self.inventory = Inventory() if inventory is True else inventory
+        self.inventory = None if inventory is False else self.inventory
+        self.compactor = Compactor() if compact else None
         self.lookup = LookUp(self)
         self.session = requests.Session()
         self.session.proxies = proxies if proxies else self.session.proxies
         self.session.headers.update({"Accept": "application/json"})
         self.session.headers.update({"Content-type": "application/json"})
+        self.max_workers = max_workers
+        self._pool_size = 0
+        self._size_pool(max_workers)
 
         # Auth relies on exceptions being raised.
         self._raise_exception = self._on_error_raise_exception
@@ -206,14 +291,23 @@ class SConnect(object):
         :returns: Dictionary or List of Dictionaries based on request.
         :rtype: dict, or list
         """
-        self.response = self._request(
-            request_method=self.session.get,
-            url=self.make_url(api, resource),
-            params=params,
-        )
-        self.result = self._get_result(self.response)
+        if self.cache is not None:
+            cached, result, response = self.cache.lookup_response(api, resource, params)
+            if cached:
+                # The response of the request that was cached, not a new one.
+                self.response, self.result = response, result
+                return self.result
+        if self.singleflight is not None:
+            self.response, self.result = self.singleflight.do(
+                _make_key(api, resource, params),
+                lambda: self._exchange(api, resource, params),
+            )
+        else:
+            self.response, self.result = self._exchange(api, resource, params)
         if self.result is None:
             self._raise_exception(self.response)
+        elif self.cache is not None and _cacheable(self.response):
+            self.cache.store(api, resource, params, self.result, self.response)
         return self.result
 
     def getstatus(self, resource, params=None):
@@ -241,6 +335,10 @@ class SConnect(object):
             params=params,
             data=data,
         )
+        if self.cache is not None:
+            self.cache.invalidate(resource)
+        if self.inventory is not None:
+            self.inventory.invalidate(resource)
         self.result = self._get_result(self.response)
         if self.result is None:
             self._raise_exception(self.response)
@@ -259,6 +357,10 @@ class SConnect(object):
             url=self.make_url(api, resource),
             data=data,
         )
+        if self.cache is not None:
+            self.cache.invalidate(resource)
+        if self.inventory is not None:
+            self.inventory.invalidate(resource)
         self.result = self._get_result(self.response)
         if self.result is None:
             self._raise_exception(self.response)
@@ -279,6 +381,10 @@ class SConnect(object):
             params=params,
             data=data,
         )
+        if self.cache is not None:
+            self.cache.invalidate(resource)
+        if self.inventory is not None:
+            self.inventory.invalidate(resource)
         self.result = self._get_result(self.response)
         if self.result is None:
             self._raise_exception(self.response)
@@ -292,11 +398,177 @@ class SConnect(object):
         :returns: Dictionary or List of Dictionaries based on request.
         :rtype: dict, or list
         """
-        self.response = self.session.get(
-            url=self.make_url(api, resource), params=params, stream=True
+        url = self.make_url(api, resource)
+        self.hooks.fire("before_request", "GET", url, params, None)
+        started = _timer()
+        failed = False
+        try:
+            self.response = self.session.get(url=url, params=params, stream=True)
+            for chunk in self.response.iter_content(chunk_size=65536):
+                yield chunk
+        except Exception as e:
+            failed = True
+            self.hooks.fire("on_error", "GET", url, e, _timer() - started)
+            raise
+        finally:
+            # Also reached when the caller closes the generator early.
+            if not failed:
+                elapsed = _timer() - started
+                self.hooks.fire("after_response", "GET", url, self.response, elapsed)
+
+    def iter_get(self, resource, params=None, api="scm.config"):
+        r"""Send a GET request and yield the items of the response one at a time.
+
+        The response is streamed and its 'items' array is decoded
+        incrementally, so memory use does not grow with the collection.
+        Leaving the loop early closes the connection without reading the rest.
+        When caching or coalescing is enabled, the collection is fetched
+        with get instead so that it can be shared.
+
+        :param str resource: api resource to get.
+        :param dict params: (optional) Dictionary of query parameters.
+        :param str api: (optional) api route, usually 'scm.config'.
+        :returns: Generator of Dictionaries.
+        :rtype: generator
+        """
+        if self.cache is not None or self.singleflight is not None:
+            result = self.get(resource, params=params, api=api)
+            for item in result if isinstance(result, list) else [result]:
+                yield item
+            return
+        response = self._request(
+            request_method=self.session.get,
+            url=self.make_url(api, resource),
+            params=params,
+            stream=True,
+        )
+        self.response = response
+        try:
+            content_type = response.headers.get("Content-Type", "")
+            if not response.ok or "json" not in content_type:
+                self.result = self._get_result(response)
+                if self.result is None:
+                    self._raise_exception(response)
+                yield self.result
+                return
+            items = _iter_items(response.iter_content(chunk_size=65536))
+            if self.compactor is not None:
+                kind = _collection_kind(response)
+                items = (self.compactor.record(kind, item) for item in items)
+            for item in items:
+                yield item
+        finally:
+            response.close()
+
+    # Bulk methods run requests concurrently over the shared session.
+
+    def get_many(
+        self, resources, params=None, api="scm.config", workers=None, as_completed=False
+    ):
+        r"""Send GET requests for many resources concurrently.
+
+        Errors do not stop the batch, they are reported per resource
+        in the ``error`` field of each result.
+
+        :param list resources: api resources to get.
+        :param dict params: (optional) Query parameters used for every request.
+        :param str api: (optional) api route, usually 'scm.config'.
+        :param int workers: (optional) Maximum simultaneous requests.
+        :param bool as_completed: (optional) Yield results as they finish.
+        :returns: BulkResult(resource, result, error) for each resource.
+        :rtype: list, or generator when as_completed is True
+        """
+        workers = workers if workers else self.max_workers
+        self._size_pool(workers)
+
+        def fetch(resource):
+            return self._fetch(api, resource, params=params)
+
+        return _bulk(fetch, resources, workers, as_completed=as_completed)
+
+    def getstatus_many(self, resources, params=None, workers=None, as_completed=False):
+        r"""Send GET requests for many resources to the Reporting API.
+
+        :param list resources: api resources to get.
+        :param dict params: (optional) Query parameters used for every request.
+        :param int workers: (optional) Maximum simultaneous requests.
+        :param bool as_completed: (optional) Yield results as they finish.
+        :returns: BulkResult(resource, result, error) for each resource.
+        :rtype: list, or generator when as_completed is True
+        """
+        return self.get_many(
+            resources,
+            params=params,
+            api="scm.reporting",
+            workers=workers,
+            as_completed=as_completed,
         )
-        for chunk in self.response.iter_content(chunk_size=65536):
-            yield chunk
+
+    def node_ports(self, node_id, with_status=True, workers=None):
+        r"""Get the ports of a node, with the status of each port.
+
+        The statuses are requested concurrently, rather than one
+        getstatus call per port after the port list.
+
+        :param str node_id: id of the node.
+        :param bool with_status: (optional) Set False for the port list only.
+        :param int workers: (optional) Maximum simultaneous requests.
+        :returns: Ports, each with its Reporting API object under 'status'
+            and the exception of a failed status request under 'status_error'.
+            None if the port list failed and on_error did not raise.
+        :rtype: list
+        """
+        ports = self._fetch("scm.config", "node/" + node_id + "/ports")
+        if not with_status or ports is None:
+            return ports
+        return self._with_port_status(ports, workers)
+
+    def node_ports_many(self, node_ids, with_status=True, workers=None):
+        r"""Get the ports of many nodes, with the status of each port.
+
+        Port lists, then port statuses, are requested concurrently,
+        with at most ``workers`` requests in flight for the whole fleet.
+        Errors do not stop the batch, they are reported per node
+        in the ``error`` field of each result.
+
+        :param list node_ids: ids of the nodes.
+        :param bool with_status: (optional) Set False for the port lists only.
+        :param int workers: (optional) Maximum simultaneous requests.
+        :returns: BulkResult(node_id, ports, error) for each node, in input order.
+            ports is None for a failed node, also when on_error handled
+            the failure and error is None.
+        :rtype: list
+        """
+        node_ids = list(node_ids)
+        resources = ["node/" + node_id + "/ports" for node_id in node_ids]
+        lists = self.get_many(resources, workers=workers)
+        if not with_status:
+            return [
+                BulkResult(node_id, item.result, item.error)
+                for node_id, item in zip(node_ids, lists)
+            ]
+        # A failed node has no result, with or without an error to report.
+        ports = [
+            port for item in lists if item.result is not None for port in item.result
+        ]
+        merged = iter(self._with_port_status(ports, workers))
+        results = []
+        for node_id, item in zip(node_ids, lists):
+            if item.result is None:
+                results.append(BulkResult(node_id, None, item.error))
+            else:
+                node_ports = [next(merged) for _ in item.result]
+                results.append(BulkResult(node_id, node_ports, None))
+        return results
+
+    def _with_port_status(self, ports, workers):
+        """Return copies of ports with their status, requested concurrently."""
+        resources = ["port/" + port["id"] for port in ports]
+        statuses = self.getstatus_many(resources, workers=workers)
+        return [
+            dict(port, status=item.result, status_error=item.error)
+            for port, item in zip(ports, statuses)
+        ]
 
     # These do the heavy lifting.
 
@@ -313,31 +585,157 @@ class SConnect(object):
             self.realm, api, self.api_version, resource
         )
 
-    def _request(self, request_method, url, data=None, params=None):
+    def _size_pool(self, workers):
+        """Mount an adapter whose connection pool fits the number of workers."""
+        if workers > self._pool_size:
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=workers)
+            self.session.mount("https://", adapter)
+            self._pool_size = workers
+
+    def _fetch(self, api, resource, params=None):
+        r"""GET a resource without recording it as the last request.
+
+        Safe to call from several threads at once.
+
+        :param str api: api route, usually 'scm.config' or 'scm.reporting'.
+        :param str resource: resource path.
+        :param dict params: (optional) Dictionary of query parameters.
+        :returns: Dictionary or List of Dictionaries based on request.
+        :rtype: dict, list, or None
+        """
+        response, result = self._exchange(api, resource, params)
+        if result is None:
+            self._raise_exception(response)
+        return result
+
+    def _exchange(self, api, resource, params=None):
+        r"""Send a GET request and decode the response.
+
+        :param str api: api route, usually 'scm.config' or 'scm.reporting'.
+        :param str resource: resource path.
+        :param dict params: (optional) Dictionary of query parameters.
+        :returns: The response and its decoded result.
+        :rtype: tuple
+        """
+        response = self._request(
+            request_method=self.session.get,
+            url=self.make_url(api, resource),
+            params=params,
+        )
+        return response, self._get_result(response)
+
+    def _request(self, request_method, url, data=None, params=None, stream=False):
         r"""Send a request using the specified method.
 
         :param request_method: requests.session verb.
         :param str url: complete url and path.
         :param dict data: (optional) Dictionary of 'body' data to be sent.
         :param dict params: (optional) Dictionary of query parameters.
+        :param bool stream: (optional) Leave the response body unread.
         :returns: Dictionary or List of Dictionaries based on request.
         :rtype: object
         """
-        data = json.dumps(data) if data and isinstance(data, dict) else data
-        response = request_method(
-            url=url, params=params, data=data, timeout=self.timeout
+        data = to_plain(data)
+        data = self.codec.encode(data) if data and isinstance(data, dict) else data
+        method = request_method.__name__.upper()
+        # Retries of this request, self.retries may be another thread's.
+        retried = [0]
+        if self.stats is None:
+            response, _ = self._attempt(
+                request_method, method, url, data, params, stream, retried
+            )
+            return response
+        started = _timer()
+        bytes_sent = len(data) if data else 0
+        try:
+            response, retries = self._attempt(
+                request_method, method, url, data, params, stream, retried
+            )
+        except Exception as e:
+            elapsed = _timer() - started
+            self.stats.record(
+                method, url, None, elapsed, bytes_sent, retries=retried[0], error=e
+            )
+            raise
+        elapsed = _timer() - started
+        self.stats.record(
+            method,
+            url,
+            response.status_code,
+            elapsed,
+            bytes_sent,
+            _response_size(response),
+            retries,
         )
-        self._log_request(response)
         return response
 
+    def _attempt(
+        self, request_method, method, url, data, params, stream=False, retried=None
+    ):
+        r"""Send a request, retrying as allowed by the retry policy.
+
+        :param request_method: requests.session verb.
+        :param str method: HTTP verb, used to check if retries are allowed.
+        :param str url: complete url and path.
+        :param str data: Encoded 'body' data to be sent, or None.
+        :param dict params: Dictionary of query parameters, or None.
+        :param bool stream: (optional) Leave the response body unread.
+        :param list retried: (optional) Its first item is kept equal to the
+            number of retries, so it is known when an exception is raised.
+        :returns: Response of the final attempt, and the number of retries.
+        :rtype: tuple
+        """
+        retry = self.retry
+        retried = retried if retried is not None else [0]
+        retries = self.retries = retried[0] = 0
+        extra = {"stream": True} if stream else {}
+        while True:
+            if self.rate_limit is not None:
+                self.rate_limit.acquire()
+            self.hooks.fire("before_request", method, url, params, data)
+            started = _timer()
+            try:
+                response = request_method(
+                    url=url, params=params, data=data, timeout=self.timeout, **extra
+                )
+            except Exception as e:
+                self.hooks.fire("on_error", method, url, e, _timer() - started)
+                if not isinstance(e, retry.exceptions):
+                    raise
+                if not retry.can_retry(method, retries):
+                    raise
+                delay = retry.backoff(retries)
+                reason = repr(e)
+            else:
+                elapsed = _timer() - started
+                self.hooks.fire("after_response", method, url, response, elapsed)
+                self._log_request(response)
+                if response.status_code not in retry.status_codes:
+                    break
+                if not retry.can_retry(method, retries):
+                    break
+                delay = retry.delay(retries, response)
+                if delay is None:
+                    break
+                reason = "{} {}".format(response.status_code, response.reason)
+                if stream:
+                    response.close()  # Release the unread connection.
+            retries = self.retries = retried[0] = retries + 1
+            self.hooks.fire("on_retry", method, url, retries, delay, reason)
+            logger.info(
+                "RETRY %d of %d: %s %s after %s in %.2fs",
+                retries,
+                retry.attempts - 1,
+                method,
+                url,
+                reason,
+                delay,
+            )
+            time.sleep(delay)
+        return response, retries
+
     def _log_request(self, response):
-        req = response.request
-        logger.info("REQUEST: {} {}".format(req.method, req.url))
-        logger.debug("REQUEST.headers: " + repr(req.headers))
-        logger.debug("REQUEST.body: " + repr(req.body))
-        logger.info("RESPONSE: {} {}".format(response.status_code, response.reason))
-        logger.debug("RESPONSE.headers: " + repr(response.headers))
-        logger.debug("RESPONSE.text: " + repr(response.text))
+        self.request_logger.log(response)
 
     def _get_result(self, response):
         r"""Return response data as native Python datatype.
@@ -354,32 +752,99 @@ class SConnect(object):
             elif _bad_401_return_code_hack(response):
                 return response.json()
             else:
-                logger.info("RECEIVED: " + self.received.replace("\n", ", "))
-                # logger.warning("RECEIVED: " + self.received.replace("\n", ", "))
+                if logger.isEnabledFor(logging.INFO):
+                    received = _describe_response(response)
+                    logger.info("RECEIVED: " + received.replace("\n", ", "))
                 return None
         if response.headers["Content-Type"] == "application/octet-stream":
             return {"status": BINARY_DATA_MESSAGE}
-        if not response.json():
+        data = self.codec.decode(response)
+        if not data:
             return {}
-        elif "items" in response.json():
-            return response.json()["items"]
+        elif isinstance(data, dict) and "items" in data:
+            if self.compactor is not None:
+                return self.compactor.compact(_collection_kind(response), data["items"])
+            return data["items"]
         else:
-            return response.json()
+            return data
 
     # Convinience methods.
 
-    def sshtunnel(self, node_id, timeout=15, restart=False, stop=False):
+    def sshtunnel(
+        self, node_id, timeout=15, restart=False, stop=False, restart_delay=5
+    ):
         r"""Start (or stop) an sshtunnel for the specified node id.
         Blocks until tunnel comes up or timeout expires.
         If stop == True, any existing sshtunnel will be deleted.
         If restart == True, any existing sshtunnel will be deleted
         before a new tunnel is established.
+        The tunnel status is polled with exponential backoff,
+        from SSHTUNNEL_POLL up to SSHTUNNEL_MAX_POLL seconds.
 
         :param str node_id: Response from HTTP request.
         :param bool restart: Set True to stop an existing tunnel before starting.
+        :param float restart_delay: (optional) Seconds to wait after stopping
+            a tunnel before restarting it.
         :returns: Dictionary containing response.
         :rtype: dict
         """
+        with self.hooks.operation("sshtunnel", node_id=node_id):
+            return self._sshtunnel(node_id, timeout, restart, stop, restart_delay)
+
+    def sshtunnels(
+        self, node_ids, timeout=60, restart=False, restart_delay=5, workers=None
+    ):
+        r"""Start sshtunnels for many nodes concurrently.
+
+        Every tunnel must come up before a single deadline, timeout
+        seconds from now. Errors do not stop the batch, they are
+        reported per node in the ``error`` field of each result.
+
+        :param list node_ids: ids of the nodes.
+        :param float timeout: (optional) Seconds until the overall deadline.
+        :param bool restart: (optional) Set True to stop existing tunnels first.
+        :param float restart_delay: (optional) Seconds to wait after stopping
+            a tunnel before restarting it.
+        :param int workers: (optional) Maximum nodes handled at the same time.
+        :returns: TunnelResult(node_id, status, elapsed, tunnel, error)
+            for each node, in input order.
+        :rtype: list
+        """
+        node_ids = list(node_ids)
+        deadline = _timer() + timeout
+        workers = workers if workers else self.max_workers
+        self._size_pool(workers)
+
+        def start(node_id):
+            started = _timer()
+            if deadline <= started:
+                # Queued behind other nodes until too late, send nothing.
+                return TunnelResult(node_id, "timeout", 0.0, None, None)
+            try:
+                tunnel = self._sshtunnel(
+                    node_id, None, restart, False, restart_delay, deadline
+                )
+            except Exception as e:
+                return TunnelResult(node_id, "error", _timer() - started, None, e)
+            status = tunnel.get("status", "unknown")
+            return TunnelResult(node_id, status, _timer() - started, tunnel, None)
+
+        with self.hooks.operation("sshtunnels", nodes=len(node_ids)):
+            results = [None] * len(node_ids)
+            for index, _, result, error in _iter_concurrently(start, node_ids, workers):
+                if error is not None:
+                    raise error  # Only SystemExit or KeyboardInterrupt get here.
+                results[index] = result
+        return results
+
+    def _sshtunnel(
+        self, node_id, timeout, restart, stop, restart_delay=5, deadline=None
+    ):
+        """Start, stop, or restart an sshtunnel without operation hooks.
+
+        A deadline, as a _timer value, replaces the timeout and also
+        shortens the restart delay.
+        """
         node_state = self.getstatus("node/" + node_id).get("state")
         if node_state in ("offline", "unknown"):
             return {"status": node_state}
@@ -394,17 +859,61 @@ class SConnect(object):
                 return {}
             # Tunnel status will update on SCM before tunnel is dropped by appliance.
             # If we restart too soon, we might connect to a tunnel before it drops.
-            time.sleep(5)
+            if deadline is not None:
+                restart_delay = min(restart_delay, max(0, deadline - _timer()))
+            time.sleep(restart_delay)
 
-        timer = Timer(timeout)
-        tunnel = {"status": "unknown"}
-        while timer and tunnel.get("status") != "connected":
+        deadline = _timer() + timeout if deadline is None else deadline
+        delay = SSHTUNNEL_POLL
+        while True:
             try:
-                tunnel = self.get("sshtunnel/" + node_id)
+                # Bypass the cache, the status is expected to change.
+                tunnel = self._fetch("scm.config", "sshtunnel/" + node_id)
             except InvalidResource:
                 tunnel = self.post("sshtunnel/" + node_id)
-            time.sleep(0.1)
-        return tunnel
+            remaining = deadline - _timer()
+            if tunnel.get("status") == "connected" or remaining <= 0:
+                return tunnel
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, SSHTUNNEL_MAX_POLL)
+
+    def watch(
+        self,
+        resource,
+        params=None,
+        api="scm.config",
+        key="id",
+        min_interval=5,
+        max_interval=60,
+        backoff=2,
+        initial=False,
+    ):
+        r"""Poll a resource and yield what changed, forever.
+
+        Nothing is yielded while the resource stays the same.
+        Responses are never served from the cache.
+        The wait between polls drops to min_interval after a change
+        and is multiplied by backoff after each quiet poll,
+        up to max_interval.
+
+        :param str resource: api resource to watch.
+        :param dict params: (optional) Dictionary of query parameters.
+        :param str api: (optional) api route, 'scm.config' or 'scm.reporting'.
+        :param str key: (optional) Field identifying the objects of a list.
+        :param float min_interval: (optional) Seconds between polls after a change.
+        :param float max_interval: (optional) Longest wait between polls.
+        :param float backoff: (optional) Growth of the wait when nothing changes.
+        :param bool initial: (optional) Yield the first response, as all added.
+        :returns: Objects added, changed and removed, with changed fields.
+        :rtype: generator of ChangeSet
+        """
+
+        def fetch():
+            return self._fetch(api, resource, params=params)
+
+        return _watch(
+            fetch, resource, key, min_interval, max_interval, backoff, initial
+        )
 
     # These handle binary content.
 
@@ -415,9 +924,10 @@ class SConnect(object):
         :param str build: Target hypervisor for image.
         :param bool quiet: Disable update printing when true.
         """
-        return _download_image(
-            sconnect=self, nodeid=nodeid, save_as=save_as, build=build, quiet=quiet
-        )
+        with self.hooks.operation("download_image", nodeid=nodeid, build=build):
+            return _download_image(
+                sconnect=self, nodeid=nodeid, save_as=save_as, build=build, quiet=quiet
+            )
 
     def savefile(self, filename):
         r"""Save binary return data to a file.
@@ -429,6 +939,33 @@ class SConnect(object):
 
     # Property methods that appear like dynamic attributes.
 
+    @property
+    def response(self):
+        """Response object from the last request (made by this thread)."""
+        return self._context.response
+
+    @response.setter
+    def response(self, value):
+        self._context.response = value
+
+    @property
+    def result(self):
+        """Result of the last request (made by this thread)."""
+        return self._context.result
+
+    @result.setter
+    def result(self, value):
+        self._context.result = value
+
+    @property
+    def retries(self):
+        """Number of retries needed by the last request (made by this thread)."""
+        return self._context.retries
+
+    @retries.setter
+    def retries(self, value):
+        self._context.retries = value
+
     @property
     def scm_version(self):
         """Return version and build number of SteelConnect CX Manager.
@@ -454,11 +991,7 @@ class SConnect(object):
         :returns: Details regarding previous API request.
         :rtype: str
         """
-        return "{}: {}\nData Sent: {}".format(
-            self.response.request.method,
-            self.response.request.url,
-            repr(self.response.request.body),
-        )
+        return _describe_request(self.response)
 
     @property
     def received(self):
@@ -467,18 +1000,7 @@ class SConnect(object):
         :returns: Details regarding previous API request.
         :rtype: str
         """
-        error_message = None
-        if not self.response.ok and self.response.text:
-            try:
-                details = self.response.json()
-                error_message = details.get("error", {}).get("message")
-            except ValueError:  # bad json
-                pass
-            except AttributeError:  # non-dict json
-                pass
-        return "Status: {} - {}\nError: {}".format(
-            self.response.status_code, self.response.reason, repr(error_message)
-        )
+        return _describe_response(self.response)
 
     # Error handling and Exception generation.
 
@@ -502,7 +1024,9 @@ class SConnect(object):
         }
         if not response.ok:
             exception = exceptions.get(response.status_code, RuntimeError)
-            raise exception("\n".join((self.received, self.sent)))
+            raise exception(
+                "\n".join((_describe_response(response), _describe_request(response)))
+            )
 
     def _on_error_exit(self, response):
         r"""Display error and exit.
@@ -511,8 +1035,10 @@ class SConnect(object):
         :returns: None.
         :rtype: None
         """
-        display = "\n".join((self.received, self.sent))
         if not response.ok:
+            display = "\n".join(
+                (_describe_response(response), _describe_request(response))
+            )
             print(display, file=sys.stderr)
             sys.exit(1)
 
@@ -579,6 +1105,22 @@ class SConnect(object):
         return "\n>> ".join(details)
 
 
+class _Context(object):
+    """Last response and result, shared by all threads."""
+
+    response = None
+    result = None
+    retries = 0
+
+
+class _ThreadContext(threading.local):
+    """Last response and result, tracked separately for each thread."""
+
+    response = None
+    result = None
+    retries = 0
+
+
 class Timer(object):
     def __init__(self, timeout=15):
         self.start = time.time()
@@ -595,6 +1137,44 @@ class Timer(object):
         return "{:.3f} seconds".format(self.time)
 
 
+# Summaries of a single request/response pair.
+
+
+def _describe_request(response):
+    """Return summary of the request that produced the response."""
+    return "{}: {}\nData Sent: {}".format(
+        response.request.method, response.request.url, repr(response.request.body)
+    )
+
+
+def _describe_response(response):
+    """Return summary of the response, including any error message."""
+    error_message = None
+    if not response.ok and response.text:
+        try:
+            details = response.json()
+            error_message = details.get("error", {}).get("message")
+        except ValueError:  # bad json
+            pass
+        except AttributeError:  # non-dict json
+            pass
+    return "Status: {} - {}\nError: {}".format(
+        response.status_code, response.reason, repr(error_message)
+    )
+
+
+def _collection_kind(response):
+    """Return the name of the collection in a response, such as 'nodes'."""
+    url = getattr(response, "url", None) or response.request.url
+    return resource_template(url)[1].split("/")[-1]
+
+
+def _cacheable(response):
+    """Check if a response holds JSON data that can be served from cache."""
+    content_type = response.headers.get("Content-Type", "")
+    return response.ok and content_type != "application/octet-stream"
+
+
 # Hacks for bad responses.
 
 
@@ -0,0 +1,120 @@
+# coding: utf-8
+
+"""
+Provide helpers to run many API requests concurrently.
+
+To be called from SteelConnection main object classes.
+Not supported for direct use.
+"""
+
+from collections import namedtuple
+import threading
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
+from .hooks import _capture_spans, _continue_spans
+
+
+BulkResult = namedtuple("BulkResult", ("resource", "result", "error"))
+BulkResult.__doc__ = """Outcome of one request in a bulk call.
+
+Exactly one of ``result`` and ``error`` is meaningful:
+``error`` holds the exception raised by the request, or None on success.
+"""
+
+TunnelResult = namedtuple(
+    "TunnelResult", ("node_id", "status", "elapsed", "tunnel", "error")
+)
+TunnelResult.__doc__ = """Outcome of starting the sshtunnel of one node.
+
+``status`` is the tunnel status, 'connected' on success, the node state
+when it is 'offline' or 'unknown', 'error' when a request failed
+with the exception in ``error``, or 'timeout' when the deadline passed
+before any request was sent. ``elapsed`` is the number of seconds
+spent on the node, its time to connect on success.
+"""
+
+
+def _iter_concurrently(func, items, workers):
+    """
+    Call func on every item using a bounded pool of threads.
+
+    Spans open in the calling thread stay open in the workers,
+    so a SpanRecorder nests their requests under the caller's span.
+
+    Args:
+        func (function): Called once per item from a worker thread.
+        items (iterable): Arguments for func.
+        workers (int): Maximum number of simultaneous calls.
+
+    Yields:
+        tuple: (index, item, result, error) in order of completion.
+    """
+    items = list(items)
+    tasks = queue.Queue()
+    done = queue.Queue()
+    for pair in enumerate(items):
+        tasks.put(pair)
+    spans = _capture_spans()
+
+    def worker():
+        with _continue_spans(spans):
+            while True:
+                try:
+                    index, item = tasks.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    outcome = index, item, func(item), None
+                except BaseException as e:  # Reported to the caller, not the thread.
+                    outcome = index, item, None, e
+                done.put(outcome)
+
+    for _ in range(max(1, min(workers, len(items)))):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+    try:
+        for _ in range(len(items)):
+            yield done.get()
+    finally:
+        # Caller stopped early: let workers finish in-flight calls only.
+        while True:
+            try:
+                tasks.get_nowait()
+            except queue.Empty:
+                break
+
+
+def _bulk(func, resources, workers, as_completed=False):
+    """
+    Run func for each resource and collect BulkResults.
+
+    Exceptions that are not errors (SystemExit, KeyboardInterrupt)
+    are re-raised in the calling thread rather than reported per item.
+
+    Args:
+        func (function): Called with each resource.
+        resources (iterable): Resources to request.
+        workers (int): Maximum number of simultaneous calls.
+        as_completed (bool): Yield results as they finish when True.
+
+    Returns:
+        list or generator: BulkResults in input order, or in completion order.
+    """
+    results = _iter_bulk(func, resources, workers)
+    if as_completed:
+        return (result for _, result in results)
+    ordered = sorted(results, key=lambda pair: pair[0])
+    return [result for _, result in ordered]
+
+
+def _iter_bulk(func, resources, workers):
+    """Yield (index, BulkResult) pairs in order of completion."""
+    for index, resource, result, error in _iter_concurrently(func, resources, workers):
+        if error is not None and not isinstance(error, Exception):
+            raise error
+        yield index, BulkResult(resource, result, error)
@@ -0,0 +1,215 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Response cache for GET requests sent to SteelConnect CX Manager.
+
+Usage:
+    cache = steelconnection.ResponseCache(
+        maxsize=256, ttl=30, ttls={'orgs': 300, 'org/*/sites': 120}
+    )
+    sc = steelconnection.SConnect(realm, username, password, cache=cache)
+
+    Results are cached by api, resource and query parameters.
+    A PUT, POST or DELETE on a resource invalidates cached entries
+    for that resource, its parents, its children and its collection.
+
+    Cached results are shared between callers and must not be modified.
+"""
+
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+import threading
+import time
+
+
+_now = getattr(time, "monotonic", time.time)
+
+# Resources that are polled for progress must never be cached.
+NEVER_CACHE = {"sshtunnel/*": 0, "node/*/image_status": 0}
+
+
+class ResponseCache(object):
+    r"""Thread-safe LRU cache with per-resource time to live.
+
+    Attributes:
+        maxsize (int): Maximum number of cached results.
+        ttl (float): Default seconds a result stays valid.
+        ttls (list): (pattern, seconds) pairs checked before the default,
+            longest pattern first.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that were not cached or had expired.
+        evictions (int): Results dropped to respect maxsize.
+        invalidations (int): Results dropped because of a write.
+    """
+
+    def __init__(self, maxsize=1024, ttl=30, ttls=None):
+        r"""Create an empty cache.
+
+        Args:
+            maxsize (int): (optional) Maximum number of cached results.
+            ttl (float): (optional) Default time to live in seconds.
+            ttls (dict): (optional) Map of resource glob pattern to seconds.
+                The longest matching pattern wins, as the most specific,
+                and a value of 0 disables caching.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        patterns = dict(NEVER_CACHE)
+        patterns.update(ttls or {})
+        # Longer patterns are more specific and are checked first.
+        self.ttls = sorted(patterns.items(), key=lambda item: -len(item[0]))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, api, resource, params=None):
+        r"""Find a cached result.
+
+        Args:
+            api (str): api route, usually 'scm.config' or 'scm.reporting'.
+            resource (str): resource path.
+            params (dict): (optional) Query parameters.
+
+        Returns:
+            tuple: (True, result) when cached, otherwise (False, None).
+        """
+        cached, result, _ = self.lookup_response(api, resource, params)
+        return cached, result
+
+    def lookup_response(self, api, resource, params=None):
+        r"""Find a cached result and the response it was decoded from.
+
+        Args:
+            api (str): api route, usually 'scm.config' or 'scm.reporting'.
+            resource (str): resource path.
+            params (dict): (optional) Query parameters.
+
+        Returns:
+            tuple: (True, result, response) when cached,
+                otherwise (False, None, None).
+        """
+        key = _make_key(api, resource, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < _now():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None, None
+            self._move_to_end(key)
+            self.hits += 1
+            return True, entry[1], entry[2]
+
+    def store(self, api, resource, params, result, response=None):
+        r"""Cache a result, evicting the least recently used if full.
+
+        Args:
+            api (str): api route, usually 'scm.config' or 'scm.reporting'.
+            resource (str): resource path.
+            params (dict): Query parameters, or None.
+            result (dict or list): Decoded result of the request.
+            response (requests.Response): (optional) Response of the request.
+        """
+        ttl = self.ttl_for(resource)
+        if ttl <= 0:
+            return
+        key = _make_key(api, resource, params)
+        with self._lock:
+            self._entries[key] = (_now() + ttl, result, response)
+            self._move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, resource):
+        r"""Drop cached results affected by a write to a resource.
+
+        Args:
+            resource (str): resource path that was written.
+
+        Returns:
+            int: Number of results dropped.
+        """
+        written = _segments(resource)
+        with self._lock:
+            stale = [key for key in self._entries if _related(written, key[1])]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self):
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def ttl_for(self, resource):
+        """Return the time to live that applies to a resource."""
+        resource = "/".join(_segments(resource))
+        for pattern, ttl in self.ttls:
+            if fnmatchcase(resource, pattern):
+                return ttl
+        return self.ttl
+
+    def stats(self):
+        """Return a dictionary of cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": float(self.hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _move_to_end(self, key):
+        """Mark an entry as most recently used."""
+        value = self._entries.pop(key)
+        self._entries[key] = value
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return "{}(maxsize={}, ttl={}, size={})".format(
+            self.__class__.__name__, self.maxsize, self.ttl, len(self)
+        )
+
+
+def _segments(resource):
+    """Split a resource path into a tuple of segments."""
+    return tuple(segment for segment in resource.split("/") if segment)
+
+
+def _make_key(api, resource, params):
+    """Build a hashable key from the parts of a request."""
+    frozen = tuple(sorted((k, repr(v)) for k, v in params.items())) if params else ()
+    return api, _segments(resource), frozen
+
+
+def _related(written, cached):
+    """Check if a write to one resource could change a cached resource.
+
+    Both arguments are tuples of path segments.
+    Parents and children of the written resource are related,
+    as is any collection that lists objects of the written type,
+    for example 'node/node-1' affects 'nodes' and 'org/org-1/nodes'.
+    """
+    if not written or not cached:
+        return False
+    shortest = min(len(written), len(cached))
+    if written[:shortest] == cached[:shortest]:
+        return True
+    collections = set()
+    if len(written) >= 2:
+        collections.add(written[0] + "s")
+    if len(written) % 2:
+        collections.add(written[-1])
+    return cached[-1] in collections
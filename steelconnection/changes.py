@@ -0,0 +1,137 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Detect which objects of a collection were added, changed or removed.
+
+Usage:
+    changes = sc.lookup.refresh('nodes')
+    for node in changes.added:
+        print('new', node['serial'])
+    for change in changes.changed:
+        print(change.id, change.fields)     # {'state': ('online', 'offline')}
+    for node in changes.removed:
+        print('gone', node['serial'])
+
+    Objects are matched by id and compared by a fingerprint of their
+    content, so unchanged objects cost one hash and no comparison.
+"""
+
+from collections import OrderedDict, namedtuple
+import hashlib
+import json
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+
+class Change(namedtuple("Change", ("id", "old", "new"))):
+    """An object present before and after, with different content."""
+
+    __slots__ = ()
+
+    @property
+    def fields(self):
+        """Return {field: (old value, new value)} for each field that differs."""
+        return field_changes(self.old, self.new)
+
+
+class ChangeSet(object):
+    r"""Differences between two versions of a collection.
+
+    Attributes:
+        added (list): Objects that are new.
+        changed (list): Change(id, old, new) for objects that differ.
+        removed (list): Objects that no longer exist.
+    """
+
+    def __init__(self, added=(), changed=(), removed=()):
+        self.added = list(added)
+        self.changed = list(changed)
+        self.removed = list(removed)
+
+    def __len__(self):
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+    def __bool__(self):
+        return bool(len(self))
+
+    __nonzero__ = __bool__  # Python 2
+
+    def __repr__(self):
+        return "{}(added={}, changed={}, removed={})".format(
+            self.__class__.__name__,
+            len(self.added),
+            len(self.changed),
+            len(self.removed),
+        )
+
+
+def fingerprint(obj):
+    """Return a digest of the content of an object, independent of key order."""
+    text = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=_plain)
+    return hashlib.md5(text.encode("utf-8")).digest()
+
+
+def fingerprints(objects, key="id"):
+    r"""Index objects by identity, with the fingerprint of each.
+
+    Args:
+        objects (iterable): Objects of a collection.
+        key (str): (optional) Field identifying an object, or a function
+            returning the identity of an object.
+            Objects without it are identified by their fingerprint.
+
+    Returns:
+        OrderedDict: {identity: (fingerprint, object)} in collection order.
+    """
+    result = OrderedDict()
+    for obj in objects:
+        digest = fingerprint(obj)
+        if callable(key):
+            identity = key(obj)
+        else:
+            identity = obj.get(key) if isinstance(obj, Mapping) else None
+        result[identity if identity is not None else digest] = digest, obj
+    return result
+
+
+def diff(previous, objects, key="id"):
+    r"""Compare a new version of a collection with the previous one.
+
+    Args:
+        previous (dict): Result of fingerprints() for the previous version.
+        objects (iterable): Objects of the new version.
+        key (str): (optional) Field identifying an object, or a function.
+
+    Returns:
+        tuple: (ChangeSet, fingerprints of the new version).
+    """
+    current = fingerprints(objects, key)
+    changes = ChangeSet()
+    for identity, (digest, obj) in current.items():
+        before = previous.get(identity)
+        if before is None:
+            changes.added.append(obj)
+        elif before[0] != digest:
+            changes.changed.append(Change(identity, before[1], obj))
+    for identity, (digest, obj) in previous.items():
+        if identity not in current:
+            changes.removed.append(obj)
+    return changes, current
+
+
+def _plain(value):
+    """Return records as dicts and anything else JSON cannot encode as repr."""
+    return dict(value) if isinstance(value, Mapping) else repr(value)
+
+
+def field_changes(old, new):
+    """Return {field: (old value, new value)} for each field that differs."""
+    return {
+        field: (old.get(field), new.get(field))
+        for field in set(old) | set(new)
+        if old.get(field) != new.get(field)
+    }
@@ -0,0 +1,194 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Joined views over the objects of a realm.
+
+Usage:
+    graph = sc.lookup.graph()               # Or graph(orgid=org['id']).
+    for node in graph.all('nodes'):
+        print(node.serial, node.site.name, node.site.org.name)
+        for port in node.ports:
+            print(port.ifname)
+
+    The collections are downloaded once, concurrently, and indexed by id.
+    Each view follows the id fields of its object to related objects:
+    a field naming another kind, such as node.site or uplink.wan,
+    returns the view of that object, or None when it is not loaded.
+    The name of a collection, such as site.nodes or node.uplinks,
+    returns the views whose field points back at this object.
+    Any other attribute is a field of the object itself,
+    and view['site'] still returns the raw site id.
+"""
+
+import threading
+
+
+COLLECTIONS = ("orgs", "sites", "nodes", "wans", "uplinks", "ports")
+
+
+class RealmGraph(object):
+    r"""Objects of a realm indexed by id, with cached relationships.
+
+    Attributes:
+        orgid (str): Org the collections were limited to, or None.
+        collections (tuple): Kinds of objects loaded, such as 'nodes'.
+    """
+
+    def __init__(self, sconnect, orgid=None, collections=COLLECTIONS):
+        r"""Prepare a graph, call load to download the objects.
+
+        Args:
+            sconnect (SConnect): Object used to send the requests.
+            orgid (str): (optional) Only load the objects of this org.
+            collections (tuple): (optional) Kinds of objects to load.
+        """
+        self.sconnect = sconnect
+        self.orgid = orgid
+        self.collections = tuple(collections)
+        self._objects = {}
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        r"""Download every collection concurrently and index it by id.
+
+        Returns:
+            RealmGraph: self, for chaining.
+
+        Raises:
+            The exception of the first collection that failed to download.
+        """
+        resources = [self.resource(kind) for kind in self.collections]
+        objects = {}
+        for kind, item in zip(self.collections, self.sconnect.get_many(resources)):
+            if item.error is not None:
+                raise item.error
+            result = item.result if isinstance(item.result, list) else [item.result]
+            objects[kind] = {obj["id"]: obj for obj in result if "id" in obj}
+        with self._lock:
+            self._objects = objects
+            self._children = {}
+        return self
+
+    def resource(self, kind):
+        """Return the resource listing one kind of object."""
+        if self.orgid and kind != "orgs":
+            return "/".join(("org", self.orgid, kind))
+        return kind
+
+    def get(self, kind, object_id):
+        r"""Return the view of one object.
+
+        Args:
+            kind (str): Collection of the object, such as 'nodes'.
+            object_id (str): Id of the object.
+
+        Returns:
+            View: The object and its relationships, or None if not loaded.
+        """
+        obj = self._objects.get(kind, {}).get(object_id)
+        return View(self, kind, obj) if obj is not None else None
+
+    def all(self, kind):
+        """Return the views of every loaded object of one kind."""
+        return [View(self, kind, obj) for obj in self._objects.get(kind, {}).values()]
+
+    def children(self, kind, field, parent_id):
+        r"""Return the views of objects whose field holds parent_id.
+
+        The index of each (kind, field) is built once and reused.
+
+        Args:
+            kind (str): Collection to search, such as 'ports'.
+            field (str): Field holding the id of the parent, such as 'node'.
+            parent_id (str): Id of the parent object.
+
+        Returns:
+            list: Views of the matching objects.
+        """
+        key = kind, field
+        index = self._children.get(key)
+        if index is None:
+            index = {}
+            for obj in self._objects.get(kind, {}).values():
+                parent = obj.get(field)
+                if parent is None:
+                    continue
+                try:
+                    index.setdefault(parent, []).append(obj)
+                except TypeError:  # Unhashable fields are not references.
+                    continue
+            with self._lock:
+                self._children[key] = index
+        return [View(self, kind, obj) for obj in index.get(parent_id, ())]
+
+    def __len__(self):
+        return sum(len(objects) for objects in self._objects.values())
+
+    def __repr__(self):
+        sizes = ", ".join(
+            "{}={}".format(kind, len(self._objects.get(kind, {})))
+            for kind in self.collections
+        )
+        return "{}({})".format(self.__class__.__name__, sizes)
+
+
+class View(object):
+    r"""One object of a RealmGraph and its relationships.
+
+    Attributes:
+        kind (str): Collection of the object, such as 'nodes'.
+        data (dict): The object as returned by the API.
+    """
+
+    __slots__ = ("graph", "kind", "data")
+
+    def __init__(self, graph, kind, data):
+        self.graph = graph
+        self.kind = kind
+        self.data = data
+
+    @property
+    def id(self):
+        return self.data["id"]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        graph = self.graph
+        kind = name + "s"
+        if kind in graph.collections and name in self.data:
+            try:
+                return graph.get(kind, self.data[name])
+            except TypeError:  # Not an id, such as a list.
+                return self.data[name]
+        if name in graph.collections:
+            return graph.children(name, self.kind[:-1], self.data["id"])
+        try:
+            return self.data[name]
+        except KeyError:
+            raise AttributeError(
+                "{} {} has no field {!r}".format(self.kind[:-1], self.data["id"], name)
+            )
+
+    def __getitem__(self, field):
+        return self.data[field]
+
+    def get(self, field, default=None):
+        return self.data.get(field, default)
+
+    def __eq__(self, other):
+        return isinstance(other, View) and (self.kind, self.id) == (
+            other.kind,
+            other.id,
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.kind, self.id))
+
+    def __repr__(self):
+        return "<{} {}>".format(self.kind[:-1], self.data.get("id"))
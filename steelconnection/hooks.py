@@ -0,0 +1,321 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Hooks to observe the requests sent by a SConnect object.
+
+Usage:
+    def show(method, url, response, elapsed):
+        print(method, url, response.status_code, elapsed)
+
+    sc.hooks.register('after_response', show)
+
+    Available events and the arguments passed to their hooks:
+        before_request(method, url, params, data)
+        after_response(method, url, response, elapsed)
+        on_error(method, url, exception, elapsed)
+        on_retry(method, url, retries, delay, reason)
+        operation_start(name, details)
+        operation_end(name, details, error)
+
+    Request events fire once per attempt, so a retried request
+    fires before_request again after on_retry.
+    Operation events surround composite methods such as
+    download_image and sshtunnel.
+
+    The SpanRecorder turns these events into a tree of timed spans:
+    recorder = steelconnection.SpanRecorder().install(sc)
+    sc.download_image(node_id, build='kvm')
+    print(recorder.report())
+"""
+
+from contextlib import contextmanager
+import threading
+import time
+import weakref
+
+
+EVENTS = (
+    "before_request",
+    "after_response",
+    "on_error",
+    "on_retry",
+    "operation_start",
+    "operation_end",
+)
+
+_timer = getattr(time, "perf_counter", time.time)
+
+# Every SpanRecorder, so worker threads can continue the caller's spans.
+_recorders = weakref.WeakSet()
+
+
+class Hooks(object):
+    """Registry of functions called when requests are sent."""
+
+    def __init__(self):
+        """Create a registry without hooks."""
+        self._hooks = {event: [] for event in EVENTS}
+
+    def register(self, event, func):
+        r"""Call func whenever event fires.
+
+        Args:
+            event (str): One of EVENTS.
+            func (function): Called with the arguments of the event.
+
+        Returns:
+            function: func, unchanged.
+        """
+        if event not in self._hooks:
+            raise ValueError(
+                "Unknown event {!r}, choose from: {}".format(event, ", ".join(EVENTS))
+            )
+        # Replace the list so that firing never sees a list being changed.
+        self._hooks[event] = self._hooks[event] + [func]
+        return func
+
+    def unregister(self, event, func):
+        r"""Stop calling func when event fires.
+
+        Args:
+            event (str): One of EVENTS.
+            func (function): A previously registered function.
+        """
+        self._hooks[event] = [hook for hook in self._hooks[event] if hook != func]
+
+    def fire(self, event, *args):
+        r"""Call every hook registered for event.
+
+        Args:
+            event (str): One of EVENTS.
+            *args: Arguments passed to each hook.
+        """
+        for hook in self._hooks[event]:
+            hook(*args)
+
+    def active(self, event):
+        """Return True if any hook is registered for event."""
+        return bool(self._hooks[event])
+
+    @contextmanager
+    def operation(self, name, **details):
+        r"""Fire operation_start and operation_end around a block of code.
+
+        Args:
+            name (str): Name of the composite operation.
+            **details: Extra information passed to the hooks.
+        """
+        self.fire("operation_start", name, details)
+        try:
+            yield
+        except BaseException as e:
+            self.fire("operation_end", name, details, e)
+            raise
+        self.fire("operation_end", name, details, None)
+
+
+class Span(object):
+    r"""A timed unit of work, such as an operation or one HTTP request.
+
+    Attributes:
+        name (str): What the span measured.
+        attributes (dict): Details such as url, status or error.
+        children (list): Spans started while this one was open.
+        start (float): Timer value when the span started.
+        end (float): Timer value when the span ended, or None.
+    """
+
+    def __init__(self, name, attributes=None):
+        self.name = name
+        self.attributes = attributes if attributes else {}
+        self.children = []
+        self.start = _timer()
+        self.end = None
+
+    @property
+    def duration(self):
+        """Seconds between start and end, or until now if still open."""
+        end = self.end if self.end is not None else _timer()
+        return end - self.start
+
+    def walk(self, depth=0):
+        """Yield (depth, span) for this span and all its descendants."""
+        yield depth, self
+        for child in self.children:
+            for pair in child.walk(depth + 1):
+                yield pair
+
+    def __repr__(self):
+        return "{}({!r}, {:.3f}s)".format(
+            self.__class__.__name__, self.name, self.duration
+        )
+
+
+class SpanRecorder(object):
+    r"""Record operations and HTTP requests as a tree of spans.
+
+    Each thread keeps its own stack of open spans, so requests
+    become children of the operation that the same thread is running.
+    The worker threads of bulk methods start from the span open in
+    the calling thread, so their requests are nested under it too.
+
+    Attributes:
+        spans (list): Completed top level spans.
+    """
+
+    def __init__(self):
+        """Create a recorder without spans."""
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._handlers = (
+            ("operation_start", self._operation_start),
+            ("operation_end", self._operation_end),
+            ("before_request", self._before_request),
+            ("after_response", self._after_response),
+            ("on_error", self._on_error),
+            ("on_retry", self._on_retry),
+        )
+        _recorders.add(self)
+
+    def install(self, sconnect):
+        r"""Start recording the requests of a SConnect object.
+
+        Args:
+            sconnect (SConnect): The object to observe.
+
+        Returns:
+            SpanRecorder: self, for chaining.
+        """
+        for event, handler in self._handlers:
+            sconnect.hooks.register(event, handler)
+        return self
+
+    def uninstall(self, sconnect):
+        r"""Stop recording the requests of a SConnect object.
+
+        Args:
+            sconnect (SConnect): The object being observed.
+        """
+        for event, handler in self._handlers:
+            sconnect.hooks.unregister(event, handler)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        r"""Record a block of code as a span, the parent of any request in it.
+
+        Args:
+            name (str): Name of the span.
+            **attributes: Details stored with the span.
+        """
+        span = self._open(name, attributes)
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes["error"] = repr(e)
+            self._close()
+            raise
+        self._close()
+
+    def clear(self):
+        """Discard all completed spans."""
+        with self._lock:
+            self.spans = []
+
+    def report(self):
+        """Return the recorded spans as an indented text tree."""
+        lines = []
+        for root in list(self.spans):
+            for depth, span in root.walk():
+                details = " ".join(
+                    "{}={}".format(key, value)
+                    for key, value in sorted(span.attributes.items())
+                )
+                lines.append(
+                    "{}{:.3f}s {} {}".format(
+                        "  " * depth, span.duration, span.name, details
+                    ).rstrip()
+                )
+        return "\n".join(lines)
+
+    # Stack of open spans for the current thread.
+
+    @property
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _open(self, name, attributes):
+        span = Span(name, attributes)
+        stack = self._stack
+        if stack:
+            stack[-1].children.append(span)
+        stack.append(span)
+        return span
+
+    def _close(self, **attributes):
+        stack = self._stack
+        # Spans borrowed from another thread are closed by that thread.
+        if len(stack) <= getattr(self._local, "borrowed", 0):
+            return None
+        span = stack.pop()
+        span.end = _timer()
+        span.attributes.update(attributes)
+        if not stack:
+            with self._lock:
+                self.spans.append(span)
+        return span
+
+    # Hook handlers.
+
+    def _operation_start(self, name, details):
+        self._open(name, dict(details))
+
+    def _operation_end(self, name, details, error):
+        if error is not None:
+            self._close(error=repr(error))
+        else:
+            self._close()
+
+    def _before_request(self, method, url, params, data):
+        self._open("HTTP " + method, {"url": url})
+
+    def _after_response(self, method, url, response, elapsed):
+        self._close(status=response.status_code)
+
+    def _on_error(self, method, url, exception, elapsed):
+        self._close(error=type(exception).__name__)
+
+    def _on_retry(self, method, url, retries, delay, reason):
+        attributes = {"retries": retries, "delay": round(delay, 3), "reason": reason}
+        self._open("retry", attributes)
+        self._close()
+
+
+def _capture_spans():
+    """Return the innermost open span of each recorder, in this thread."""
+    return [
+        (recorder, recorder._stack[-1])
+        for recorder in list(_recorders)
+        if recorder._stack
+    ]
+
+
+@contextmanager
+def _continue_spans(captured):
+    """Open spans in this thread as children of spans captured in another."""
+    saved = []
+    for recorder, span in captured:
+        local = recorder._local
+        saved.append(
+            (local, getattr(local, "stack", None), getattr(local, "borrowed", 0))
+        )
+        local.stack, local.borrowed = [span], 1
+    try:
+        yield
+    finally:
+        for local, stack, borrowed in saved:
+            local.stack, local.borrowed = stack, borrowed
@@ -0,0 +1,302 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Indexed in-memory inventory used by LookUp.
+
+Usage:
+    sc = steelconnection.SConnect(realm, username, password, inventory=True)
+    for serial in serials:
+        node = sc.lookup.node(serial)  # One 'nodes' download for all serials.
+
+    Each collection, such as 'nodes' or 'org/org-1/sites', is fetched once
+    and kept for ttl seconds. Hash indexes are built per (domain, key)
+    the first time a key is searched, so later lookups take constant time.
+    A value that is not found reloads the collection at most once per
+    negative_ttl seconds, and is remembered as missing until then.
+    A PUT, POST or DELETE through the same SConnect object drops
+    the collections it could affect.
+    sc.lookup.refresh('nodes') downloads a collection again and only
+    updates the indexes for the objects that were added, changed or removed.
+
+    Collections are shared between callers and must not be modified.
+"""
+
+import threading
+import time
+
+from .cache import _related, _segments
+from .changes import ChangeSet, diff, fingerprints
+from .search import SearchIndex
+
+
+_now = getattr(time, "monotonic", time.time)
+
+_MISSING = object()
+
+
+class Inventory(object):
+    r"""Thread-safe store of indexed collections.
+
+    Attributes:
+        ttl (float): Seconds a collection is used before being fetched again.
+        negative_ttl (float): Seconds a missing value is remembered.
+        loads (int): Collections fetched.
+        hits (int): Lookups that found at least one object.
+        misses (int): Lookups that found nothing, even after a reload.
+        negative_hits (int): Lookups answered by the negative cache.
+    """
+
+    def __init__(self, ttl=300, negative_ttl=30):
+        r"""Create an empty inventory.
+
+        Args:
+            ttl (float): (optional) Seconds before a collection is refreshed.
+            negative_ttl (float): (optional) Seconds a miss is remembered.
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.loads = 0
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def collection(self, domain, fetch, reload=False):
+        r"""Return the indexed collection of a domain, fetching it if needed.
+
+        Args:
+            domain (str): Resource of the collection, such as 'nodes'.
+            fetch (function): Called without arguments to download the list.
+            reload (bool): (optional) Fetch even if the copy is still valid.
+
+        Returns:
+            Collection: Objects of the domain and their indexes.
+        """
+        domain = "/".join(_segments(domain))
+        with self._lock:
+            collection = self._collections.get(domain)
+        if reload or collection is None or collection.expires < _now():
+            collection = Collection(fetch(), _now() + self.ttl)
+            with self._lock:
+                self._collections[domain] = collection
+                self.loads += 1
+        return collection
+
+    def lookup(self, domain, key, value, fetch):
+        r"""Return the objects of a domain whose key equals value.
+
+        Args:
+            domain (str): Resource of the collection, such as 'nodes'.
+            key (str): Field to match.
+            value: Value the field must equal.
+            fetch (function): Called without arguments to download the list.
+
+        Returns:
+            list: Matching objects in collection order, possibly empty.
+        """
+        collection = self.collection(domain, fetch)
+        try:
+            found = collection.index(key).get(value)
+        except TypeError:  # Unhashable values cannot be indexed.
+            return [obj for obj in collection.objects if obj.get(key) == value]
+        if not found:
+            expires = collection.negative.get((key, value))
+            if expires is not None and expires >= _now():
+                with self._lock:
+                    self.negative_hits += 1
+                return []
+            # The object may have been created since the collection was loaded.
+            if collection.loaded + self.negative_ttl <= _now():
+                collection = self.collection(domain, fetch, reload=True)
+                found = collection.index(key).get(value)
+        with self._lock:
+            if found:
+                self.hits += 1
+                return list(found)
+            self.misses += 1
+            collection.negative[(key, value)] = _now() + self.negative_ttl
+        return []
+
+    def refresh(self, domain, fetch, key="id"):
+        r"""Fetch a collection again, applying only what changed to its indexes.
+
+        Args:
+            domain (str): Resource of the collection, such as 'nodes'.
+            fetch (function): Called without arguments to download the list.
+            key (str): (optional) Field identifying an object.
+
+        Returns:
+            ChangeSet: Objects added, changed and removed since the last load.
+                Everything is added when the collection was not loaded.
+        """
+        domain = "/".join(_segments(domain))
+        objects = fetch()
+        with self._lock:
+            collection = self._collections.get(domain)
+            self.loads += 1
+            if collection is None:
+                collection = Collection(objects, _now() + self.ttl)
+                collection.fingerprints = fingerprints(collection.objects, key)
+                self._collections[domain] = collection
+                return ChangeSet(added=collection.objects)
+            if collection.fingerprints is None:
+                collection.fingerprints = fingerprints(collection.objects, key)
+            changes, current = diff(collection.fingerprints, objects, key)
+            collection.apply(changes, current, _now() + self.ttl)
+        return changes
+
+    def invalidate(self, resource):
+        r"""Drop collections affected by a write to a resource.
+
+        Args:
+            resource (str): resource path that was written.
+
+        Returns:
+            int: Number of collections dropped.
+        """
+        written = _segments(resource)
+        with self._lock:
+            stale = [
+                domain
+                for domain in self._collections
+                if _related(written, _segments(domain))
+            ]
+            for domain in stale:
+                del self._collections[domain]
+        return len(stale)
+
+    def clear(self):
+        """Drop every collection."""
+        with self._lock:
+            self._collections.clear()
+
+    def stats(self):
+        """Return a dictionary of inventory statistics."""
+        with self._lock:
+            return {
+                "collections": len(self._collections),
+                "objects": sum(len(c.objects) for c in self._collections.values()),
+                "loads": self.loads,
+                "hits": self.hits,
+                "misses": self.misses,
+                "negative_hits": self.negative_hits,
+            }
+
+    def __len__(self):
+        return len(self._collections)
+
+    def __repr__(self):
+        return "{}(ttl={}, negative_ttl={}, collections={})".format(
+            self.__class__.__name__, self.ttl, self.negative_ttl, len(self)
+        )
+
+
+class Collection(object):
+    r"""The objects of one domain, with hash indexes built on demand.
+
+    Attributes:
+        objects (list): Objects as returned by the API.
+        loaded (float): Clock value when the collection was fetched.
+        expires (float): Clock value after which it is fetched again.
+        negative (dict): (key, value) of misses mapped to their expiry.
+        fingerprints (dict): Identity of each object mapped to
+            (fingerprint, object), once the collection has been refreshed.
+    """
+
+    def __init__(self, objects, expires):
+        self.objects = list(objects)
+        self.loaded = _now()
+        self.expires = expires
+        self.negative = {}
+        self.fingerprints = None
+        self._indexes = {}
+        self._searches = {}
+
+    def apply(self, changes, current, expires):
+        r"""Update the objects and every built index with a change set.
+
+        Args:
+            changes (ChangeSet): Differences from the current objects.
+            current (OrderedDict): Fingerprints of the new version.
+            expires (float): Clock value after which it is fetched again.
+        """
+        outgoing = changes.removed + [change.old for change in changes.changed]
+        incoming = changes.added + [change.new for change in changes.changed]
+        # Unchanged objects stay the ones held by the indexes.
+        previous = self.fingerprints if self.fingerprints is not None else {}
+        for identity, (digest, obj) in current.items():
+            before = previous.get(identity)
+            if before is not None and before[0] == digest:
+                current[identity] = before
+        self.objects = [obj for _, obj in current.values()]
+        order = {id(obj): position for position, obj in enumerate(self.objects)}
+        for key, index in self._indexes.items():
+            touched = set()
+            for obj in outgoing:
+                value = obj.get(key, _MISSING)
+                try:
+                    bucket = index.get(value)
+                except TypeError:
+                    continue
+                if bucket:
+                    index[value] = [other for other in bucket if other is not obj]
+                    touched.add(value)
+            for obj in incoming:
+                value = obj.get(key, _MISSING)
+                if value is _MISSING:
+                    continue
+                try:
+                    index[value] = index.get(value, []) + [obj]
+                except TypeError:
+                    continue
+                touched.add(value)
+            # Matches are listed in collection order, as without an inventory.
+            for value in touched:
+                if index[value]:
+                    index[value] = sorted(index[value], key=lambda o: order[id(o)])
+                else:
+                    del index[value]
+        self.fingerprints = current
+        self.loaded = _now()
+        self.expires = expires
+        if incoming:
+            self.negative = {}
+        if changes:
+            self._searches = {}
+
+    def index(self, key):
+        r"""Return a dictionary of value to the objects holding it under key.
+
+        Objects without the key, or with an unhashable value, are left out.
+        """
+        index = self._indexes.get(key)
+        if index is None:
+            index = {}
+            for obj in self.objects:
+                value = obj.get(key, _MISSING)
+                if value is _MISSING:
+                    continue
+                try:
+                    index.setdefault(value, []).append(obj)
+                except TypeError:
+                    continue
+            # Building twice in two threads is harmless, the results are equal.
+            self._indexes[key] = index
+        return index
+
+    def search(self, fields, substring=False):
+        r"""Return a SearchIndex over fields, built once and reused.
+
+        It is rebuilt after a refresh that changed any object.
+        """
+        key = tuple(fields), bool(substring)
+        index = self._searches.get(key)
+        if index is None:
+            index = SearchIndex(self.objects, fields, substring=substring)
+            self._searches[key] = index
+        return index
+
+    def __len__(self):
+        return len(self.objects)
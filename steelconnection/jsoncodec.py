@@ -0,0 +1,103 @@
+# coding: utf-8
+
+"""SteelConnection
+
+JSON codecs used to encode request bodies and decode responses.
+
+Usage:
+    sc = steelconnection.SConnect(realm, username, password, codec='orjson')
+
+    Available codecs are 'json' (the standard library, default),
+    'orjson' and 'ujson'. The faster codecs must be installed separately.
+    Any object providing ``encode(data)`` and ``decode(response)``
+    methods can be used as a custom codec.
+"""
+
+import json
+
+try:
+    _string_types = basestring  # Python 2
+except NameError:
+    _string_types = str
+
+
+class StdlibCodec(object):
+    """Codec based on the standard library json module."""
+
+    name = "json"
+
+    def encode(self, data):
+        """Return data serialized as a JSON string."""
+        return json.dumps(data)
+
+    def decode(self, response):
+        """Return the JSON body of a response as native Python data."""
+        return response.json()
+
+
+class OrjsonCodec(object):
+    """Codec based on the orjson package."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def encode(self, data):
+        """Return data serialized as JSON bytes."""
+        return self._orjson.dumps(data)
+
+    def decode(self, response):
+        """Return the JSON body of a response as native Python data."""
+        return self._orjson.loads(response.content)
+
+
+class UjsonCodec(object):
+    """Codec based on the ujson package."""
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._ujson = ujson
+
+    def encode(self, data):
+        """Return data serialized as a JSON string."""
+        return self._ujson.dumps(data)
+
+    def decode(self, response):
+        """Return the JSON body of a response as native Python data."""
+        return self._ujson.loads(response.content)
+
+
+CODECS = {codec.name: codec for codec in (StdlibCodec, OrjsonCodec, UjsonCodec)}
+
+
+def get_codec(codec=None):
+    r"""Return a codec instance.
+
+    Args:
+        codec (str or object): (optional) Name of a codec,
+            or an object with ``encode`` and ``decode`` methods.
+
+    Returns:
+        object: Codec providing ``encode`` and ``decode``.
+
+    Raises:
+        ValueError: If the codec name is unknown.
+        ImportError: If the package needed by the codec is not installed.
+    """
+    if codec is None:
+        return StdlibCodec()
+    # Names first: on Python 2 a str has encode and decode methods too.
+    if not isinstance(codec, _string_types):
+        if hasattr(codec, "encode") and hasattr(codec, "decode"):
+            return codec
+    if codec not in CODECS:
+        raise ValueError(
+            "Unknown codec {!r}, choose from: {}".format(codec, ", ".join(CODECS))
+        )
+    return CODECS[codec]()
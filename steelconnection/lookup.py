@@ -7,6 +7,13 @@ Convienience object for ID value lookups based on common criteria.
 Should be instantiated within a steelconnection object.
 """
 
+from functools import partial
+
+from .graph import COLLECTIONS, RealmGraph
+from .query import Query
+from .search import SearchIndex
+from .snapshot import Snapshot
+
 
 class LookUp(object):
     """Provide convienience tools to lookup objects."""
@@ -16,16 +23,36 @@ class LookUp(object):
         self.sconnect = sconnect
         self._model = model
 
+    @property
+    def inventory(self):
+        """Inventory of the SteelConnection object, or None if not indexed."""
+        return getattr(self.sconnect, "inventory", None)
+
     def iter_find(self, domain, search):
         """
         Generic search function.
         Given a resource type (domain)
-        and a dictionary of {keyword: value} pairs to match,
+        and a dictionary of {keyword: value} pairs to match, or a Query,
         returns a gereator of dictionaries matching the search criteria.
-        """
-        for obj in self.sconnect.get(domain):
-            if all(obj[key] == value for key, value in search.items()):
-                yield obj
+        The search is compiled once, see steelconnection.query for operators.
+        The collection is streamed, so stopping at the first match
+        does not read the rest of it.
+        With an inventory, the collection is fetched once and indexed.
+        """
+        query = search if isinstance(search, Query) else Query(search)
+        inventory = self.inventory
+        if inventory is not None:
+            fetch = partial(self.sconnect.get, domain)
+            if query.equalities:
+                key = min(query.equalities)
+                value = query.equalities[key]
+                candidates = inventory.lookup(domain, key, value, fetch)
+            else:
+                candidates = inventory.collection(domain, fetch).objects
+        else:
+            candidates = self.sconnect.iter_get(domain)
+        for obj in query.filter(candidates):
+            yield obj
 
     def find(self, domain, search):
         """
@@ -46,6 +73,85 @@ class LookUp(object):
         except StopIteration:
             return None
 
+    def find_many(self, domain, key, values):
+        """
+        Batch lookup function.
+        Given a resource type (domain), a key to match, and many values,
+        downloads the collection once and returns a dictionary
+        mapping each value to the first matching object, or to None
+        when no object matches.
+        """
+        values = list(values)
+        found = dict.fromkeys(values)
+        inventory = self.inventory
+        if inventory is not None:
+            fetch = partial(self.sconnect.get, domain)
+            index = inventory.collection(domain, fetch).index(key)
+            for value in values:
+                matches = index.get(value)
+                found[value] = matches[0] if matches else None
+            return found
+        remaining = set(values)
+        for obj in self.sconnect.iter_get(domain):
+            value = obj.get(key)
+            try:
+                if value not in remaining:
+                    continue
+            except TypeError:  # Unhashable values never match.
+                continue
+            found[value] = obj
+            remaining.discard(value)
+            if not remaining:
+                break
+        return found
+
+    def refresh(self, domain, key="id"):
+        """
+        Incremental refresh of an indexed collection.
+        Downloads the resource type (domain) again, bypassing any cache,
+        updates the inventory with only the objects that differ,
+        and returns a ChangeSet of the added, changed and removed objects.
+        """
+        inventory = self.inventory
+        if inventory is None:
+            raise ValueError("refresh requires SConnect(..., inventory=True).")
+        fetch = partial(self.sconnect._fetch, "scm.config", domain)
+        return inventory.refresh(domain, fetch, key=key)
+
+    def snapshot(self, domain, fields=None):
+        """
+        Columnar copy of a collection for fast reports.
+        Given a resource type (domain) and optionally the fields to keep,
+        returns a Snapshot supporting filter, group_count and map.
+        """
+        inventory = self.inventory
+        if inventory is not None:
+            fetch = partial(self.sconnect.get, domain)
+            objects = inventory.collection(domain, fetch).objects
+        else:
+            objects = self.sconnect.iter_get(domain)
+        return Snapshot.from_objects(objects, fields=fields)
+
+    def search_index(self, domain, fields=("serial", "name"), substring=False):
+        """
+        Prefix and substring search over some fields of a collection.
+        Returns a SearchIndex supporting startswith and, with substring=True,
+        contains. With an inventory, the index is kept with the collection.
+        """
+        inventory = self.inventory
+        if inventory is not None:
+            fetch = partial(self.sconnect.get, domain)
+            return inventory.collection(domain, fetch).search(fields, substring)
+        return SearchIndex(self.sconnect.iter_get(domain), fields, substring=substring)
+
+    def graph(self, orgid=None, collections=COLLECTIONS):
+        """
+        Joined views over the objects of a realm, or of one org.
+        Downloads the collections concurrently and returns a RealmGraph,
+        for example graph.get('nodes', node_id).site.name
+        """
+        return RealmGraph(self.sconnect, orgid, collections).load()
+
     def node(self, pattern, key="serial"):
         """
         Returns a node matching a provided appliance serial number.
@@ -76,6 +182,38 @@ class LookUp(object):
         resource = "/".join(("org", orgid, "wans"))
         return self.find_one(domain=resource, search={key: pattern})
 
+    def nodes(self, patterns, key="serial"):
+        """
+        Returns a dictionary of appliance serial number to node, or None.
+        """
+        patterns = list(patterns)
+        found = self.find_many("nodes", key, [p.upper() for p in patterns])
+        return {pattern: found[pattern.upper()] for pattern in patterns}
+
+    def orgs(self, patterns, key="name"):
+        """
+        Returns a dictionary of organization short name to org, or None.
+        """
+        return self.find_many("orgs", key, patterns)
+
+    def sites(self, patterns, orgid=None, key="name"):
+        """
+        Returns a dictionary of site short name to site, or None.
+        """
+        if not orgid:
+            raise ValueError("orgid required when looking up sites.")
+        resource = "/".join(("org", orgid, "sites"))
+        return self.find_many(resource, key, patterns)
+
+    def wans(self, patterns, orgid=None, key="name"):
+        """
+        Returns a dictionary of wan name to wan, or None.
+        """
+        if not orgid:
+            raise ValueError("orgid required when looking up wans.")
+        resource = "/".join(("org", orgid, "wans"))
+        return self.find_many(resource, key, patterns)
+
     def model(self, value, default=None):
         """
         Translates a model code name to real name and visa versa.
@@ -0,0 +1,265 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Per-endpoint request metrics for SteelConnect CX Manager.
+
+Usage:
+    sc = steelconnection.SConnect(realm, username, password)
+    ...
+    sc.stats.snapshot()    # Nested dictionary of counters and latencies.
+    sc.stats.prometheus()  # Prometheus text exposition format.
+
+    Requests are grouped by method, api and resource template,
+    where object ids are replaced by '{id}', for example 'node/{id}/ports'.
+    Recording a request takes constant time and memory: latencies are
+    counted in fixed histogram buckets, from which percentiles are estimated.
+"""
+
+from bisect import bisect_left
+import re
+import threading
+
+
+# Upper bounds in seconds, growing by sqrt(2) from 1 ms to about 2 minutes.
+LATENCY_BUCKETS = tuple(round(0.001 * 2 ** (index / 2.0), 6) for index in range(35))
+
+_ID_SEGMENT = re.compile(r"^[a-z]+-\S+$")
+
+
+class Metrics(object):
+    r"""Thread-safe counters and latency histograms per endpoint.
+
+    Attributes:
+        buckets (tuple): Upper bounds of the latency histogram in seconds.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        r"""Create empty metrics.
+
+        Args:
+            buckets (tuple): (optional) Sorted latency bucket bounds in seconds.
+        """
+        self.buckets = tuple(buckets)
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        method,
+        url,
+        status,
+        elapsed,
+        bytes_sent=0,
+        bytes_received=0,
+        retries=0,
+        error=None,
+    ):
+        r"""Record one request.
+
+        Args:
+            method (str): HTTP verb.
+            url (str): Complete url of the request.
+            status (int): HTTP status code, or None if no response arrived.
+            elapsed (float): Seconds spent on the request, including retries.
+            bytes_sent (int): (optional) Size of the request body.
+            bytes_received (int): (optional) Size of the response body.
+            retries (int): (optional) Retries needed by the request.
+            error (Exception): (optional) Exception raised by the request.
+        """
+        key = (method,) + resource_template(url)
+        bucket = bisect_left(self.buckets, elapsed)
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = _Endpoint(len(self.buckets))
+            endpoint.count += 1
+            endpoint.latency[bucket] += 1
+            endpoint.latency_sum += elapsed
+            endpoint.bytes_sent += bytes_sent
+            endpoint.bytes_received += bytes_received
+            endpoint.retries += retries
+            if error is not None:
+                status = type(error).__name__
+                endpoint.errors += 1
+            elif status >= 400:
+                endpoint.errors += 1
+            endpoint.statuses[status] = endpoint.statuses.get(status, 0) + 1
+
+    def snapshot(self):
+        r"""Return a copy of all metrics as native Python data.
+
+        Returns:
+            dict: {method: {api: {resource template: details}}}, where
+                details holds count, errors, retries, statuses,
+                bytes_sent, bytes_received, latency_avg, p50, p95 and p99.
+        """
+        with self._lock:
+            endpoints = [
+                (key, endpoint.copy()) for key, endpoint in self._endpoints.items()
+            ]
+        result = {}
+        for (method, api, template), endpoint in endpoints:
+            result.setdefault(method, {}).setdefault(api, {})[template] = {
+                "count": endpoint.count,
+                "errors": endpoint.errors,
+                "retries": endpoint.retries,
+                "statuses": endpoint.statuses,
+                "bytes_sent": endpoint.bytes_sent,
+                "bytes_received": endpoint.bytes_received,
+                "latency_avg": endpoint.latency_sum / endpoint.count,
+                "p50": self._quantile(endpoint.latency, 0.50),
+                "p95": self._quantile(endpoint.latency, 0.95),
+                "p99": self._quantile(endpoint.latency, 0.99),
+            }
+        return result
+
+    def prometheus(self, prefix="steelconnection"):
+        r"""Return all metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): (optional) Prefix of every metric name.
+
+        Returns:
+            str: Metrics ready to be served to a Prometheus scraper.
+        """
+        with self._lock:
+            endpoints = sorted(
+                ((key, endpoint.copy()) for key, endpoint in self._endpoints.items()),
+                key=lambda pair: pair[0],
+            )
+        lines = []
+
+        def header(name, kind, text):
+            lines.append("# HELP {}_{} {}".format(prefix, name, text))
+            lines.append("# TYPE {}_{} {}".format(prefix, name, kind))
+
+        header("requests_total", "counter", "Requests sent, by response status.")
+        for key, endpoint in endpoints:
+            for status, count in sorted(endpoint.statuses.items(), key=str):
+                labels = _labels(key, status=status)
+                lines.append("{}_requests_total{} {}".format(prefix, labels, count))
+        for name, attribute, text in (
+            ("errors_total", "errors", "Requests that failed."),
+            ("retries_total", "retries", "Retries made."),
+            ("bytes_sent_total", "bytes_sent", "Bytes of request bodies."),
+            ("bytes_received_total", "bytes_received", "Bytes of response bodies."),
+        ):
+            header(name, "counter", text)
+            for key, endpoint in endpoints:
+                value = getattr(endpoint, attribute)
+                lines.append("{}_{}{} {}".format(prefix, name, _labels(key), value))
+        name = "request_duration_seconds"
+        header(name, "histogram", "Request latency, including retries.")
+        for key, endpoint in endpoints:
+            cumulative = 0
+            bounds = self.buckets + (float("inf"),)
+            for bound, count in zip(bounds, endpoint.latency):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _labels(key, le=le)
+                lines.append(
+                    "{}_{}_bucket{} {}".format(prefix, name, labels, cumulative)
+                )
+            labels = _labels(key)
+            lines.append(
+                "{}_{}_sum{} {!r}".format(prefix, name, labels, endpoint.latency_sum)
+            )
+            lines.append(
+                "{}_{}_count{} {}".format(prefix, name, labels, endpoint.count)
+            )
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Discard all recorded metrics."""
+        with self._lock:
+            self._endpoints.clear()
+
+    def _quantile(self, latency, fraction):
+        """Estimate a latency percentile by interpolating within its bucket."""
+        total = sum(latency)
+        rank = fraction * total
+        seen = 0
+        for index, count in enumerate(latency):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                if index == len(self.buckets):  # Overflow bucket has no bound.
+                    return lower
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return 0.0
+
+    def __repr__(self):
+        return "{}(endpoints={})".format(self.__class__.__name__, len(self._endpoints))
+
+
+class _Endpoint(object):
+    """Counters for one (method, api, resource template)."""
+
+    __slots__ = (
+        "count",
+        "errors",
+        "retries",
+        "statuses",
+        "bytes_sent",
+        "bytes_received",
+        "latency",
+        "latency_sum",
+    )
+
+    def __init__(self, buckets):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.statuses = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency = [0] * (buckets + 1)  # Last bucket counts overflows.
+        self.latency_sum = 0.0
+
+    def copy(self):
+        other = _Endpoint(0)
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        other.statuses = dict(self.statuses)
+        other.latency = list(self.latency)
+        return other
+
+
+def resource_template(url):
+    r"""Split a url into its api and a resource template.
+
+    Object ids such as 'node-0a1b2c' are replaced by '{id}'.
+
+    Args:
+        url (str): Complete url, or a resource path.
+
+    Returns:
+        tuple: (api, template), for example ('scm.config', 'node/{id}/ports').
+    """
+    path = url.split("?", 1)[0]
+    api = ""
+    if "/api/" in path:
+        api, _, path = path.split("/api/", 1)[1].partition("/")
+        path = path.partition("/")[2]  # Drop the api version.
+    segments = [
+        "{id}" if _ID_SEGMENT.match(segment) else segment
+        for segment in path.split("/")
+        if segment
+    ]
+    return api, "/".join(segments)
+
+
+def _labels(key, **extra):
+    """Format Prometheus labels for an endpoint key."""
+    method, api, template = key
+    pairs = [("method", method), ("api", api), ("resource", template)]
+    pairs.extend(sorted(extra.items()))
+    return "{" + ",".join('{}="{}"'.format(k, _escape(v)) for k, v in pairs) + "}"
+
+
+def _escape(value):
+    """Escape a Prometheus label value."""
+    value = str(value)
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
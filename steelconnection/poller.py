@@ -0,0 +1,274 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Poll many Reporting API resources on a fixed interval.
+
+Usage:
+    resources = ['node/' + node['id'] for node in sc.get('nodes')]
+    poller = steelconnection.Poller(sc, resources, interval=60, callback=print)
+    poller.start()                  # Runs in a background thread.
+    ...
+    poller.stop()
+    print(poller.last_sweep)        # Sweep(number=12, duration=58.7, ...)
+
+    Requests are spread evenly over the interval rather than sent all
+    at once, and at most ``workers`` of them run at the same time.
+    Every result is passed to the callback, or put on the queue,
+    as a BulkResult(resource, result, error) as soon as it arrives.
+    A request that cannot start on time, because all workers are busy,
+    starts as soon as one is free; the delay is reported as lag.
+    A sweep that overruns the interval delays the next sweep.
+"""
+
+from collections import deque, namedtuple
+import logging
+import threading
+import time
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
+from .bulk import BulkResult
+
+
+logger = logging.getLogger(__name__)
+
+_now = getattr(time, "monotonic", time.time)
+
+Sweep = namedtuple(
+    "Sweep", ("number", "started", "duration", "requests", "errors", "lag")
+)
+Sweep.__doc__ = """Statistics of one pass over every resource.
+
+``started`` is a clock value, ``duration`` the seconds from the first
+request being due until the last result, and ``lag`` the longest delay
+of a request behind its scheduled time.
+"""
+
+
+class Poller(object):
+    r"""Request a set of resources once per interval with bounded concurrency.
+
+    Attributes:
+        resources (list): Resources requested in each sweep.
+        interval (float): Seconds between the start of two sweeps.
+        workers (int): Maximum simultaneous requests.
+        sweeps (deque): Sweep statistics, most recent last.
+    """
+
+    def __init__(
+        self,
+        sconnect,
+        resources,
+        interval=60,
+        workers=None,
+        callback=None,
+        queue=None,
+        params=None,
+        api="scm.reporting",
+        history=100,
+    ):
+        r"""Prepare a poller, call start or run to begin polling.
+
+        Args:
+            sconnect (SConnect): Object used to send the requests.
+            resources (iterable): Resources, such as 'node/<id>'.
+            interval (float): (optional) Seconds between sweeps.
+            workers (int): (optional) Maximum simultaneous requests,
+                default the max_workers of sconnect.
+            callback (function): (optional) Called with each BulkResult,
+                from a worker thread.
+            queue (Queue): (optional) Receives each BulkResult.
+            params (dict): (optional) Query parameters for every request.
+            api (str): (optional) api route, usually 'scm.reporting'.
+            history (int): (optional) Number of Sweep statistics kept.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be greater than zero.")
+        self.sconnect = sconnect
+        self.resources = list(resources)
+        self.interval = float(interval)
+        self.workers = workers if workers else sconnect.max_workers
+        self.callback = callback
+        self.queue = queue
+        self.params = params
+        self.api = api
+        self.sweeps = deque(maxlen=history)
+        self._stopping = threading.Event()
+        self._thread = None
+
+    @property
+    def last_sweep(self):
+        """Statistics of the most recent sweep, or None."""
+        return self.sweeps[-1] if self.sweeps else None
+
+    def start(self):
+        r"""Poll in a background thread until stop is called.
+
+        Returns:
+            Poller: self, for chaining.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("Poller is already running.")
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self.run)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        r"""Stop polling, after the requests in progress finish.
+
+        Args:
+            timeout (float): (optional) Seconds to wait for the thread.
+        """
+        self._stopping.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    @property
+    def running(self):
+        """True while the background thread is polling."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def run(self, sweeps=None):
+        r"""Poll in the calling thread.
+
+        Args:
+            sweeps (int): (optional) Stop after this many sweeps,
+                default run until stop is called.
+
+        Returns:
+            list: Sweep statistics of the sweeps run by this call.
+        """
+        self.sconnect._size_pool(self.workers)
+        tasks = queue.Queue(maxsize=self.workers)
+        threads = []
+        for _ in range(max(1, min(self.workers, len(self.resources)))):
+            thread = threading.Thread(target=self._work, args=(tasks,))
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+        completed = []
+        start = _now()
+        try:
+            while not self._stopping.is_set():
+                if sweeps is not None and len(completed) >= sweeps:
+                    break
+                sweep = self._sweep(tasks, start)
+                if sweep is None:
+                    break
+                self.sweeps.append(sweep)
+                completed.append(sweep)
+                # An overrun sweep delays the next one instead of bunching.
+                start = max(start + self.interval, _now())
+                if sweeps is None or len(completed) < sweeps:
+                    self._stopping.wait(max(0, start - _now()))
+        finally:
+            for _ in threads:
+                tasks.put(None)
+        return completed
+
+    def _sweep(self, tasks, start):
+        """Schedule every resource once, evenly spaced, and wait for results."""
+        number = self.sweeps[-1].number + 1 if self.sweeps else 1
+        tracker = _Tracker(len(self.resources))
+        spacing = self.interval / max(1, len(self.resources))
+        for index, resource in enumerate(self.resources):
+            due = start + index * spacing
+            if tracker.fatal is not None or self._stopping.wait(max(0, due - _now())):
+                tracker.cancel(len(self.resources) - index)
+                break
+            tasks.put((resource, due, tracker))  # Blocks while all workers are busy.
+        tracker.done.wait()
+        if tracker.fatal is not None:
+            raise tracker.fatal
+        if tracker.requests == 0:
+            return None
+        return Sweep(
+            number,
+            start,
+            tracker.finished - start,
+            tracker.requests,
+            tracker.errors,
+            tracker.lag,
+        )
+
+    def _work(self, tasks):
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            resource, due, tracker = task
+            started = _now()
+            item, fatal = None, None
+            try:
+                try:
+                    result = self.sconnect._fetch(
+                        self.api, resource, params=self.params
+                    )
+                    item = BulkResult(resource, result, None)
+                except Exception as e:
+                    item = BulkResult(resource, None, e)
+                self._deliver(item)
+            except BaseException as e:  # Such as SystemExit, raised again by the sweep.
+                fatal = e
+            failed = item is None or item.error is not None
+            tracker.record(started - due, failed, fatal)
+
+    def _deliver(self, item):
+        if self.callback is not None:
+            try:
+                self.callback(item)
+            except Exception:
+                # A faulty callback must not stop the sweeps.
+                logger.exception("Poller callback failed for %s", item.resource)
+        if self.queue is not None:
+            self.queue.put(item)
+
+    def __repr__(self):
+        return "{}(resources={}, interval={}, workers={}, running={})".format(
+            self.__class__.__name__,
+            len(self.resources),
+            self.interval,
+            self.workers,
+            self.running,
+        )
+
+
+class _Tracker(object):
+    """Count the results of one sweep, from several worker threads."""
+
+    def __init__(self, expected):
+        self.expected = expected
+        self.requests = 0
+        self.errors = 0
+        self.lag = 0.0
+        self.fatal = None
+        self.finished = _now()
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+        if not expected:
+            self.done.set()
+
+    def record(self, lag, failed, fatal=None):
+        with self._lock:
+            self.requests += 1
+            self.errors += failed
+            self.lag = max(self.lag, lag)
+            if self.fatal is None:
+                self.fatal = fatal
+            self.finished = _now()
+            self._check()
+
+    def cancel(self, count):
+        with self._lock:
+            self.expected -= count
+            self._check()
+
+    def _check(self):
+        if self.requests >= self.expected:
+            self.done.set()
@@ -0,0 +1,295 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Query language for searching collections with LookUp.
+
+Usage:
+    query = steelconnection.Query({
+        'model': {'$in': ['panda', 'yogi']},
+        'serial': {'$regex': '^XN0'},
+        'location.city': {'$exists': True},
+        '$or': [{'state': 'offline'}, {'sw_version': {'$lt': '2.12'}}],
+    })
+    offline = sc.lookup.find('nodes', query)
+
+    A query is a dictionary of field to condition. A condition is either
+    a plain value, matched by equality, or a dictionary of operators:
+        $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte, $regex, $exists, $not
+    Fields may be dotted paths into nested objects and lists,
+    such as 'location.city' or 'uplinks.0'.
+    A value of None matches fields that are null or missing.
+    Conditions on several fields must all match; $and, $or and $not
+    combine whole queries.
+
+    A query is compiled once into a predicate function,
+    so it can be reused cheaply over large collections.
+"""
+
+import re
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+_MISSING = object()
+
+try:
+    _string_types = basestring  # Python 2
+except NameError:
+    _string_types = str
+
+
+class Query(object):
+    r"""A search compiled into a predicate.
+
+    Attributes:
+        spec (dict): The query as written.
+        equalities (dict): Top level fields matched by a plain hashable value,
+            which an index can answer without scanning.
+    """
+
+    def __init__(self, spec):
+        r"""Compile a query.
+
+        Args:
+            spec (dict): Field conditions and combinators.
+
+        Raises:
+            ValueError: If the query uses an unknown operator.
+        """
+        if isinstance(spec, Query):
+            spec = spec.spec
+        self.spec = spec
+        self.equalities = _equalities(spec)
+        self._predicate = compile_query(spec)
+
+    def __call__(self, obj):
+        """Return True if obj matches the query."""
+        return self._predicate(obj)
+
+    def filter(self, objects):
+        """Yield the objects matching the query."""
+        predicate = self._predicate
+        for obj in objects:
+            if predicate(obj):
+                yield obj
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.spec)
+
+
+def compile_query(spec):
+    r"""Compile a query into a predicate function.
+
+    Args:
+        spec (dict): Field conditions and combinators.
+
+    Returns:
+        function: Takes an object and returns True if it matches.
+
+    Raises:
+        ValueError: If the query uses an unknown operator.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("A query must be a dictionary, not {!r}".format(spec))
+    predicates = []
+    for field, condition in spec.items():
+        if field == "$and":
+            predicates.append(_all([compile_query(part) for part in condition]))
+        elif field == "$or":
+            predicates.append(_any([compile_query(part) for part in condition]))
+        elif field == "$not":
+            predicates.append(_negate(compile_query(condition)))
+        elif field.startswith("$"):
+            raise ValueError("Unknown query operator {!r}".format(field))
+        else:
+            predicates.append(_compile_field(field, condition))
+    return _all(predicates)
+
+
+def _compile_field(field, condition):
+    """Compile the condition on one field into a predicate."""
+    if "." not in field:
+        # Common case: a top level key matched by a plain value.
+        if not _is_operators(condition):
+            if condition is None:
+                return lambda obj: obj.get(field) is None
+            return lambda obj: obj.get(field, _MISSING) == condition
+
+        def getter(obj):
+            return obj.get(field, _MISSING)
+
+    else:
+        getter = _path_getter(field.split("."))
+    test = _compile_condition(condition)
+    return lambda obj: test(getter(obj))
+
+
+def _compile_condition(condition):
+    """Compile a plain value or a dictionary of operators into a value test."""
+    if not _is_operators(condition):
+        return _OPERATORS["$eq"](condition)
+    tests = []
+    for operator, argument in condition.items():
+        if operator == "$not":
+            tests.append(_negate(_compile_condition(argument)))
+        elif operator in _OPERATORS:
+            tests.append(_OPERATORS[operator](argument))
+        else:
+            raise ValueError("Unknown query operator {!r}".format(operator))
+    return _all(tests)
+
+
+def _is_operators(condition):
+    """Check if a condition is a dictionary of operators."""
+    return (
+        isinstance(condition, dict)
+        and bool(condition)
+        and all(
+            isinstance(key, _string_types) and key.startswith("$") for key in condition
+        )
+    )
+
+
+def _path_getter(parts):
+    """Return a function that follows a dotted path into an object."""
+
+    def getter(obj):
+        for part in parts:
+            if isinstance(obj, Mapping):
+                obj = obj.get(part, _MISSING)
+            elif isinstance(obj, (list, tuple)) and part.isdigit():
+                index = int(part)
+                obj = obj[index] if index < len(obj) else _MISSING
+            else:
+                return _MISSING
+            if obj is _MISSING:
+                return obj
+        return obj
+
+    return getter
+
+
+# Value tests, each built once from the operator's argument.
+
+
+def _eq(expected):
+    if expected is None:
+        return lambda value: value is None or value is _MISSING
+    return lambda value: value == expected
+
+
+def _ne(expected):
+    return _negate(_eq(expected))
+
+
+def _in(choices):
+    choices = list(choices)
+    nulls = None in choices
+    try:
+        members = frozenset(choice for choice in choices if choice is not None)
+    except TypeError:  # Unhashable choices are compared one by one.
+        members = [choice for choice in choices if choice is not None]
+
+    def test(value):
+        if value is None or value is _MISSING:
+            return nulls
+        try:
+            return value in members
+        except TypeError:
+            return False
+
+    return test
+
+
+def _nin(choices):
+    return _negate(_in(choices))
+
+
+def _comparison(compare):
+    def build(bound):
+        def test(value):
+            if value is None or value is _MISSING:
+                return False
+            try:
+                return compare(value, bound)
+            except TypeError:  # Values of other types never match.
+                return False
+
+        return test
+
+    return build
+
+
+def _regex(pattern):
+    regex = re.compile(pattern) if isinstance(pattern, _string_types) else pattern
+    search = regex.search
+    return lambda value: isinstance(value, _string_types) and search(value) is not None
+
+
+def _exists(expected):
+    expected = bool(expected)
+    return lambda value: (value is not _MISSING) == expected
+
+
+_OPERATORS = {
+    "$eq": _eq,
+    "$ne": _ne,
+    "$in": _in,
+    "$nin": _nin,
+    "$gt": _comparison(lambda value, bound: value > bound),
+    "$gte": _comparison(lambda value, bound: value >= bound),
+    "$lt": _comparison(lambda value, bound: value < bound),
+    "$lte": _comparison(lambda value, bound: value <= bound),
+    "$regex": _regex,
+    "$exists": _exists,
+}
+
+
+# Combinators, chained in pairs to avoid a generator per object.
+
+
+def _all(predicates):
+    if not predicates:
+        return lambda obj: True
+    first = predicates[0]
+    if len(predicates) == 1:
+        return first
+    rest = _all(predicates[1:])
+    return lambda obj: first(obj) and rest(obj)
+
+
+def _any(predicates):
+    if not predicates:
+        return lambda obj: False
+    first = predicates[0]
+    if len(predicates) == 1:
+        return first
+    rest = _any(predicates[1:])
+    return lambda obj: first(obj) or rest(obj)
+
+
+def _negate(predicate):
+    return lambda obj: not predicate(obj)
+
+
+def _equalities(spec):
+    """Return the top level fields that a query matches by a hashable value."""
+    equalities = {}
+    if not isinstance(spec, dict):
+        return equalities
+    for field, condition in spec.items():
+        if field.startswith("$") or "." in field or condition is None:
+            continue
+        if _is_operators(condition):
+            if list(condition) != ["$eq"] or condition["$eq"] is None:
+                continue
+            condition = condition["$eq"]
+        try:
+            hash(condition)
+        except TypeError:
+            continue
+        equalities[field] = condition
+    return equalities
@@ -0,0 +1,185 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Client side rate limiting for requests sent to SteelConnect CX Manager.
+
+Usage:
+    # Allow 10 requests per second with bursts of up to 20.
+    bucket = steelconnection.TokenBucket(rate=10, burst=20)
+    sc = steelconnection.SConnect(realm, username, password, rate_limit=bucket)
+
+    # Share one budget between every SConnect object for the same realm.
+    bucket = steelconnection.TokenBucket.for_realm(realm, rate=10, burst=20)
+
+    # Share one budget between processes on the same host.
+    bucket = steelconnection.FileTokenBucket('/tmp/realm.bucket', rate=10)
+
+    Every attempt made by the SConnect object, retries included,
+    takes one token from the bucket, waiting when none are available.
+"""
+
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+_now = getattr(time, "monotonic", time.time)
+
+
+class TokenBucket(object):
+    r"""Thread-safe token bucket.
+
+    Tokens are added at ``rate`` per second up to ``burst``.
+    A caller that finds the bucket empty reserves a token anyway
+    and sleeps until that token would have been added,
+    so waiting callers are served in order of arrival.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        burst (float): Maximum number of tokens held.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rate, burst=None):
+        r"""Create a full bucket.
+
+        Args:
+            rate (float): Requests allowed per second.
+            burst (float): (optional) Requests allowed at once, default ``rate``.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero.")
+        self.rate = float(rate)
+        self.burst = float(burst if burst else max(1, rate))
+        self._tokens = self.burst
+        self._updated = _now()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_realm(cls, realm, rate, burst=None):
+        r"""Return the bucket shared by all callers for one realm.
+
+        The first call for a realm creates the bucket;
+        later calls return it unchanged.
+
+        Args:
+            realm (str): FQDN of SteelConnect CX Manager.
+            rate (float): Requests allowed per second.
+            burst (float): (optional) Requests allowed at once.
+
+        Returns:
+            TokenBucket: The shared bucket.
+        """
+        with cls._shared_lock:
+            if realm not in cls._shared:
+                cls._shared[realm] = cls(rate, burst)
+            return cls._shared[realm]
+
+    def acquire(self, tokens=1):
+        r"""Take tokens from the bucket, sleeping until they are available.
+
+        Args:
+            tokens (float): (optional) Number of tokens to take.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        with self._lock:
+            now = _now()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def __repr__(self):
+        return "{}(rate={}, burst={})".format(
+            self.__class__.__name__, self.rate, self.burst
+        )
+
+
+class FileTokenBucket(object):
+    r"""Token bucket stored in a file, shared by every process that opens it.
+
+    The bucket state is kept in a small text file and updated
+    under an exclusive ``fcntl`` lock. Only available on POSIX systems.
+
+    Attributes:
+        path (str): Location of the bucket file.
+        rate (float): Tokens added per second.
+        burst (float): Maximum number of tokens held.
+    """
+
+    def __init__(self, path, rate, burst=None):
+        r"""Open or create a bucket file.
+
+        Args:
+            path (str): Location of the bucket file.
+            rate (float): Requests allowed per second.
+            burst (float): (optional) Requests allowed at once, default ``rate``.
+        """
+        if fcntl is None:
+            raise RuntimeError("FileTokenBucket requires fcntl (POSIX only).")
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero.")
+        self.path = path
+        self.rate = float(rate)
+        self.burst = float(burst if burst else max(1, rate))
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        r"""Take tokens from the bucket, sleeping until they are available.
+
+        Args:
+            tokens (float): (optional) Number of tokens to take.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                available, updated = self._read(fd)
+                now = time.time()
+                available = min(self.burst, available + (now - updated) * self.rate)
+                available -= tokens
+                self._write(fd, available, now)
+            finally:
+                os.close(fd)  # Also releases the lock.
+        wait = -available / self.rate if available < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def _read(self, fd):
+        """Return (tokens, timestamp) from the file, or a full bucket."""
+        os.lseek(fd, 0, os.SEEK_SET)
+        try:
+            available, updated = os.read(fd, 64).split()
+            return float(available), float(updated)
+        except ValueError:  # New or unreadable file.
+            return self.burst, time.time()
+
+    def _write(self, fd, available, updated):
+        """Store (tokens, timestamp) in the file."""
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.ftruncate(fd, 0)
+        os.write(fd, "{!r} {!r}".format(available, updated).encode())
+
+    def __repr__(self):
+        return "{}({!r}, rate={}, burst={})".format(
+            self.__class__.__name__, self.path, self.rate, self.burst
+        )
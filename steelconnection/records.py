@@ -0,0 +1,223 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Compact read-only records for the objects of large collections.
+
+Usage:
+    sc = steelconnection.SConnect(realm, username, password, compact=True)
+    nodes = sc.get('nodes')
+    nodes[0]['serial'], nodes[0].get('location')    # Read like a dict.
+    nodes[0].to_dict()                              # A plain dict copy.
+
+    Each collection gets a record type whose fields are stored in
+    __slots__ rather than in a dictionary per object. Repeated string
+    values, such as org ids, site ids and model code names, are shared
+    between records instead of being stored once per object.
+    Fields that a record type does not know are kept in a small dict.
+
+    Records are Mappings: they support [], get, keys, items, in and ==
+    with dicts, but not assignment. Call to_dict() to modify an object
+    before sending it with put or post, which also accept records.
+"""
+
+import threading
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+try:
+    _text_types = (str, unicode)  # Python 2
+except NameError:
+    _text_types = (str,)
+
+_MISSING = object()
+
+
+class Record(Mapping):
+    """Base class of the slotted record types, one per collection."""
+
+    __slots__ = ("_extra",)
+    _fields = ()
+    _slots = {}
+
+    def __getitem__(self, key):
+        slot = self._slots.get(key)
+        if slot is not None:
+            try:
+                return getattr(self, slot)
+            except AttributeError:
+                raise KeyError(key)
+        extra = self._extra
+        if extra is not None and key in extra:
+            return extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        slot = self._slots.get(key)
+        if slot is not None:
+            return getattr(self, slot, default)
+        extra = self._extra
+        return extra.get(key, default) if extra is not None else default
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        for field in self._fields:
+            if hasattr(self, self._slots[field]):
+                yield field
+        if self._extra is not None:
+            for key in self._extra:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self):
+        """Return the record as a new plain dictionary."""
+        return {key: self[key] for key in self}
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.to_dict())
+
+
+class Compactor(object):
+    r"""Convert dictionaries to records, sharing repeated strings.
+
+    Attributes:
+        pool_limit (float): Stop sharing the values of a field when more
+            than this fraction of them are distinct, such as serials.
+    """
+
+    def __init__(self, pool_limit=0.5):
+        r"""Create a compactor without record types.
+
+        Args:
+            pool_limit (float): (optional) Fraction of distinct values
+                above which a field is no longer pooled.
+        """
+        self.pool_limit = pool_limit
+        self._types = {}
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def compact(self, kind, objects):
+        r"""Return a list of records, leaving anything but dicts unchanged.
+
+        Args:
+            kind (str): Name of the collection, such as 'nodes'.
+            objects (iterable): Objects of the collection.
+
+        Returns:
+            list: Records in the same order.
+        """
+        return [
+            self.record(kind, obj) if isinstance(obj, dict) else obj for obj in objects
+        ]
+
+    def record(self, kind, obj):
+        r"""Return one object as a record of its collection's type.
+
+        Args:
+            kind (str): Name of the collection, such as 'nodes'.
+            obj (dict): Object as returned by the API.
+
+        Returns:
+            Record: The same fields and values.
+        """
+        cls = self._types.get(kind)
+        if cls is None:
+            cls = self.record_type(kind, obj)
+        pools = self._pools[kind]
+        slots = cls._slots
+        record = cls.__new__(cls)
+        record._extra = None
+        for key, value in obj.items():
+            if isinstance(value, _text_types):
+                pool = pools.get(key)
+                if pool is None:
+                    pool = pools[key] = _Pool()
+                value = pool.share(value, self.pool_limit)
+            slot = slots.get(key)
+            if slot is not None:
+                setattr(record, slot, value)
+            else:
+                if record._extra is None:
+                    record._extra = {}
+                record._extra[key] = value
+        return record
+
+    def record_type(self, kind, example):
+        r"""Return the record type of a collection, creating it if needed.
+
+        Args:
+            kind (str): Name of the collection, such as 'nodes'.
+            example (dict): Object whose fields become the slots.
+
+        Returns:
+            type: Subclass of Record.
+        """
+        with self._lock:
+            cls = self._types.get(kind)
+            if cls is None:
+                fields = tuple(example)
+                slots = {
+                    field: "_{}".format(index) for index, field in enumerate(fields)
+                }
+                name = str(_type_name(kind))
+                cls = type(
+                    name,
+                    (Record,),
+                    {
+                        "__slots__": tuple(slots.values()),
+                        "_fields": fields,
+                        "_slots": slots,
+                    },
+                )
+                self._pools[kind] = {}
+                self._types[kind] = cls
+        return cls
+
+    def __repr__(self):
+        return "{}(types={})".format(self.__class__.__name__, sorted(self._types))
+
+
+class _Pool(object):
+    """Shared copies of the string values of one field."""
+
+    __slots__ = ("values", "seen")
+
+    def __init__(self):
+        self.values = {}
+        self.seen = 0
+
+    def share(self, value, limit):
+        values = self.values
+        if values is None:
+            return value
+        self.seen += 1
+        shared = values.setdefault(value, value)
+        # Mostly distinct values, such as serials, gain nothing from a pool.
+        if self.seen >= 1024 and len(values) > self.seen * limit:
+            self.values = None
+        return shared
+
+
+def to_plain(value):
+    """Return value with records converted to dicts, for JSON encoding."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    return value
+
+
+def _type_name(kind):
+    """Return a class name for a collection, such as 'Node' for 'nodes'."""
+    name = kind.split("/")[-1] if kind else "record"
+    name = name[:-1] if name.endswith("s") else name
+    return (
+        "".join(part.capitalize() for part in name.replace("-", "_").split("_"))
+        or "Record"
+    )
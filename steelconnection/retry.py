@@ -0,0 +1,117 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Retry policy for requests sent to SteelConnect CX Manager.
+
+Usage:
+    retry = steelconnection.Retry(attempts=5, backoff_base=0.5, backoff_cap=30)
+    sc = steelconnection.SConnect(realm, username, password, retry=retry)
+
+    GET, PUT and DELETE requests are retried by default.
+    POST is only retried when ``retry_post=True``, since repeating it
+    could create the same object twice.
+"""
+
+from email.utils import mktime_tz, parsedate_tz
+import random
+import time
+
+import requests
+
+
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+IDEMPOTENT_METHODS = ("GET", "PUT", "DELETE")
+
+
+class Retry(object):
+    r"""Decide whether and when a failed request is sent again.
+
+    Attributes:
+        attempts (int): Maximum number of attempts, including the first one.
+        backoff_base (float): Seconds to wait before the first retry.
+        backoff_cap (float): Upper bound on the wait between attempts.
+        status_codes (tuple): HTTP status codes that trigger a retry.
+        exceptions (tuple): Exception types that trigger a retry.
+        methods (tuple): HTTP methods that may be retried.
+        respect_retry_after (bool): Wait as long as a Retry-After header asks.
+        max_retry_after (float): Give up instead of waiting longer than this.
+    """
+
+    def __init__(
+        self,
+        attempts=3,
+        backoff_base=0.5,
+        backoff_cap=30,
+        status_codes=RETRY_STATUS_CODES,
+        exceptions=RETRY_EXCEPTIONS,
+        retry_post=False,
+        respect_retry_after=True,
+        max_retry_after=300,
+    ):
+        r"""Define a retry policy.
+
+        Args:
+            attempts (int): (optional) Maximum attempts per request.
+            backoff_base (float): (optional) Base of the exponential backoff.
+            backoff_cap (float): (optional) Maximum backoff in seconds.
+            status_codes (tuple): (optional) Status codes to retry.
+            exceptions (tuple): (optional) Exception types to retry.
+            retry_post (bool): (optional) Also retry POST requests.
+            respect_retry_after (bool): (optional) Honor Retry-After headers.
+            max_retry_after (float): (optional) Longest Retry-After to honor.
+        """
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1.")
+        self.attempts = attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.status_codes = tuple(status_codes)
+        self.exceptions = tuple(exceptions)
+        self.methods = IDEMPOTENT_METHODS + (("POST",) if retry_post else ())
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def can_retry(self, method, retries):
+        """Return True if another attempt is allowed after ``retries`` retries."""
+        return method.upper() in self.methods and retries + 1 < self.attempts
+
+    def backoff(self, retries):
+        """Return a random delay using exponential backoff with full jitter."""
+        ceiling = min(self.backoff_cap, self.backoff_base * 2 ** retries)
+        return random.uniform(0, ceiling)
+
+    def delay(self, retries, response=None):
+        """Return seconds to wait before the next attempt, or None to give up."""
+        if response is not None and self.respect_retry_after:
+            wait = _retry_after(response)
+            if wait is not None:
+                return wait if wait <= self.max_retry_after else None
+        return self.backoff(retries)
+
+    def __repr__(self):
+        return "{}(attempts={}, backoff_base={}, backoff_cap={})".format(
+            self.__class__.__name__,
+            self.attempts,
+            self.backoff_base,
+            self.backoff_cap,
+        )
+
+
+def _retry_after(response):
+    """Return seconds requested by a Retry-After header, or None if absent."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        return None
+    return max(0.0, mktime_tz(parsed) - time.time())
+
+
+NO_RETRY = Retry(attempts=1)
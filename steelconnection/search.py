@@ -0,0 +1,156 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Prefix and substring search over chosen fields of a collection.
+
+Usage:
+    index = sc.lookup.search_index('nodes', fields=('serial', 'name'), substring=True)
+    index.startswith('XN0012', limit=10)    # Autocomplete.
+    index.contains('skypad')                # Partial match anywhere.
+
+    Searches ignore case. The prefix index is a sorted array searched
+    with bisect, so a query costs a binary search plus the matches read.
+    The optional substring index maps every n-gram (3 characters by
+    default) of each value to the objects holding it; a query intersects
+    the lists of its n-grams, then checks the few remaining candidates.
+"""
+
+from array import array
+from bisect import bisect_left
+
+try:
+    _text_types = (str, unicode)  # Python 2
+except NameError:
+    _text_types = (str,)
+
+
+class SearchIndex(object):
+    r"""Case-insensitive prefix and substring index over some fields.
+
+    Attributes:
+        fields (tuple): Fields of the objects that are indexed.
+        ngram (int): Length of the n-grams of the substring index,
+            or 0 if only prefixes are indexed.
+    """
+
+    def __init__(self, objects, fields, substring=False, ngram=3):
+        r"""Index a list of objects.
+
+        Args:
+            objects (list): Objects of a collection.
+            fields (tuple): Names of the string fields to index.
+            substring (bool): (optional) Also build the substring index.
+            ngram (int): (optional) Length of the n-grams.
+        """
+        self.objects = list(objects)
+        self.fields = tuple(fields)
+        self.ngram = ngram if substring else 0
+        entries = []
+        for position, obj in enumerate(self.objects):
+            for field in self.fields:
+                value = obj.get(field)
+                if isinstance(value, _text_types) and value:
+                    entries.append((value.lower(), position))
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._positions = array("i", [position for _, position in entries])
+        self._grams = self._build_grams(entries) if self.ngram else None
+
+    def startswith(self, prefix, limit=None):
+        r"""Return the objects with a field starting with prefix.
+
+        Args:
+            prefix (str): Start of the value, in any case.
+            limit (int): (optional) Stop after this many objects.
+
+        Returns:
+            list: Matching objects, ordered by the matching value.
+        """
+        prefix = prefix.lower()
+        keys = self._keys
+        found = []
+        seen = set()
+        index = bisect_left(keys, prefix)
+        while index < len(keys) and keys[index].startswith(prefix):
+            position = self._positions[index]
+            if position not in seen:
+                seen.add(position)
+                found.append(self.objects[position])
+                if limit is not None and len(found) >= limit:
+                    break
+            index += 1
+        return found
+
+    def contains(self, text, limit=None):
+        r"""Return the objects with a field containing text.
+
+        Args:
+            text (str): Part of the value, in any case.
+            limit (int): (optional) Stop after this many objects.
+
+        Returns:
+            list: Matching objects, in collection order.
+        """
+        text = text.lower()
+        if not self.ngram:
+            raise ValueError("Substring search needs SearchIndex(..., substring=True).")
+        if len(text) < self.ngram:
+            candidates = range(len(self.objects))
+        else:
+            postings = []
+            for gram in set(_grams(text, self.ngram)):
+                posting = self._grams.get(gram)
+                if posting is None:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                # Checking a few candidates beats reading a long posting.
+                if len(posting) > 8 * len(candidates):
+                    break
+                candidates.intersection_update(posting)
+                if not candidates:
+                    return []
+            candidates = sorted(candidates)
+        found = []
+        for position in candidates:
+            if self._matches(self.objects[position], text):
+                found.append(self.objects[position])
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def _matches(self, obj, text):
+        for field in self.fields:
+            value = obj.get(field)
+            if isinstance(value, _text_types) and text in value.lower():
+                return True
+        return False
+
+    def _build_grams(self, entries):
+        """Map each n-gram to the sorted positions of the objects holding it."""
+        grams = {}
+        for key, position in sorted(entries, key=lambda entry: entry[1]):
+            for gram in set(_grams(key, self.ngram)):
+                posting = grams.get(gram)
+                if posting is None:
+                    grams[gram] = array("i", [position])
+                elif posting[-1] != position:
+                    posting.append(position)
+        return grams
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __repr__(self):
+        return "{}(objects={}, fields={}, ngram={})".format(
+            self.__class__.__name__, len(self.objects), self.fields, self.ngram
+        )
+
+
+def _grams(text, size):
+    """Yield every substring of text with the given length."""
+    for start in range(len(text) - size + 1):
+        yield text[start : start + size]
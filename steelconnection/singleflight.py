@@ -0,0 +1,91 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Coalesce identical requests that are in flight at the same time.
+
+Usage:
+    sc = steelconnection.SConnect(realm, username, password, coalesce=True)
+
+    When several threads GET the same resource with the same parameters
+    while a request for it is already running, they wait for that request
+    and share its result instead of sending their own.
+    ``sc.singleflight.collapsed`` counts the requests that were saved.
+"""
+
+import threading
+
+
+class SingleFlight(object):
+    r"""Run at most one call per key at a time, sharing the outcome.
+
+    Attributes:
+        executed (int): Calls that were actually run.
+        collapsed (int): Calls that waited for another caller's result.
+    """
+
+    def __init__(self):
+        """Create a group with no calls in flight."""
+        self.executed = 0
+        self.collapsed = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        r"""Call func, unless a call with the same key is already running.
+
+        Args:
+            key (hashable): Identifies calls that can share one result.
+            func (function): Called without arguments by the first caller.
+
+        Returns:
+            The value returned by func, for the leader and every waiter.
+            If func raises, every waiter raises the same exception.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+            else:
+                self.collapsed += 1
+                leader = False
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        try:
+            call.value = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+    def stats(self):
+        """Return a dictionary of coalescing statistics."""
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "collapsed": self.collapsed,
+                "in_flight": len(self._calls),
+            }
+
+    def __repr__(self):
+        return "{}(executed={}, collapsed={})".format(
+            self.__class__.__name__, self.executed, self.collapsed
+        )
+
+
+class _Call(object):
+    """One call in flight and its eventual outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
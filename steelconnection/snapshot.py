@@ -0,0 +1,535 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Columnar snapshots of collections for fleet-wide reports.
+
+Usage:
+    nodes = sc.lookup.snapshot('nodes', fields=['site', 'model', 'state'])
+    nodes.group_count('model')                      # {'panda': 812, ...}
+    offline = nodes.filter(state='offline')
+    offline.group_count('site')                     # Offline nodes per site.
+    nodes.where('uptime', '>', 86400).count()
+    nodes.map('model', sc.lookup.model).group_count('model')
+
+    Each field is stored as one column. Strings and other repeated values
+    are dictionary-encoded: the column holds small integer codes and each
+    distinct value is kept once. Numbers with many distinct values are
+    stored as an array of floats. Filters and translations are evaluated
+    once per distinct value, then applied to the codes.
+
+    NumPy is used when it is installed, otherwise columns are built on
+    the standard library array module and the same methods are available.
+"""
+
+from array import array
+from collections import Counter, OrderedDict
+import operator
+import sys
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, choices: value in choices,
+    "not in": lambda value, choices: value not in choices,
+}
+
+# Numeric fields with more distinct values than this are stored as floats.
+NUMBERS_ABOVE = 256
+
+_BOOL = object()
+
+
+class Snapshot(object):
+    r"""A collection stored as typed columns.
+
+    Attributes:
+        fields (list): Names of the columns, in order of first appearance.
+        numpy (bool): True if the columns are NumPy arrays.
+    """
+
+    def __init__(self, columns, length, use_numpy):
+        self._columns = columns
+        self._length = length
+        self.fields = list(columns)
+        self.numpy = use_numpy
+
+    @classmethod
+    def from_objects(cls, objects, fields=None, use_numpy=None):
+        r"""Build a snapshot in one pass over an iterable of objects.
+
+        Args:
+            objects (iterable): Dictionaries, such as the items of a collection.
+            fields (list): (optional) Fields to keep, default is every field.
+            use_numpy (bool): (optional) Use NumPy arrays, default if installed.
+
+        Returns:
+            Snapshot: The objects as columns.
+        """
+        use_numpy = numpy is not None if use_numpy is None else use_numpy
+        if use_numpy and numpy is None:
+            raise ImportError("NumPy is not installed.")
+        builders = OrderedDict()
+        for field in fields if fields is not None else ():
+            builders[field] = _ColumnBuilder(0)
+        length = 0
+        for obj in objects:
+            for field in fields if fields is not None else obj:
+                builder = builders.get(field)
+                if builder is None:
+                    builder = builders[field] = _ColumnBuilder(length)
+                builder.add(length, obj.get(field))
+            length += 1
+        columns = OrderedDict(
+            (field, builder.build(length, use_numpy))
+            for field, builder in builders.items()
+        )
+        return cls(columns, length, use_numpy)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, field):
+        """Return the values of a field as a list, None where missing."""
+        return self._columns[field].values()
+
+    def __contains__(self, field):
+        return field in self._columns
+
+    def rows(self):
+        """Yield each object as a dictionary, without missing fields."""
+        columns = [(field, self[field]) for field in self.fields]
+        for index in range(self._length):
+            row = {}
+            for field, values in columns:
+                value = values[index]
+                if value is not None:
+                    row[field] = value
+            yield row
+
+    def mask(self, field, op, value):
+        r"""Return which rows match a condition on one field.
+
+        Args:
+            field (str): Column to test.
+            op (str): One of OPERATORS, such as '==' or 'in'.
+            value: Right hand side of the comparison.
+
+        Returns:
+            Boolean NumPy array, or list of bool.
+        """
+        if op not in OPERATORS:
+            raise ValueError(
+                "Unknown operator {!r}, choose from: {}".format(
+                    op, ", ".join(OPERATORS)
+                )
+            )
+        if op in ("in", "not in"):
+            value = _choices(value)
+        column = self._columns.get(field)
+        if column is None:
+            return self._constant(_safe(OPERATORS[op], None, value))
+        return column.mask(op, value)
+
+    def where(self, field, op, value):
+        r"""Return a snapshot of the rows matching a condition on one field.
+
+        Args:
+            field (str): Column to test.
+            op (str): One of OPERATORS, such as '==' or 'in'.
+            value: Right hand side of the comparison.
+
+        Returns:
+            Snapshot: Matching rows.
+        """
+        return self.select(self.mask(field, op, value))
+
+    def filter(self, **conditions):
+        r"""Return a snapshot of the rows equal to every condition.
+
+        A list, tuple or set is matched as a set of accepted values.
+
+        Args:
+            **conditions: Field names and their expected values.
+
+        Returns:
+            Snapshot: Matching rows.
+        """
+        return self.select(self._conditions_mask(conditions))
+
+    def count(self, **conditions):
+        """Return the number of rows equal to every condition."""
+        if not conditions:
+            return self._length
+        mask = self._conditions_mask(conditions)
+        if self.numpy:
+            return int(numpy.count_nonzero(mask))
+        return sum(mask)
+
+    def select(self, mask):
+        r"""Return a snapshot of the rows where mask is true.
+
+        Args:
+            mask: Sequence of bool with one entry per row.
+
+        Returns:
+            Snapshot: Selected rows.
+        """
+        if self.numpy:
+            indices = numpy.flatnonzero(numpy.asarray(mask, dtype=bool))
+        else:
+            indices = [index for index, keep in enumerate(mask) if keep]
+        columns = [(field, self._columns[field].take(indices)) for field in self.fields]
+        return Snapshot(OrderedDict(columns), len(indices), self.numpy)
+
+    def group_count(self, *fields):
+        r"""Count the rows for each distinct value of one or more fields.
+
+        Args:
+            *fields: Columns to group by.
+
+        Returns:
+            dict: Value, or tuple of values for several fields, to count.
+                Missing values are grouped under None.
+        """
+        if not fields:
+            raise ValueError("group_count needs at least one field.")
+        groups = [self._columns[field].factorize() for field in fields]
+        if len(groups) == 1:
+            codes, labels = groups[0]
+            counts = _count_codes(codes, len(labels), self.numpy)
+            result = {}
+            for label, count in zip(labels, counts):
+                if count:
+                    result[label] = result.get(label, 0) + int(count)
+            return result
+        if self.numpy:
+            combined = numpy.zeros(self._length, dtype=numpy.int64)
+            for codes, labels in groups:
+                combined = combined * len(labels) + codes
+            keys, counts = numpy.unique(combined, return_counts=True)
+            pairs = zip(keys.tolist(), counts.tolist())
+        else:
+            pairs = Counter(zip(*[codes for codes, labels in groups])).items()
+        result = {}
+        for key, count in pairs:
+            if self.numpy:
+                key = _unravel(key, [len(labels) for codes, labels in groups])
+            label = tuple(labels[code] for code, (_, labels) in zip(key, groups))
+            result[label] = result.get(label, 0) + count
+        return result
+
+    def map(self, field, mapping, name=None, default=None):
+        r"""Return a snapshot with a field translated through a mapping.
+
+        The mapping is applied once per distinct value, for example
+        snapshot.map('model', sc.lookup.model) translates model code names.
+
+        Args:
+            field (str): Column to translate.
+            mapping (dict or function): Translation of each value.
+            name (str): (optional) Name of the new column, default replaces field.
+            default: (optional) Value for keys missing from a dict mapping,
+                default keeps the original value.
+
+        Returns:
+            Snapshot: The same rows with the translated column.
+        """
+        if isinstance(mapping, dict):
+            table = mapping
+
+            def mapping(value):
+                return table.get(value, value if default is None else default)
+
+        columns = OrderedDict((key, self._columns[key]) for key in self.fields)
+        columns[name if name else field] = self._columns[field].map(mapping)
+        return Snapshot(columns, self._length, self.numpy)
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by the columns, in bytes."""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def _conditions_mask(self, conditions):
+        mask = None
+        for field, value in conditions.items():
+            op = "in" if isinstance(value, (list, tuple, set, frozenset)) else "=="
+            current = self.mask(field, op, value)
+            if mask is None:
+                mask = current
+            elif self.numpy:
+                mask = mask & current
+            else:
+                mask = [a and b for a, b in zip(mask, current)]
+        return mask if mask is not None else self._constant(True)
+
+    def _constant(self, value):
+        if self.numpy:
+            return numpy.full(self._length, bool(value))
+        return [bool(value)] * self._length
+
+    def __repr__(self):
+        return "{}(rows={}, fields={})".format(
+            self.__class__.__name__, self._length, self.fields
+        )
+
+
+class _ColumnBuilder(object):
+    """Dictionary-encode the values of one field as they arrive."""
+
+    def __init__(self, offset):
+        self.codes = array("i", [-1] * offset)
+        self.index = {}
+        self.categories = []
+        self.objects = None  # Plain list once an unhashable value is seen.
+
+    def add(self, row, value):
+        if self.objects is not None:
+            self._pad_objects(row)
+            self.objects.append(value)
+            return
+        missing = row - len(self.codes)
+        if missing:
+            self.codes.extend([-1] * missing)
+        if value is None:
+            self.codes.append(-1)
+            return
+        key = (_BOOL, value) if value is True or value is False else value
+        try:
+            code = self.index.get(key)
+        except TypeError:
+            self.objects = [self.categories[c] if c >= 0 else None for c in self.codes]
+            self.objects.append(value)
+            return
+        if code is None:
+            code = self.index[key] = len(self.categories)
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def _pad_objects(self, row):
+        missing = row - len(self.objects)
+        if missing:
+            self.objects.extend([None] * missing)
+
+    def build(self, length, use_numpy):
+        if self.objects is not None:
+            self._pad_objects(length)
+            return _Objects(self.objects, use_numpy)
+        missing = length - len(self.codes)
+        if missing:
+            self.codes.extend([-1] * missing)
+        numbers = len(self.categories) > NUMBERS_ABOVE and all(
+            isinstance(value, (int, float)) and not isinstance(value, bool)
+            for value in self.categories
+        )
+        if numbers:
+            table = self.categories + [float("nan")]
+            integers = all(isinstance(value, int) for value in self.categories)
+            if use_numpy:
+                table = numpy.array(table, dtype=numpy.float64)
+                values = table[numpy.frombuffer(self.codes, dtype=numpy.int32)]
+            else:
+                values = array("d", [table[code] for code in self.codes])
+            return _Numbers(values, integers, use_numpy)
+        typecode = _smallest_typecode(len(self.categories))
+        if use_numpy:
+            codes = numpy.frombuffer(self.codes, dtype=numpy.int32).astype(typecode)
+        else:
+            codes = array(typecode, self.codes)
+        return _Categories(codes, self.categories, use_numpy)
+
+
+class _Categories(object):
+    """Dictionary-encoded column: codes into a list of distinct values."""
+
+    def __init__(self, codes, categories, use_numpy):
+        self.codes = codes
+        self.categories = categories
+        self.numpy = use_numpy
+
+    def values(self):
+        table = self.categories + [None]  # Code -1 selects the last entry.
+        return [table[code] for code in self.codes]
+
+    def mask(self, op, value):
+        test = OPERATORS[op]
+        table = [_safe(test, category, value) for category in self.categories]
+        table.append(_safe(test, None, value))
+        if self.numpy:
+            return numpy.array(table, dtype=bool)[self.codes]
+        return [table[code] for code in self.codes]
+
+    def take(self, indices):
+        if self.numpy:
+            codes = self.codes[indices]
+        else:
+            codes = array(self.codes.typecode, [self.codes[index] for index in indices])
+        return _Categories(codes, self.categories, self.numpy)
+
+    def factorize(self):
+        """Return codes from 0 with their labels, None last for missing."""
+        labels = self.categories + [None]
+        if self.numpy:
+            codes = self.codes.astype(numpy.int64)
+            codes[codes < 0] = len(self.categories)
+            return codes, labels
+        last = len(self.categories)
+        return [code if code >= 0 else last for code in self.codes], labels
+
+    def map(self, mapping):
+        return _Categories(
+            self.codes, [mapping(category) for category in self.categories], self.numpy
+        )
+
+    @property
+    def nbytes(self):
+        size = (
+            self.codes.nbytes if self.numpy else len(self.codes) * self.codes.itemsize
+        )
+        return size + sum(sys.getsizeof(category) for category in self.categories)
+
+
+class _Numbers(object):
+    """Column of numbers stored as floats, NaN where missing."""
+
+    def __init__(self, values, integers, use_numpy):
+        self.data = values
+        self.integers = integers
+        self.numpy = use_numpy
+
+    def values(self):
+        data = self.data.tolist()
+        if self.integers:
+            return [int(value) if value == value else None for value in data]
+        return [value if value == value else None for value in data]
+
+    def mask(self, op, value):
+        if self.numpy and op in ("==", "!=", "<", "<=", ">", ">="):
+            if value is None:
+                # Like None in Python: equality only, never less or greater.
+                if op in ("==", "!="):
+                    missing = numpy.isnan(self.data)
+                    return missing if op == "==" else ~missing
+                return numpy.zeros(len(self.data), dtype=bool)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                with numpy.errstate(invalid="ignore"):
+                    return OPERATORS[op](self.data, value)
+        test = OPERATORS[op]
+        return [_safe(test, item, value) for item in self.values()]
+
+    def take(self, indices):
+        if self.numpy:
+            data = self.data[indices]
+        else:
+            data = array("d", [self.data[index] for index in indices])
+        return _Numbers(data, self.integers, self.numpy)
+
+    def factorize(self):
+        return _factorize(self.values(), self.numpy)
+
+    def map(self, mapping):
+        return _Objects([mapping(value) for value in self.values()], self.numpy)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes if self.numpy else len(self.data) * self.data.itemsize
+
+
+class _Objects(object):
+    """Column of values that cannot be encoded, such as lists."""
+
+    def __init__(self, objects, use_numpy):
+        self.objects = objects
+        self.numpy = use_numpy
+
+    def values(self):
+        return list(self.objects)
+
+    def mask(self, op, value):
+        test = OPERATORS[op]
+        mask = [_safe(test, item, value) for item in self.objects]
+        return numpy.array(mask, dtype=bool) if self.numpy else mask
+
+    def take(self, indices):
+        return _Objects([self.objects[index] for index in indices], self.numpy)
+
+    def factorize(self):
+        return _factorize(self.objects, self.numpy)
+
+    def map(self, mapping):
+        return _Objects([mapping(value) for value in self.objects], self.numpy)
+
+    @property
+    def nbytes(self):
+        return sys.getsizeof(self.objects) + sum(
+            sys.getsizeof(value) for value in self.objects
+        )
+
+
+def _factorize(values, use_numpy):
+    """Return codes from 0 and the distinct values they stand for."""
+    index = {}
+    labels = []
+    codes = []
+    for value in values:
+        key = repr(value) if isinstance(value, (list, dict)) else value
+        code = index.get(key)
+        if code is None:
+            code = index[key] = len(labels)
+            labels.append(value)
+        codes.append(code)
+    if use_numpy:
+        codes = numpy.array(codes, dtype=numpy.int64)
+    return codes, labels
+
+
+def _count_codes(codes, size, use_numpy):
+    """Return how many times each code from 0 to size - 1 appears."""
+    if use_numpy:
+        return numpy.bincount(codes, minlength=size).tolist()
+    counter = Counter(codes)
+    return [counter.get(code, 0) for code in range(size)]
+
+
+def _unravel(key, sizes):
+    """Split a combined group code back into one code per field."""
+    codes = []
+    for size in reversed(sizes):
+        key, code = divmod(key, size)
+        codes.append(code)
+    return tuple(reversed(codes))
+
+
+def _smallest_typecode(categories):
+    """Return the smallest signed integer type able to hold the codes."""
+    if categories < 2**7:
+        return "b"
+    if categories < 2**15:
+        return "h"
+    return "i"
+
+
+def _choices(value):
+    """Return a collection fit for fast membership tests."""
+    try:
+        return frozenset(value)
+    except TypeError:
+        return list(value)
+
+
+def _safe(test, left, right):
+    """Apply a comparison, treating values of other types as not matching."""
+    try:
+        return bool(test(left, right))
+    except TypeError:
+        return False
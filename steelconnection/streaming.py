@@ -0,0 +1,135 @@
+# coding: utf-8
+
+"""
+Provide incremental decoding of large JSON collections.
+
+To be called from SteelConnection main object classes.
+Not supported for direct use.
+"""
+
+import codecs
+import json
+
+
+_NUMBER_START = "-0123456789"
+
+
+def _iter_items(chunks):
+    """
+    Yield objects from a JSON document as its chunks arrive.
+
+    For a collection such as '{"items": [...]}', each element of the items
+    array is yielded as soon as it has been received, and discarded
+    once the caller moves on, so memory use does not grow with the
+    size of the collection.
+    For any other object, the whole object is yielded once,
+    and for a top level array each element is yielded.
+
+    Args:
+        chunks (iterable): Bytes of the UTF-8 encoded document.
+
+    Yields:
+        Native Python objects.
+    """
+    scanner = _Scanner(chunks)
+    if scanner.peek() != "{":
+        document = scanner.value()
+        if isinstance(document, list):
+            for item in document:
+                yield item
+        elif document:
+            yield document
+        return
+    scanner.advance()
+    others = {}
+    found_items = False
+    if scanner.peek() == "}":
+        return
+    while True:
+        key = scanner.value()
+        scanner.expect(":")
+        if key == "items" and scanner.peek() == "[":
+            found_items = True
+            scanner.advance()
+            if scanner.peek() == "]":
+                scanner.advance()
+            else:
+                while True:
+                    yield scanner.value()
+                    if scanner.expect(",]") == "]":
+                        break
+        else:
+            others[key] = scanner.value()
+        if scanner.expect(",}") == "}":
+            break
+    if not found_items and others:
+        yield others
+
+
+class _Scanner(object):
+    """Buffer over decoded text, reading more chunks only when needed."""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.position = 0
+        self.exhausted = False
+
+    def more(self):
+        """Append the next chunk to the buffer, return False at the end."""
+        if self.exhausted:
+            return False
+        if self.position > 65536:
+            # Drop text that has already been decoded.
+            self.buffer = self.buffer[self.position :]
+            self.position = 0
+        try:
+            chunk = next(self.chunks)
+        except StopIteration:
+            self.exhausted = True
+            self.buffer += self.text_decoder.decode(b"", final=True)
+            return False
+        self.buffer += self.text_decoder.decode(chunk)
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.position < len(self.buffer):
+                if not self.buffer[self.position].isspace():
+                    return self.buffer[self.position]
+                self.position += 1
+            if not self.more():
+                raise ValueError("Unexpected end of JSON document.")
+
+    def advance(self):
+        """Consume the character returned by peek."""
+        self.position += 1
+
+    def expect(self, allowed):
+        """Consume and return the next character, which must be in allowed."""
+        char = self.peek()
+        if char not in allowed:
+            raise ValueError(
+                "Expected one of {!r} at {!r} in JSON document.".format(allowed, char)
+            )
+        self.advance()
+        return char
+
+    def value(self):
+        """Consume and return the next complete JSON value."""
+        start = self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buffer, self.position)
+            except ValueError:
+                if self.more():
+                    continue
+                raise
+            # A number ending at the buffer's end may continue in the next chunk.
+            if end == len(self.buffer) and start in _NUMBER_START and self.more():
+                continue
+            self.position = end
+            return obj
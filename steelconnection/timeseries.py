@@ -0,0 +1,536 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Record status samples in memory and in a compact append-only file.
+
+Usage:
+    recorder = steelconnection.Recorder('fleet.tsr', capacity=10080)
+    for item in sc.getstatus_many(resources):
+        if item.error is None:
+            recorder.record(item.resource, item.result)
+    recorder.flush()
+
+    recorder.query('port/port-1', 'link', start=time.time() - 3600)
+    recorder.downsample('port/port-1', 'speed', step=3600, how='mean')
+
+    Each (resource, field) pair is a metric with its own ring buffer,
+    which keeps the latest ``capacity`` samples, or every sample when
+    capacity is None. Numbers and booleans are kept in typed arrays,
+    strings such as states as codes into a table shared by all metrics.
+
+    The file is a log of blocks, one metric per block. A block holds up
+    to block_size samples, with timestamps as varint millisecond deltas,
+    each stored as its change from the previous delta, and values as a
+    typed column. Strings are stored as codes into a
+    table that is also written to the file. A block starts with its
+    metric and time range, so a reader skips blocks it does not need
+    without decoding them. Opening an existing file reads it back into
+    the ring buffers and appends new samples to it.
+"""
+
+from array import array
+from bisect import bisect_left
+import os
+import struct
+import threading
+import time
+
+try:
+    _text_types = (str, unicode)  # Python 2
+except NameError:
+    _text_types = (str,)
+
+try:
+    _integer_types = (int, long)  # Python 2
+except NameError:
+    _integer_types = (int,)
+
+
+MAGIC = b"SCTS1\n"
+
+_DOUBLE = struct.Struct("<d")
+
+_BOOL, _NUMBER, _STRING = "b", "n", "s"
+
+AGGREGATES = ("mean", "min", "max", "first", "last", "count")
+
+
+class Recorder(object):
+    r"""Per-metric ring buffers, optionally written to a file.
+
+    Attributes:
+        path (str): File the samples are appended to, or None.
+        capacity (int): Samples kept in memory per metric, or None.
+        block_size (int): Samples per metric buffered before a write.
+    """
+
+    def __init__(self, path=None, capacity=10080, block_size=256):
+        r"""Create a recorder, loading the samples of an existing file.
+
+        Args:
+            path (str): (optional) File to read and append to.
+            capacity (int): (optional) Samples kept in memory per metric,
+                None to keep every sample. The default holds one week
+                of samples taken each minute.
+            block_size (int): (optional) Samples per metric and block.
+        """
+        self.path = path
+        self.capacity = capacity
+        self.block_size = block_size
+        self._rings = {}
+        self._metric_ids = {}
+        self._strings = []
+        self._string_ids = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._file = None
+        if path is not None:
+            self._open(path)
+
+    def record(self, series, sample, timestamp=None, fields=None):
+        r"""Record the scalar fields of a status object.
+
+        Args:
+            series (str): Name of the source, such as 'port/<port_id>'.
+            sample (dict): Status object, such as a getstatus result.
+            timestamp (float): (optional) Seconds since the epoch, default now.
+            fields (iterable): (optional) Only record these fields.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        for field in sample if fields is None else fields:
+            value = sample.get(field)
+            if isinstance(value, (bool, float) + _integer_types + _text_types):
+                self.add(series, field, value, timestamp)
+
+    def add(self, series, field, value, timestamp=None):
+        r"""Record one value of one metric.
+
+        Args:
+            series (str): Name of the source, such as 'port/<port_id>'.
+            field (str): Name of the field, such as 'link'.
+            value (bool, int, float or str): The sample.
+            timestamp (float): (optional) Seconds since the epoch, default now.
+
+        Raises:
+            ValueError: timestamp is older than the last sample of the metric.
+            TypeError: value is not of the same kind as earlier samples.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            metric = series, field
+            ring = self._rings.get(metric)
+            if ring is None:
+                ring = self._rings[metric] = _Ring(_kind(value), self.capacity)
+            ring.append(timestamp, self._encode(ring, value))
+            if self._file is not None:
+                pending = self._pending.setdefault(metric, ([], []))
+                pending[0].append(int(round(timestamp * 1000)))
+                pending[1].append(value)
+                if len(pending[0]) >= self.block_size:
+                    self._write_block(metric)
+
+    def query(self, series, field, start=None, end=None):
+        r"""Return the samples of a metric kept in memory, oldest first.
+
+        Args:
+            series (str): Name of the source, such as 'port/<port_id>'.
+            field (str): Name of the field, such as 'link'.
+            start (float): (optional) Earliest timestamp, included.
+            end (float): (optional) Latest timestamp, excluded.
+
+        Returns:
+            list: (timestamp, value) tuples.
+        """
+        with self._lock:
+            ring = self._rings.get((series, field))
+            if ring is None:
+                return []
+            decode = self._decoder(ring)
+            return [(t, decode(v)) for t, v in ring.between(start, end)]
+
+    def downsample(self, series, field, step, start=None, end=None, how=None):
+        r"""Aggregate the samples of a metric into buckets of step seconds.
+
+        Args:
+            series (str): Name of the source, such as 'port/<port_id>'.
+            field (str): Name of the field, such as 'speed'.
+            step (float): Width of a bucket in seconds, such as 3600.
+            start (float): (optional) Earliest timestamp, included.
+            end (float): (optional) Latest timestamp, excluded.
+            how (str): (optional) One of AGGREGATES. The default is
+                'mean' for numbers and 'last' for booleans and strings.
+
+        Returns:
+            list: (bucket start, aggregate) for each bucket with samples.
+        """
+        if step <= 0:
+            raise ValueError("step must be greater than zero.")
+        with self._lock:
+            ring = self._rings.get((series, field))
+            if ring is None:
+                return []
+            how = how or ("mean" if ring.kind == _NUMBER else "last")
+            if how not in AGGREGATES:
+                raise ValueError("how must be one of {}.".format(", ".join(AGGREGATES)))
+            if how in ("mean", "min", "max") and ring.kind == _STRING:
+                raise ValueError("Cannot compute the {} of strings.".format(how))
+            decode = self._decoder(ring)
+            buckets = []
+            bucket = None
+            values = []
+            for timestamp, value in ring.between(start, end):
+                current = timestamp - timestamp % step
+                if current != bucket:
+                    if values:
+                        buckets.append((bucket, _aggregate(how, values, decode)))
+                    bucket, values = current, []
+                values.append(value)
+            if values:
+                buckets.append((bucket, _aggregate(how, values, decode)))
+            return buckets
+
+    def metrics(self):
+        """Return the (series, field) pairs with samples in memory."""
+        with self._lock:
+            return sorted(self._rings)
+
+    def flush(self):
+        """Write every buffered sample to the file."""
+        with self._lock:
+            if self._file is None:
+                return
+            for metric in list(self._pending):
+                self._write_block(metric)
+            self._file.flush()
+
+    def close(self):
+        """Write buffered samples and close the file."""
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return sum(len(ring) for ring in self._rings.values())
+
+    def __repr__(self):
+        return "{}(path={!r}, metrics={}, samples={})".format(
+            self.__class__.__name__, self.path, len(self._rings), len(self)
+        )
+
+    # Encoding of values in memory.
+
+    def _encode(self, ring, value):
+        kind = _kind(value)
+        if kind != ring.kind:
+            raise TypeError(
+                "Expected a {} value, got {!r}.".format(_KIND_NAMES[ring.kind], value)
+            )
+        if kind == _STRING:
+            return self._string_id(value)
+        if kind == _NUMBER and not isinstance(value, _integer_types):
+            ring.integral = False
+        return value
+
+    def _decoder(self, ring):
+        if ring.kind == _STRING:
+            return self._strings.__getitem__
+        if ring.kind == _BOOL:
+            return bool
+        return int if ring.integral else float
+
+    def _string_id(self, text):
+        code = self._string_ids.get(text)
+        if code is None:
+            code = self._string_ids[text] = len(self._strings)
+            self._strings.append(text)
+            if self._file is not None:
+                self._write_record(b"S", _varint(code) + _text(text))
+        return code
+
+    # File format.
+
+    def _open(self, path):
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, "rb") as f:
+                good = self._load(f.read())
+            self._file = open(path, "r+b")
+            # Drop a record cut short by a crash, then append after the rest.
+            self._file.seek(good)
+            self._file.truncate()
+        else:
+            self._file = open(path, "wb")
+            self._file.write(MAGIC)
+
+    def _load(self, data):
+        """Read a file into the rings, return the length of its valid part."""
+        strings = {}
+        names = {}
+        position = len(MAGIC)
+        for kind, payload, end in _records(data):
+            position = end
+            if kind == b"S":
+                code, offset = _read_varint(payload, 0)
+                strings[code] = payload[offset:].decode("utf-8")
+                # Keep the codes of the file, new strings get the next ones.
+                self._string_ids[strings[code]] = code
+                self._strings.append(strings[code])
+            elif kind == b"M":
+                code, offset = _read_varint(payload, 0)
+                series, field = payload[offset:].decode("utf-8").split("\t", 1)
+                names[code] = series, field
+                self._metric_ids[names[code]] = code
+            elif kind == b"B":
+                metric, times, values = _decode_block(payload, strings)
+                series, field = names[metric]
+                for timestamp, value in zip(times, values):
+                    self.add(series, field, value, timestamp / 1000.0)
+        return position
+
+    def _metric_id(self, metric):
+        code = self._metric_ids.get(metric)
+        if code is None:
+            code = self._metric_ids[metric] = len(self._metric_ids)
+            self._write_record(b"M", _varint(code) + _text("\t".join(metric)))
+        return code
+
+    def _write_block(self, metric):
+        times, values = self._pending.pop(metric, ((), ()))
+        if not times:
+            return
+        payload = bytearray(_varint(self._metric_id(metric)))
+        payload += _varint(len(times))
+        payload += _varint(_zigzag(times[0]))
+        payload += _varint(_zigzag(times[-1]))
+        # Each delta is stored as its change from the previous delta,
+        # which is zero, one byte, for samples taken at a steady interval.
+        previous, delta = times[0], 0
+        for timestamp in times[1:]:
+            payload += _varint(_zigzag(timestamp - previous - delta))
+            previous, delta = timestamp, timestamp - previous
+        kind = _kind(values[0])
+        if kind == _NUMBER and all(isinstance(v, _integer_types) for v in values):
+            payload += b"i"
+            for value in values:
+                payload += _varint(_zigzag(value))
+        elif kind == _NUMBER:
+            payload += b"f"
+            for value in values:
+                payload += _DOUBLE.pack(value)
+        elif kind == _BOOL:
+            payload += b"b"
+            payload += bytearray(1 if value else 0 for value in values)
+        else:
+            payload += b"s"
+            for value in values:
+                payload += _varint(self._string_ids[value])
+        self._write_record(b"B", bytes(payload))
+
+    def _write_record(self, kind, payload):
+        self._file.write(kind + _varint(len(payload)) + payload)
+
+
+class _Ring(object):
+    """Timestamps and values of one metric, oldest overwritten when full."""
+
+    __slots__ = ("kind", "integral", "capacity", "times", "values", "start")
+
+    def __init__(self, kind, capacity):
+        self.kind = kind
+        self.integral = True
+        self.capacity = capacity
+        self.times = array("d")
+        self.values = array({_BOOL: "b", _NUMBER: "d", _STRING: "i"}[kind])
+        self.start = 0
+
+    def append(self, timestamp, value):
+        times = self.times
+        if times and timestamp < times[self.start - 1]:
+            raise ValueError("Samples of a metric must be recorded in time order.")
+        if self.capacity is None or len(times) < self.capacity:
+            times.append(timestamp)
+            self.values.append(value)
+        else:
+            times[self.start] = timestamp
+            self.values[self.start] = value
+            self.start = (self.start + 1) % self.capacity
+
+    def between(self, start=None, end=None):
+        """Yield (timestamp, value) with start <= timestamp < end, in order."""
+        times, values = self.times, self.values
+        # When full, the oldest half is times[start:], the newest times[:start].
+        for low, high in ((self.start, len(times)), (0, self.start)):
+            first = low if start is None else bisect_left(times, start, low, high)
+            last = high if end is None else bisect_left(times, end, first, high)
+            for index in range(first, last):
+                yield times[index], values[index]
+
+    def __len__(self):
+        return len(self.times)
+
+
+_KIND_NAMES = {_BOOL: "boolean", _NUMBER: "number", _STRING: "string"}
+
+
+def _kind(value):
+    if isinstance(value, bool):
+        return _BOOL
+    if isinstance(value, _text_types):
+        return _STRING
+    if isinstance(value, (float,) + _integer_types):
+        return _NUMBER
+    raise TypeError("Only booleans, numbers and strings can be recorded.")
+
+
+def _aggregate(how, values, decode):
+    if how == "count":
+        return len(values)
+    if how == "first":
+        return decode(values[0])
+    if how == "last":
+        return decode(values[-1])
+    if how == "min":
+        return decode(min(values))
+    if how == "max":
+        return decode(max(values))
+    return float(sum(values)) / len(values)
+
+
+def read(path, series=None, field=None, start=None, end=None):
+    r"""Yield the samples stored in a file, without loading it into rings.
+
+    Blocks of other metrics, or outside the time range, are skipped
+    without being decoded.
+
+    Args:
+        path (str): File written by a Recorder.
+        series (str): (optional) Only this source.
+        field (str): (optional) Only this field.
+        start (float): (optional) Earliest timestamp, included.
+        end (float): (optional) Latest timestamp, excluded.
+
+    Yields:
+        tuple: (series, field, timestamp, value) in file order.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    low = None if start is None else start * 1000
+    high = None if end is None else end * 1000
+    strings = {}
+    names = {}
+    for kind, payload, _ in _records(data):
+        if kind == b"S":
+            code, offset = _read_varint(payload, 0)
+            strings[code] = payload[offset:].decode("utf-8")
+        elif kind == b"M":
+            code, offset = _read_varint(payload, 0)
+            names[code] = tuple(payload[offset:].decode("utf-8").split("\t", 1))
+        elif kind == b"B":
+            metric, offset = _read_varint(payload, 0)
+            name = names[metric]
+            if series is not None and name[0] != series:
+                continue
+            if field is not None and name[1] != field:
+                continue
+            _, offset = _read_varint(payload, offset)
+            first, offset = _read_varint(payload, offset)
+            last, offset = _read_varint(payload, offset)
+            if low is not None and _unzigzag(last) < low:
+                continue
+            if high is not None and _unzigzag(first) >= high:
+                continue
+            _, times, values = _decode_block(payload, strings)
+            first = 0 if low is None else bisect_left(times, low)
+            last = len(times) if high is None else bisect_left(times, high)
+            for index in range(first, last):
+                yield name[0], name[1], times[index] / 1000.0, values[index]
+
+
+def _records(data):
+    """Yield (kind, payload, end offset) for each complete record of a file."""
+    data = bytearray(data)
+    if bytes(data[: len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a SteelConnection time series file.")
+    position = len(MAGIC)
+    while position < len(data):
+        kind = bytes(data[position : position + 1])
+        try:
+            size, offset = _read_varint(data, position + 1)
+        except IndexError:
+            return
+        end = offset + size
+        if end > len(data):
+            return
+        yield kind, data[offset:end], end
+        position = end
+
+
+def _decode_block(payload, strings):
+    """Return (metric id, timestamps in ms, values) of a block."""
+    metric, offset = _read_varint(payload, 0)
+    count, offset = _read_varint(payload, offset)
+    first, offset = _read_varint(payload, offset)
+    _, offset = _read_varint(payload, offset)
+    times = [_unzigzag(first)]
+    delta = 0
+    for _ in range(count - 1):
+        change, offset = _read_varint(payload, offset)
+        delta += _unzigzag(change)
+        times.append(times[-1] + delta)
+    kind = payload[offset : offset + 1]
+    offset += 1
+    values = []
+    if kind == b"f":
+        for _ in range(count):
+            values.append(_DOUBLE.unpack_from(bytes(payload[offset : offset + 8]))[0])
+            offset += 8
+    elif kind == b"b":
+        values = [bool(byte) for byte in payload[offset : offset + count]]
+    else:
+        for _ in range(count):
+            value, offset = _read_varint(payload, offset)
+            values.append(_unzigzag(value) if kind == b"i" else strings[value])
+    return metric, times, values
+
+
+def _varint(number):
+    """Return an unsigned integer as LEB128 bytes."""
+    out = bytearray()
+    while number >= 0x80:
+        out.append((number & 0x7F) | 0x80)
+        number >>= 7
+    out.append(number)
+    return bytes(out)
+
+
+def _read_varint(data, offset):
+    """Return (integer, offset after it) from a bytearray."""
+    result = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+
+
+def _zigzag(number):
+    """Map signed integers to unsigned ones, small magnitudes to small numbers."""
+    return number * 2 if number >= 0 else -number * 2 - 1
+
+
+def _unzigzag(number):
+    return number // 2 if not number & 1 else -(number + 1) // 2
+
+
+def _text(text):
+    return text.encode("utf-8")
@@ -0,0 +1,138 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Structured logging of requests sent to SteelConnect CX Manager.
+
+Usage:
+    # Log one request in 100 at INFO, and at most 512 bytes of each body.
+    tracer = steelconnection.RequestLogger(sample_rate=100, body_limit=512)
+    sc = steelconnection.SConnect(realm, username, password, request_logger=tracer)
+
+    Nothing is formatted or decoded unless the logger is enabled for INFO.
+    Headers and bodies are only logged at DEBUG.
+    Failed requests are always logged, whatever the sample rate.
+
+    Each INFO record carries the request details as a dictionary
+    in its ``steelconnection`` attribute, with the keys:
+    method, url, status, reason, elapsed_ms, bytes_sent, bytes_received.
+"""
+
+import itertools
+import logging
+
+
+class RequestLogger(object):
+    r"""Log requests lazily, with sampling and body truncation.
+
+    Attributes:
+        logger (logging.Logger): Destination of the records.
+        sample_rate (int): Log one successful request out of this many.
+        body_limit (int): Maximum characters of each body logged at DEBUG.
+    """
+
+    def __init__(self, logger=None, sample_rate=1, body_limit=1024):
+        r"""Create a request logger.
+
+        Args:
+            logger (logging.Logger): (optional) Logger to write to.
+            sample_rate (int): (optional) Log one request in sample_rate.
+            body_limit (int): (optional) Truncate bodies to this many characters.
+        """
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.sample_rate = max(1, int(sample_rate))
+        self.body_limit = body_limit
+        self._counter = itertools.count()
+
+    def log(self, response):
+        r"""Log one request and its response.
+
+        Args:
+            response (requests.Response): Response from HTTP request.
+        """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        # next() on itertools.count is atomic, so sampling is thread-safe.
+        sampled = next(self._counter) % self.sample_rate == 0
+        if not sampled and response.ok:
+            return
+        fields = self.fields(response)
+        self.logger.info(
+            "REQUEST: %(method)s %(url)s -> %(status)s %(reason)s "
+            "in %(elapsed_ms).1f ms, %(bytes_sent)d bytes sent, "
+            "%(bytes_received)d bytes received",
+            fields,
+            extra={"steelconnection": fields},
+        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            req = response.request
+            self.logger.debug("REQUEST.headers: %r", req.headers)
+            self.logger.debug("REQUEST.body: %s", self._truncate(req.body))
+            self.logger.debug("RESPONSE.headers: %r", response.headers)
+            self.logger.debug("RESPONSE.text: %s", self._preview(response))
+
+    def fields(self, response):
+        r"""Return the structured details of a request and its response.
+
+        Args:
+            response (requests.Response): Response from HTTP request.
+
+        Returns:
+            dict: method, url, status, reason, elapsed_ms, bytes_sent, bytes_received.
+        """
+        req = response.request
+        elapsed = getattr(response, "elapsed", None)
+        return {
+            "method": req.method,
+            "url": req.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "elapsed_ms": elapsed.total_seconds() * 1000 if elapsed else 0.0,
+            "bytes_sent": len(req.body) if req.body else 0,
+            "bytes_received": _response_size(response),
+        }
+
+    def _truncate(self, body):
+        """Return repr of body, cut to body_limit characters."""
+        if body is None:
+            return repr(body)
+        if len(body) <= self.body_limit:
+            return repr(body)
+        return "{!r}... ({} more)".format(
+            body[: self.body_limit], len(body) - self.body_limit
+        )
+
+    def _preview(self, response):
+        """Return repr of the start of the response body, decoding only that."""
+        if getattr(response, "_content", None) is False:
+            return "<streamed, not read>"
+        content = _loaded_content(response)
+        if content is None:
+            return self._truncate(getattr(response, "text", None))
+        encoding = getattr(response, "encoding", None) or "utf-8"
+        text = content[: self.body_limit].decode(encoding, "replace")
+        if len(content) <= self.body_limit:
+            return repr(text)
+        return "{!r}... ({} more bytes)".format(text, len(content) - self.body_limit)
+
+    def __repr__(self):
+        return "{}(sample_rate={}, body_limit={})".format(
+            self.__class__.__name__, self.sample_rate, self.body_limit
+        )
+
+
+def _loaded_content(response):
+    """Return the body if already read, without reading a streamed response."""
+    content = getattr(response, "_content", None)  # requests.Response
+    if content is None:
+        content = getattr(response, "content", None)
+    return content if isinstance(content, bytes) else None
+
+
+def _response_size(response):
+    """Return the size of the response body in bytes."""
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit():
+        return int(length)
+    content = _loaded_content(response)
+    return len(content) if content is not None else 0
@@ -0,0 +1,75 @@
+# coding: utf-8
+
+"""SteelConnection
+
+Poll a resource and report only what changed.
+
+Usage:
+    for changes in sc.watch('nodes'):
+        for change in changes.changed:
+            print(change.id, change.fields)     # {'state': ('online', 'offline')}
+
+    for changes in sc.watch('node/' + node_id, api='scm.reporting'):
+        print(changes.changed[0].fields)
+
+    The first response is the baseline, and nothing is yielded for it.
+    Each later response is compared with the previous one, and a
+    ChangeSet is yielded when it differs. The wait before the next poll
+    drops to min_interval after a change, and grows by backoff after
+    each poll without one, up to max_interval. Busy resources are thus
+    polled often and quiet ones rarely.
+
+To be called from SteelConnection main object classes.
+Not supported for direct use.
+"""
+
+import time
+
+from .changes import diff
+
+
+_sleep = time.sleep
+
+
+def _watch(fetch, resource, key, min_interval, max_interval, backoff, initial=False):
+    """
+    Poll fetch and yield a ChangeSet each time its result changes.
+
+    Args:
+        fetch (function): Called without arguments, returns the resource.
+        resource (str): Identity given to a resource returning one object.
+        key (str): Field identifying the objects of a collection.
+        min_interval (float): Seconds between polls after a change.
+        max_interval (float): Longest wait between polls.
+        backoff (float): Factor applied to the wait after a quiet poll.
+        initial (bool): Yield the first response, as all added.
+
+    Yields:
+        ChangeSet: Objects or fields added, changed and removed.
+    """
+    if not 0 < min_interval <= max_interval:
+        raise ValueError("Intervals must satisfy 0 < min_interval <= max_interval.")
+    if backoff < 1:
+        raise ValueError("backoff must be at least 1.")
+    identify = key
+    previous = None
+    interval = min_interval
+    while True:
+        result = fetch()
+        if isinstance(result, list):
+            objects, identify = result, key
+        else:
+            # One object, such as a status: its identity is the resource.
+            objects, identify = [result], lambda obj: resource
+        if previous is None:
+            changes, previous = diff({}, objects, identify)
+            if initial and changes:
+                yield changes
+        else:
+            changes, previous = diff(previous, objects, identify)
+            if changes:
+                interval = min_interval
+                yield changes
+            else:
+                interval = min(interval * backoff, max_interval)
+        _sleep(interval)
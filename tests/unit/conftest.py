@@ -0,0 +1,32 @@
+# coding: utf-8
+
+import sys
+
+import pytest
+from steelconnection import cache, inventory, ratelimit
+
+
+collect_ignore = []
+if sys.version_info < (3, 6):
+    collect_ignore.append("test_aio.py")
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    for module in (cache, inventory, ratelimit):
+        monkeypatch.setattr(module, "_now", fake)
+    return fake
@@ -78,6 +78,10 @@ class Fake_Session(object):
             "Accept": "*/*",
             "Connection": "keep-alive",
         }
+        self.adapters = {}
+
+    def mount(self, prefix, adapter):
+        self.adapters[prefix] = adapter
 
     def get(self, url, auth=None, headers=None, params=None, data=None, timeout=None):
         if data is not None:
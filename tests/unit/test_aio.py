@@ -0,0 +1,168 @@
+# coding: utf-8
+
+import asyncio
+import json
+
+import pytest
+import steelconnection
+
+
+db = {
+    "orgs": {"items": [{"id": "org-12345", "name": "WineAndCheese"}]},
+    "nodes": {
+        "items": [
+            {
+                "id": "node-12345",
+                "org": "org-12345",
+                "site": "site-12345",
+                "serial": "XNABCD0123456789",
+                "model": "yogi",
+            }
+        ]
+    },
+    "node-12345": {"id": "node-12345", "state": "online"},
+}
+
+statuses = {"nonesuch": 404, "gone": 410}
+
+
+class FakeHeaders(dict):
+    pass
+
+
+class FakeContent:
+    def __init__(self, body):
+        self.body = body
+
+    async def iter_chunked(self, size):
+        for index in range(0, len(self.body), size):
+            yield self.body[index : index + size]
+
+
+class FakeResponse:
+    def __init__(self, method, url, status, body):
+        self.url = url
+        self.status = status
+        self.reason = "OK" if status < 400 else "Not Found"
+        self.charset = "utf-8"
+        self.headers = FakeHeaders({"Content-Type": "application/json"})
+        self.body = body
+        self.content = FakeContent(body)
+
+    async def read(self):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+        self.closed = False
+
+    def request(self, method, url, params=None, data=None, timeout=None, proxy=None):
+        self.calls.append((method, url, params, data))
+        resource = url.split("/")[-1]
+        status = statuses.get(resource, 200)
+        if method in ("POST", "PUT"):
+            body = data.encode()
+        elif status < 300:
+            body = json.dumps(db.get(resource, {})).encode()
+        else:
+            body = b'{"error": {"message": "nope"}}'
+        return FakeResponse(method, url, status, body)
+
+    async def close(self):
+        self.closed = True
+
+
+def run(coroutine):
+    return asyncio.new_event_loop().run_until_complete(coroutine)
+
+
+def make_sconnect(**kwargs):
+    return steelconnection.AsyncSConnect("some.realm", session=FakeSession(), **kwargs)
+
+
+def test_async_get():
+    sc = make_sconnect()
+    assert run(sc.get("orgs")) == db["orgs"]["items"]
+    assert sc.response.ok
+    assert sc.session.calls[0][1] == "https://some.realm/api/scm.config/1.0/orgs"
+
+
+def test_async_getstatus():
+    sc = make_sconnect()
+    assert run(sc.getstatus("node/node-12345")) == db["node-12345"]
+    assert "/api/scm.reporting/" in sc.response.url
+
+
+def test_async_post_and_put_send_json():
+    sc = make_sconnect()
+    data = {"name": "new"}
+    assert run(sc.post("orgs", data=data)) == data
+    assert run(sc.put("org/org-12345", data=data)) == data
+    assert sc.session.calls[-1][3] == json.dumps(data)
+
+
+def test_async_delete():
+    sc = make_sconnect()
+    assert run(sc.delete("org/org-12345")) == {}
+
+
+def test_async_get_raises_like_sconnect():
+    sc = make_sconnect()
+    with pytest.raises(steelconnection.InvalidResource) as error:
+        run(sc.get("nonesuch"))
+    assert "'nope'" in str(error.value)
+    assert not sc
+
+
+def test_async_on_error_do_nothing():
+    sc = make_sconnect(on_error=None)
+    assert run(sc.get("gone")) is None
+
+
+def test_async_concurrent_requests_share_one_loop():
+    sc = make_sconnect()
+
+    async def gather():
+        return await asyncio.gather(*(sc.get("orgs") for _ in range(50)))
+
+    results = run(gather())
+    assert len(results) == 50
+    assert all(result == db["orgs"]["items"] for result in results)
+
+
+def test_async_stream():
+    sc = make_sconnect()
+
+    async def collect():
+        return [chunk async for chunk in sc.stream("nodes")]
+
+    assert b"".join(run(collect())) == json.dumps(db["nodes"]).encode()
+
+
+def test_async_lookup():
+    sc = make_sconnect()
+    assert run(sc.lookup.org("WineAndCheese")) == db["orgs"]["items"][0]
+    assert run(sc.lookup.node("xnabcd0123456789")) == db["nodes"]["items"][0]
+    assert run(sc.lookup.org("DNE")) is None
+    assert sc.lookup.model("panda") == "SDI-130"
+
+
+def test_async_close():
+    sc = make_sconnect()
+    session = sc.session
+
+    async def use():
+        async with sc:
+            await sc.get("orgs")
+
+    run(use())
+    assert session.closed
+    assert sc.session is None
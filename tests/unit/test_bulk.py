@@ -0,0 +1,170 @@
+# coding: utf-8
+
+import pytest
+import responses
+import steelconnection
+
+
+ports = ["port-{}".format(index) for index in range(20)]
+
+
+def add_port_statuses():
+    for port in ports:
+        responses.add(
+            responses.GET,
+            "https://some.realm/api/scm.reporting/1.0/port/" + port,
+            json={"id": port, "link": True},
+            status=200,
+        )
+    responses.add(
+        responses.GET,
+        "https://some.realm/api/scm.reporting/1.0/port/nonesuch",
+        json={"error": {"message": "not found", "code": 404}},
+        status=404,
+    )
+
+
+@responses.activate
+def test_getstatus_many_returns_results_in_input_order():
+    add_port_statuses()
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    resources = ["port/" + port for port in ports]
+    results = sc.getstatus_many(resources, workers=5)
+    assert [item.resource for item in results] == resources
+    assert [item.result["id"] for item in results] == ports
+    assert all(item.error is None for item in results)
+
+
+@responses.activate
+def test_get_many_reports_errors_per_item():
+    add_port_statuses()
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    resources = ["port/port-1", "port/nonesuch", "port/port-2"]
+    results = sc.get_many(resources, api="scm.reporting")
+    assert results[0].result["id"] == "port-1"
+    assert results[1].result is None
+    assert isinstance(results[1].error, steelconnection.InvalidResource)
+    assert "not found" in str(results[1].error)
+    assert results[2].result["id"] == "port-2"
+
+
+@responses.activate
+def test_get_many_as_completed():
+    add_port_statuses()
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    resources = ["port/" + port for port in ports]
+    results = sc.getstatus_many(resources, as_completed=True)
+    assert not isinstance(results, list)
+    assert sorted(item.resource for item in results) == sorted(resources)
+
+
+@responses.activate
+def test_get_many_with_errors_ignored():
+    add_port_statuses()
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, on_error=None)
+    results = sc.getstatus_many(["port/nonesuch"])
+    assert results[0].result is None
+    assert results[0].error is None
+
+
+def test_get_many_reraises_system_exit():
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+
+    def fetch(api, resource, params=None):
+        raise SystemExit(1)
+
+    sc._fetch = fetch
+    with pytest.raises(SystemExit):
+        sc.get_many(["orgs"])
+
+
+def test_connection_pool_sized_to_workers():
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, max_workers=4)
+    assert sc.session.get_adapter("https://some.realm")._pool_maxsize == 4
+    sc._size_pool(32)
+    assert sc.session.get_adapter("https://some.realm")._pool_maxsize == 32
+    sc._size_pool(8)
+    assert sc.session.get_adapter("https://some.realm")._pool_maxsize == 32
+
+
+def add_node_ports():
+    for node in ("node-1", "node-2"):
+        responses.add(
+            responses.GET,
+            "https://some.realm/api/scm.config/1.0/node/{}/ports".format(node),
+            json={
+                "items": [{"id": node + "-" + port, "node": node} for port in ports[:3]]
+            },
+            status=200,
+        )
+        for port in ports[:3]:
+            status = 404 if (node, port) == ("node-2", "port-1") else 200
+            responses.add(
+                responses.GET,
+                "https://some.realm/api/scm.reporting/1.0/port/{}-{}".format(
+                    node, port
+                ),
+                json=(
+                    {"link": True} if status == 200 else {"error": {"message": "gone"}}
+                ),
+                status=status,
+            )
+    responses.add(
+        responses.GET,
+        "https://some.realm/api/scm.config/1.0/node/nonesuch/ports",
+        json={"error": {"message": "not found", "code": 404}},
+        status=404,
+    )
+
+
+@responses.activate
+def test_node_ports_with_status():
+    add_node_ports()
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    node_ports = sc.node_ports("node-1", workers=3)
+    assert [port["id"] for port in node_ports] == [
+        "node-1-port-0",
+        "node-1-port-1",
+        "node-1-port-2",
+    ]
+    assert all(port["status"] == {"link": True} for port in node_ports)
+    assert all(port["status_error"] is None for port in node_ports)
+    assert len(responses.calls) == 4
+
+
+@responses.activate
+def test_node_ports_without_status():
+    add_node_ports()
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    node_ports = sc.node_ports("node-1", with_status=False)
+    assert node_ports[0] == {"id": "node-1-port-0", "node": "node-1"}
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_node_ports_many():
+    add_node_ports()
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    results = sc.node_ports_many(["node-1", "nonesuch", "node-2"], workers=4)
+    assert [item.resource for item in results] == ["node-1", "nonesuch", "node-2"]
+    assert [port["id"] for port in results[2].result] == [
+        "node-2-port-0",
+        "node-2-port-1",
+        "node-2-port-2",
+    ]
+    assert isinstance(results[1].error, steelconnection.InvalidResource)
+    assert results[1].result is None
+    failed = results[2].result[1]
+    assert failed["status"] is None
+    assert isinstance(failed["status_error"], steelconnection.InvalidResource)
+    assert results[0].result[0]["status"] == {"link": True}
+
+
+@responses.activate
+def test_node_ports_many_with_errors_not_raised():
+    add_node_ports()
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, on_error="print")
+    results = sc.node_ports_many(["nonesuch", "node-1"])
+    assert results[0] == ("nonesuch", None, None)
+    assert len(results[1].result) == 3
+    assert sc.node_ports("nonesuch") is None
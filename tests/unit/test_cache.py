@@ -0,0 +1,144 @@
+# coding: utf-8
+
+import pytest
+import responses
+import steelconnection
+from steelconnection.cache import ResponseCache, _related, _segments
+
+
+base = "https://some.realm/api/scm.config/1.0/"
+orgs = {"items": [{"id": "org-12345", "name": "WineAndCheese"}]}
+nodes = {"items": [{"id": "node-12345", "serial": "XNABCD0123456789"}]}
+
+
+@responses.activate
+def test_get_served_from_cache(clock):
+    responses.add(responses.GET, base + "orgs", json=orgs, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, cache=True)
+    assert sc.get("orgs") == orgs["items"]
+    assert sc.get("/orgs") == orgs["items"]
+    assert len(responses.calls) == 1
+    stats = sc.cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+@responses.activate
+def test_cache_hit_restores_its_response(clock):
+    responses.add(responses.GET, base + "orgs", json=orgs, status=200)
+    responses.add(responses.GET, base + "nodes", json={}, status=404)
+    sc = steelconnection.SConnect(
+        "some.realm", connection_attempts=0, cache=True, on_error=None
+    )
+    sc.get("orgs")
+    sc.get("nodes")
+    assert not sc
+    sc.get("orgs")
+    assert sc.response.status_code == 200
+    assert sc.response.url == base + "orgs"
+    assert sc
+
+
+def test_longest_ttl_pattern_wins():
+    cache = ResponseCache(ttl=10, ttls={"org/*": 60, "org/*/sites": 120})
+    assert cache.ttl_for("org/org-1/sites") == 120
+    assert cache.ttl_for("org/org-1") == 60
+    assert cache.ttl_for("nodes") == 10
+
+
+@responses.activate
+def test_cache_false_disables_cache():
+    responses.add(responses.GET, base + "orgs", json=orgs, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, cache=False)
+    assert sc.cache is None
+    assert sc.get("orgs") == orgs["items"]
+    assert sc.get("orgs") == orgs["items"]
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_cache_expires_after_ttl(clock):
+    responses.add(responses.GET, base + "orgs", json=orgs, status=200)
+    cache = ResponseCache(ttl=10, ttls={"orgs": 60})
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, cache=cache)
+    sc.get("orgs")
+    clock.now += 30
+    sc.get("orgs")
+    assert len(responses.calls) == 1
+    clock.now += 31
+    sc.get("orgs")
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_cache_keyed_by_params_and_api(clock):
+    responses.add(responses.GET, base + "nodes", json=nodes, status=200)
+    responses.add(
+        responses.GET,
+        "https://some.realm/api/scm.reporting/1.0/nodes",
+        json=nodes,
+        status=200,
+    )
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, cache=True)
+    sc.get("nodes")
+    sc.get("nodes", params={"org": "org-12345"})
+    sc.getstatus("nodes")
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_write_invalidates_collection(clock):
+    responses.add(responses.GET, base + "nodes", json=nodes, status=200)
+    responses.add(responses.PUT, base + "node/node-12345", json={}, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, cache=True)
+    sc.get("nodes")
+    sc.put("node/node-12345", data={"location": "Here"})
+    sc.get("nodes")
+    assert len(responses.calls) == 3
+    assert sc.cache.stats()["invalidations"] == 1
+
+
+@responses.activate
+def test_errors_are_not_cached(clock):
+    responses.add(responses.GET, base + "nonesuch", status=404)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, cache=True)
+    for _ in range(2):
+        with pytest.raises(steelconnection.InvalidResource):
+            sc.get("nonesuch")
+    assert len(responses.calls) == 2
+
+
+def test_lru_eviction(clock):
+    cache = ResponseCache(maxsize=2)
+    cache.store("scm.config", "a", None, 1)
+    cache.store("scm.config", "b", None, 2)
+    assert cache.lookup("scm.config", "a") == (True, 1)
+    cache.store("scm.config", "c", None, 3)
+    assert cache.lookup("scm.config", "b") == (False, None)
+    assert cache.lookup("scm.config", "a") == (True, 1)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_polled_resources_never_cached(clock):
+    cache = ResponseCache()
+    cache.store("scm.config", "sshtunnel/node-1", None, {})
+    cache.store("scm.config", "node/node-1/image_status", None, {})
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize(
+    "written, cached, expected",
+    [
+        ("node/node-1", "nodes", True),
+        ("node/node-1", "org/org-1/nodes", True),
+        ("node/node-1", "node/node-1/ports", True),
+        ("node/node-1", "node/node-2", False),
+        ("org/org-1/sites", "org/org-1/sites", True),
+        ("org/org-1/sites", "sites", True),
+        ("org/org-1/sites", "org/org-1", True),
+        ("org/org-1/sites", "nodes", False),
+    ],
+)
+def test_invalidation_rules(written, cached, expected):
+    assert _related(_segments(written), _segments(cached)) is expected
@@ -0,0 +1,100 @@
+# coding: utf-8
+
+import pytest
+import responses
+import steelconnection
+from steelconnection.changes import ChangeSet, diff, fingerprint, fingerprints
+from steelconnection.inventory import Inventory
+
+
+before = [
+    {"id": "node-1", "serial": "XN1", "state": "online"},
+    {"id": "node-2", "serial": "XN2", "state": "online"},
+    {"id": "node-3", "serial": "XN3", "state": "online"},
+]
+after = [
+    {"id": "node-1", "serial": "XN1", "state": "online"},
+    {"id": "node-2", "state": "offline", "serial": "XN2B"},
+    {"id": "node-4", "serial": "XN4", "state": "online"},
+]
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_diff():
+    changes, current = diff(fingerprints(before), after)
+    assert changes.added == [after[2]]
+    assert changes.removed == [before[2]]
+    assert len(changes.changed) == 1
+    change = changes.changed[0]
+    assert change.id == "node-2"
+    assert change.fields == {"state": ("online", "offline"), "serial": ("XN2", "XN2B")}
+    assert len(changes) == 3
+    assert set(current) == {"node-1", "node-2", "node-4"}
+    unchanged, _ = diff(current, after)
+    assert not unchanged
+    assert repr(ChangeSet()) == "ChangeSet(added=0, changed=0, removed=0)"
+
+
+def test_inventory_refresh_updates_indexes():
+    inventory = Inventory()
+    objects = [before]
+    fetch = lambda: objects[0]  # noqa: E731
+    assert inventory.lookup("nodes", "serial", "XN3", fetch) == [before[2]]
+    assert inventory.lookup("nodes", "state", "online", fetch) == before
+    objects[0] = after
+    changes = inventory.refresh("nodes", fetch)
+    assert (len(changes.added), len(changes.changed), len(changes.removed)) == (1, 1, 1)
+    assert inventory.lookup("nodes", "serial", "XN3", fetch) == []
+    assert inventory.lookup("nodes", "serial", "XN2B", fetch) == [after[1]]
+    assert inventory.lookup("nodes", "serial", "XN2", fetch) == []
+    assert inventory.lookup("nodes", "serial", "XN4", fetch) == [after[2]]
+    online = inventory.lookup("nodes", "state", "online", fetch)
+    assert sorted(node["id"] for node in online) == ["node-1", "node-4"]
+    assert inventory.collection("nodes", fetch).objects == after
+    assert not inventory.refresh("nodes", fetch)
+
+
+def test_inventory_refresh_keeps_collection_order():
+    inventory = Inventory()
+    objects = [[dict(node, state="offline") for node in before[:1]] + before[1:]]
+    fetch = lambda: objects[0]  # noqa: E731
+    assert inventory.lookup("nodes", "state", "online", fetch) == before[1:]
+    objects[0] = before
+    inventory.refresh("nodes", fetch)
+    online = inventory.lookup("nodes", "state", "online", fetch)
+    assert [node["id"] for node in online] == ["node-1", "node-2", "node-3"]
+    assert list(fingerprints(reversed(before))) == ["node-3", "node-2", "node-1"]
+
+def test_inventory_refresh_without_collection():
+    inventory = Inventory()
+    changes = inventory.refresh("nodes", lambda: before)
+    assert changes.added == before
+    assert inventory.loads == 1
+
+
+base = "https://some.realm/api/scm.config/1.0/"
+
+
+@responses.activate
+def test_lookup_refresh():
+    responses.add(responses.GET, base + "nodes", json={"items": before}, status=200)
+    responses.add(responses.GET, base + "nodes", json={"items": after}, status=200)
+    sc = steelconnection.SConnect(
+        "some.realm", connection_attempts=0, inventory=True, cache=True
+    )
+    assert sc.lookup.node("XN3") == before[2]
+    changes = sc.lookup.refresh("nodes")
+    assert changes.removed == [before[2]]
+    assert sc.lookup.node("XN3") is None
+    assert sc.lookup.node("XN4") == after[2]
+    assert len(responses.calls) == 2
+
+
+def test_lookup_refresh_requires_inventory():
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    with pytest.raises(ValueError):
+        sc.lookup.refresh("nodes")
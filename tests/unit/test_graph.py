@@ -0,0 +1,91 @@
+# coding: utf-8
+
+import pytest
+import responses
+import steelconnection
+from steelconnection.exceptions import InvalidResource
+from steelconnection.graph import RealmGraph
+
+
+base = "https://some.realm/api/scm.config/1.0/"
+realm = {
+    "orgs": [{"id": "org-1", "name": "Spacely"}],
+    "sites": [
+        {"id": "site-1", "org": "org-1", "name": "Skypad"},
+        {"id": "site-2", "org": "org-1", "name": "Factory"},
+    ],
+    "nodes": [
+        {"id": "node-1", "org": "org-1", "site": "site-1", "serial": "XN1"},
+        {"id": "node-2", "org": "org-1", "site": None, "serial": "XN2"},
+    ],
+    "wans": [{"id": "wan-1", "org": "org-1", "name": "Internet"}],
+    "uplinks": [
+        {
+            "id": "uplink-1",
+            "org": "org-1",
+            "site": "site-1",
+            "node": "node-1",
+            "wan": "wan-1",
+            "port": "port-2",
+        }
+    ],
+    "ports": [
+        {"id": "port-1", "node": "node-1", "ifname": "eth0"},
+        {"id": "port-2", "node": "node-1", "ifname": "eth1"},
+        {"id": "port-3", "node": "node-2", "ifname": "eth0"},
+    ],
+}
+
+
+def add_realm(prefix=""):
+    for kind, items in realm.items():
+        url = base + (kind if kind == "orgs" else prefix + kind)
+        responses.add(responses.GET, url, json={"items": items}, status=200)
+
+
+@responses.activate
+def test_graph_joins():
+    add_realm()
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    graph = sc.lookup.graph()
+    assert len(responses.calls) == len(realm)
+    node = graph.get("nodes", "node-1")
+    assert node.serial == "XN1"
+    assert node["site"] == "site-1"
+    assert node.site.name == "Skypad"
+    assert node.site.org.name == "Spacely"
+    assert [port.ifname for port in node.ports] == ["eth0", "eth1"]
+    uplink = node.uplinks[0]
+    assert uplink.wan.name == "Internet"
+    assert uplink.port.ifname == "eth1"
+    assert uplink.node == node
+    assert graph.get("nodes", "node-2").site is None
+    assert sorted(site.name for site in graph.get("orgs", "org-1").sites) == [
+        "Factory",
+        "Skypad",
+    ]
+    assert graph.get("sites", "site-2").nodes == []
+    assert graph.get("nodes", "node-9") is None
+    assert len(graph.all("ports")) == 3
+    assert len(graph) == 10
+    assert len(responses.calls) == len(realm)
+    with pytest.raises(AttributeError):
+        node.location
+
+
+@responses.activate
+def test_graph_limited_to_org():
+    add_realm(prefix="org/org-1/")
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    graph = sc.lookup.graph(orgid="org-1", collections=("orgs", "sites", "nodes"))
+    assert graph.get("nodes", "node-1").site.name == "Skypad"
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_graph_load_error():
+    responses.add(responses.GET, base + "orgs", json={}, status=404)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    graph = RealmGraph(sc, collections=("orgs",))
+    with pytest.raises(InvalidResource):
+        graph.load()
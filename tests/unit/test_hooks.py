@@ -0,0 +1,144 @@
+# coding: utf-8
+
+import time
+
+import pytest
+import requests
+import responses
+import steelconnection
+from steelconnection.hooks import Hooks
+
+
+config = "https://some.realm/api/scm.config/1.0/"
+reporting = "https://some.realm/api/scm.reporting/1.0/"
+
+
+@responses.activate
+def test_request_hooks_fire_in_order():
+    responses.add(responses.GET, config + "orgs", json={"items": []})
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    events = []
+    sc.hooks.register("before_request", lambda *args: events.append(("before",) + args))
+    sc.hooks.register(
+        "after_response",
+        lambda method, url, response, elapsed: events.append(
+            ("after", method, url, response.status_code, elapsed >= 0)
+        ),
+    )
+    sc.get("orgs")
+    assert events == [
+        ("before", "GET", config + "orgs", None, None),
+        ("after", "GET", config + "orgs", 200, True),
+    ]
+
+
+@responses.activate
+def test_error_and_retry_hooks(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    responses.add(
+        responses.GET, config + "orgs", body=requests.ConnectionError("reset")
+    )
+    responses.add(responses.GET, config + "orgs", json={"items": []})
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, retry=2)
+    errors, retries = [], []
+    sc.hooks.register("on_error", lambda m, u, e, t: errors.append(type(e).__name__))
+    sc.hooks.register("on_retry", lambda m, u, n, d, r: retries.append(n))
+    sc.get("orgs")
+    assert errors == ["ConnectionError"]
+    assert retries == [1]
+
+
+def test_unknown_event():
+    with pytest.raises(ValueError):
+        Hooks().register("nonesuch", print)
+
+
+def test_unregister():
+    hooks = Hooks()
+    calls = []
+    hooks.register("on_retry", calls.append)
+    hooks.unregister("on_retry", calls.append)
+    hooks.fire("on_retry", 1)
+    assert calls == []
+    assert not hooks.active("on_retry")
+
+
+@responses.activate
+def test_span_recorder_nests_requests_under_operation():
+    responses.add(responses.GET, reporting + "node/node-1", json={"state": "online"})
+    responses.add(
+        responses.GET, config + "sshtunnel/node-1", json={"status": "connected"}
+    )
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    recorder = steelconnection.SpanRecorder().install(sc)
+    sc.sshtunnel("node-1")
+    assert len(recorder.spans) == 1
+    operation = recorder.spans[0]
+    assert operation.name == "sshtunnel"
+    assert operation.attributes == {"node_id": "node-1"}
+    assert [child.name for child in operation.children] == ["HTTP GET", "HTTP GET"]
+    assert operation.children[0].attributes["status"] == 200
+    assert operation.duration >= sum(child.duration for child in operation.children)
+    report = recorder.report().splitlines()
+    assert report[0].endswith("sshtunnel node_id=node-1")
+    assert report[1].startswith("  ")
+    assert "url=" + reporting + "node/node-1" in report[1]
+
+
+@responses.activate
+def test_manual_span_and_uninstall():
+    responses.add(responses.GET, config + "orgs", json={"items": []})
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    recorder = steelconnection.SpanRecorder().install(sc)
+    with recorder.span("report", kind="weekly"):
+        sc.get("orgs")
+        sc.get("orgs")
+    recorder.uninstall(sc)
+    sc.get("orgs")
+    assert len(recorder.spans) == 1
+    assert len(recorder.spans[0].children) == 2
+    assert recorder.spans[0].attributes == {"kind": "weekly"}
+
+
+@responses.activate
+def test_stream_closes_span_on_error_and_early_exit():
+    responses.add(responses.GET, config + "image", body=b"x" * 200000)
+    responses.add(
+        responses.GET, config + "gone", body=requests.ConnectionError("reset")
+    )
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    recorder = steelconnection.SpanRecorder().install(sc)
+    errors = []
+    sc.hooks.register("on_error", lambda m, u, e, t: errors.append(type(e).__name__))
+    with pytest.raises(requests.ConnectionError):
+        list(sc.stream("gone"))
+    chunks = sc.stream("image")
+    next(chunks)
+    chunks.close()
+    assert errors == ["ConnectionError"]
+    assert [span.attributes.get("error") for span in recorder.spans] == [
+        "ConnectionError",
+        None,
+    ]
+    assert recorder.spans[1].attributes["status"] == 200
+
+
+@responses.activate
+def test_span_recorder_follows_worker_threads():
+    for node in ("node-1", "node-2"):
+        responses.add(responses.GET, reporting + "node/" + node, json={"state": "up"})
+        responses.add(
+            responses.GET, config + "sshtunnel/" + node, json={"status": "connected"}
+        )
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    recorder = steelconnection.SpanRecorder().install(sc)
+    sc.sshtunnels(["node-1", "node-2"], workers=2)
+    with recorder.span("report"):
+        sc.getstatus_many(["node/node-1", "node/node-2"], workers=2)
+    assert [span.name for span in recorder.spans] == ["sshtunnels", "report"]
+    tunnels, report = recorder.spans
+    assert [child.name for child in tunnels.children] == ["HTTP GET"] * 4
+    assert [child.name for child in report.children] == ["HTTP GET"] * 2
+    assert all(child.end is not None for child in tunnels.children)
+    sc.get("node/node-1", api="scm.reporting")
+    assert len(recorder.spans) == 3
@@ -0,0 +1,111 @@
+# coding: utf-8
+
+import pytest
+import responses
+import steelconnection
+from steelconnection.inventory import Inventory
+
+
+base = "https://some.realm/api/scm.config/1.0/"
+nodes = {
+    "items": [
+        {"id": "node-1", "serial": "XNABCD0123456789", "site": "site-1"},
+        {"id": "node-2", "serial": "XNABCD9876543210", "site": "site-1"},
+        {"id": "node-3", "serial": "XNZZZZ0000000000", "tags": ["a"]},
+    ]
+}
+
+
+class Fetcher(object):
+    def __init__(self, objects):
+        self.objects = objects
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.objects
+
+
+def test_lookup_builds_index_once(clock):
+    fetch = Fetcher(nodes["items"])
+    inventory = Inventory()
+    assert inventory.lookup("nodes", "serial", "XNABCD9876543210", fetch) == [
+        nodes["items"][1]
+    ]
+    assert inventory.lookup("nodes", "site", "site-1", fetch) == nodes["items"][:2]
+    assert fetch.calls == 1
+    assert inventory.stats()["hits"] == 2
+
+
+def test_lookup_unhashable_value(clock):
+    fetch = Fetcher(nodes["items"])
+    inventory = Inventory()
+    assert inventory.lookup("nodes", "tags", ["a"], fetch) == [nodes["items"][2]]
+
+
+def test_collection_refreshed_after_ttl(clock):
+    fetch = Fetcher(nodes["items"])
+    inventory = Inventory(ttl=60)
+    inventory.lookup("nodes", "id", "node-1", fetch)
+    clock.now += 59
+    inventory.lookup("nodes", "id", "node-1", fetch)
+    assert fetch.calls == 1
+    clock.now += 2
+    inventory.lookup("nodes", "id", "node-1", fetch)
+    assert fetch.calls == 2
+
+
+def test_negative_cache(clock):
+    fetch = Fetcher(nodes["items"])
+    inventory = Inventory(ttl=300, negative_ttl=30)
+    assert inventory.lookup("nodes", "id", "node-9", fetch) == []
+    assert inventory.lookup("nodes", "id", "node-9", fetch) == []
+    assert fetch.calls == 1
+    assert inventory.negative_hits == 1
+    # Once the miss expires, the collection is reloaded to look for new objects.
+    clock.now += 31
+    fetch.objects = nodes["items"] + [{"id": "node-9"}]
+    assert inventory.lookup("nodes", "id", "node-9", fetch) == [{"id": "node-9"}]
+    assert fetch.calls == 2
+
+
+def test_invalidate_related_collections(clock):
+    inventory = Inventory()
+    inventory.collection("nodes", Fetcher([]))
+    inventory.collection("org/org-1/sites", Fetcher([]))
+    assert inventory.invalidate("node/node-1") == 1
+    assert len(inventory) == 1
+    inventory.clear()
+    assert len(inventory) == 0
+
+
+@responses.activate
+def test_lookup_uses_inventory(clock):
+    responses.add(responses.GET, base + "nodes", json=nodes, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, inventory=True)
+    assert sc.lookup.node("xnabcd0123456789") == nodes["items"][0]
+    assert sc.lookup.node("XNABCD9876543210") == nodes["items"][1]
+    assert sc.lookup.node("XNDOESNOTEXIST00") is None
+    assert sc.lookup.find("nodes", {"site": "site-1", "id": "node-2"}) == [
+        nodes["items"][1]
+    ]
+    assert len(responses.calls) == 1
+
+
+
+@responses.activate
+def test_inventory_false_is_no_inventory(clock):
+    responses.add(responses.GET, base + "nodes", json=nodes, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, inventory=False)
+    assert sc.inventory is None
+    assert sc.lookup.node("XNABCD0123456789") == nodes["items"][0]
+
+@responses.activate
+def test_write_invalidates_inventory(clock):
+    responses.add(responses.GET, base + "nodes", json=nodes, status=200)
+    responses.add(responses.PUT, base + "node/node-1", json={}, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, inventory=True)
+    sc.lookup.node("XNABCD0123456789")
+    sc.put("node/node-1", data={"location": "here"})
+    sc.lookup.node("XNABCD0123456789")
+    assert len(responses.calls) == 3
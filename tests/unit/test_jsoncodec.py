@@ -0,0 +1,75 @@
+# coding: utf-8
+
+import json
+
+import pytest
+import responses
+import steelconnection
+from steelconnection.jsoncodec import StdlibCodec, get_codec
+
+import fake_requests
+
+
+class CountingResponse(fake_requests.Fake_Response):
+    decoded = 0
+
+    def json(self):
+        CountingResponse.decoded += 1
+        return super(CountingResponse, self).json()
+
+
+class UpperCodec(object):
+    def encode(self, data):
+        return json.dumps(data).upper()
+
+    def decode(self, response):
+        return {"decoded": response.text}
+
+
+def test_result_is_decoded_once():
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    CountingResponse.decoded = 0
+    response = CountingResponse("", 200, {"items": [{"id": "node-1"}]})
+    assert sc._get_result(response) == [{"id": "node-1"}]
+    assert CountingResponse.decoded == 1
+
+
+def test_default_codec_is_stdlib():
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    assert isinstance(sc.codec, StdlibCodec)
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        get_codec("nonesuch")
+
+
+
+def test_codec_name_with_decode_method():
+    # On Python 2 a str has both encode and decode, it is still a name.
+    class Name(str):
+        def decode(self, *args):
+            return self
+
+    assert isinstance(get_codec(Name("json")), StdlibCodec)
+
+@pytest.mark.parametrize("name", ["orjson", "ujson"])
+def test_optional_codecs_decode_items(name):
+    pytest.importorskip(name)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, codec=name)
+    response = fake_requests.Fake_Response("", 200, {"items": [{"id": "node-1"}]})
+    response.content = response.text.encode()
+    assert sc._get_result(response) == [{"id": "node-1"}]
+    assert json.loads(sc.codec.encode({"a": 1})) == {"a": 1}
+
+
+@responses.activate
+def test_custom_codec_used_for_request_and_response():
+    url = "https://some.realm/api/scm.config/1.0/orgs"
+    responses.add(responses.POST, url, json={"id": "org-1"}, status=200)
+    sc = steelconnection.SConnect(
+        "some.realm", connection_attempts=0, codec=UpperCodec()
+    )
+    result = sc.post("orgs", data={"name": "new"})
+    assert responses.calls[0].request.body == '{"NAME": "NEW"}'
+    assert result == {"decoded": '{"id": "org-1"}'}
@@ -173,6 +173,54 @@ def test_lookup_wan_without_org():
         sc.lookup.wan(key)
 
 
+@responses.activate
+def test_lookup_find_many():
+    responses.add(get_sites_from_org)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    result = sc.lookup.find_many("org/org-12345/sites", "name", ["DOWN", "DNE", "UP"])
+    assert result == {
+        "UP": db["sites"]["items"][0],
+        "DOWN": db["sites"]["items"][1],
+        "DNE": None,
+    }
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_lookup_find_many_with_inventory():
+    responses.add(get_orgs)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, inventory=True)
+    assert sc.lookup.orgs(["WineAndCheese", "DNE"]) == {
+        "WineAndCheese": db["orgs"]["items"][0],
+        "DNE": None,
+    }
+    assert sc.lookup.org("WineAndCheese") == db["orgs"]["items"][0]
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_lookup_nodes():
+    responses.add(get_nodes)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    result = sc.lookup.nodes(["xnabcd0123456789", "XNDNE"])
+    assert result == {"xnabcd0123456789": db["nodes"]["items"][0], "XNDNE": None}
+
+
+@responses.activate
+def test_lookup_sites_and_wans():
+    responses.add(get_sites_from_org)
+    responses.add(get_wans_from_org)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    sites = sc.lookup.sites(["UP"], orgid="org-12345")
+    assert sites == {"UP": db["sites"]["items"][0]}
+    wans = sc.lookup.wans(["Internet"], orgid="org-12345")
+    assert wans == {"Internet": db["wans"]["items"][0]}
+    with pytest.raises(ValueError):
+        sc.lookup.sites(["UP"])
+    with pytest.raises(ValueError):
+        sc.lookup.wans(["Internet"])
+
+
 def test_lookup_model():
     sc = steelconnection.SConnect("some.realm", connection_attempts=0)
     assert sc.lookup.model("panda") == "SDI-130"
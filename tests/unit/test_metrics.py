@@ -0,0 +1,132 @@
+# coding: utf-8
+
+import threading
+import time
+
+import pytest
+import requests
+import responses
+import steelconnection
+from steelconnection.metrics import Metrics, resource_template
+
+
+base = "https://some.realm/api/scm.config/1.0/"
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        (base + "nodes", ("scm.config", "nodes")),
+        (base + "node/node-0a1b2c/ports", ("scm.config", "node/{id}/ports")),
+        (
+            "https://some.realm/api/scm.reporting/1.0/port/port-abc-123",
+            ("scm.reporting", "port/{id}"),
+        ),
+        (base + "org/org-Spacely-0a0b/sites?x=1", ("scm.config", "org/{id}/sites")),
+        (base + "node/node-1/image_status", ("scm.config", "node/{id}/image_status")),
+    ],
+)
+def test_resource_template(url, expected):
+    assert resource_template(url) == expected
+
+
+@responses.activate
+def test_requests_are_recorded_per_endpoint():
+    responses.add(responses.GET, base + "node/node-1", json={"id": "node-1"})
+    responses.add(responses.GET, base + "node/node-2", json={"id": "node-2"})
+    responses.add(responses.GET, base + "node/node-3", status=404)
+    responses.add(responses.PUT, base + "node/node-1", json={})
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, on_error=None)
+    for node in ("node-1", "node-2", "node-3"):
+        sc.get("node/" + node)
+    sc.put("node/node-1", data={"location": "Here"})
+    snapshot = sc.stats.snapshot()
+    get = snapshot["GET"]["scm.config"]["node/{id}"]
+    assert get["count"] == 3
+    assert get["errors"] == 1
+    assert get["statuses"] == {200: 2, 404: 1}
+    assert get["bytes_received"] == 2 * len('{"id": "node-1"}')
+    assert 0 <= get["p50"] <= get["p95"] <= get["p99"]
+    put = snapshot["PUT"]["scm.config"]["node/{id}"]
+    assert put["bytes_sent"] == len('{"location": "Here"}')
+
+
+@responses.activate
+def test_exceptions_are_recorded():
+    responses.add(responses.GET, base + "orgs", body=requests.ConnectionError("reset"))
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    with pytest.raises(requests.ConnectionError):
+        sc.get("orgs")
+    orgs = sc.stats.snapshot()["GET"]["scm.config"]["orgs"]
+    assert orgs["statuses"] == {"ConnectionError": 1}
+    assert orgs["errors"] == 1
+
+
+@responses.activate
+def test_retries_are_recorded_per_request(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    started, retried = threading.Event(), threading.Event()
+    statuses = [503, 200]
+
+    def orgs(request):
+        started.wait(5)
+        status = statuses.pop(0)
+        if status == 200:
+            retried.set()
+        return status, {}, '{"items": []}'
+
+    def nodes(request):
+        # Start before, and finish after, the other request retries.
+        started.set()
+        retried.wait(5)
+        return 200, {}, '{"items": []}'
+
+    responses.add_callback(responses.GET, base + "orgs", callback=orgs)
+    responses.add_callback(responses.GET, base + "nodes", callback=nodes)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, retry=2)
+    sc.get_many(["orgs", "nodes"], workers=2)
+    get = sc.stats.snapshot()["GET"]["scm.config"]
+    assert get["orgs"]["retries"] == 1
+    assert get["nodes"]["retries"] == 0
+
+
+def test_metrics_can_be_disabled():
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, metrics=False)
+    assert sc.stats is None
+
+
+def test_percentiles_estimated_from_buckets():
+    metrics = Metrics(buckets=(0.1, 0.2, 0.4, 0.8))
+    for _ in range(90):
+        metrics.record("GET", base + "nodes", 200, 0.15)
+    for _ in range(10):
+        metrics.record("GET", base + "nodes", 200, 0.7)
+    nodes = metrics.snapshot()["GET"]["scm.config"]["nodes"]
+    assert 0.1 <= nodes["p50"] <= 0.2
+    assert 0.4 <= nodes["p95"] <= 0.8
+    assert nodes["latency_avg"] == pytest.approx(0.205)
+
+
+def test_prometheus_format():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics.record("GET", base + "node/node-1", 200, 0.05, bytes_received=10)
+    metrics.record("GET", base + "node/node-2", 503, 2.0, retries=2)
+    text = metrics.prometheus()
+    labels = 'method="GET",api="scm.config",resource="node/{id}"'
+    assert "# TYPE steelconnection_requests_total counter" in text
+    assert "steelconnection_requests_total{" + labels + ',status="200"} 1' in text
+    assert "steelconnection_requests_total{" + labels + ',status="503"} 1' in text
+    assert "steelconnection_retries_total{" + labels + "} 2" in text
+    assert "steelconnection_bytes_received_total{" + labels + "} 10" in text
+    bucket = "steelconnection_request_duration_seconds_bucket{" + labels
+    assert bucket + ',le="0.1"} 1' in text
+    assert bucket + ',le="1.0"} 1' in text
+    assert bucket + ',le="+Inf"} 2' in text
+    assert "steelconnection_request_duration_seconds_count{" + labels + "} 2" in text
+
+
+def test_reset():
+    metrics = Metrics()
+    metrics.record("GET", base + "nodes", 200, 0.01)
+    metrics.reset()
+    assert metrics.snapshot() == {}
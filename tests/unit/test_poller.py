@@ -0,0 +1,168 @@
+# coding: utf-8
+
+import threading
+import time
+
+import pytest
+import responses
+import steelconnection
+from steelconnection.poller import Poller
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
+
+nodes = ["node-{}".format(index) for index in range(8)]
+
+
+def add_node_statuses():
+    for node in nodes:
+        responses.add(
+            responses.GET,
+            "https://some.realm/api/scm.reporting/1.0/node/" + node,
+            json={"id": node, "state": "online"},
+            status=200,
+        )
+    responses.add(
+        responses.GET,
+        "https://some.realm/api/scm.reporting/1.0/node/nonesuch",
+        json={"error": {"message": "not found", "code": 404}},
+        status=404,
+    )
+
+
+@responses.activate
+def test_run_delivers_every_result_each_sweep():
+    add_node_statuses()
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    resources = ["node/" + node for node in nodes] + ["node/nonesuch"]
+    results = queue.Queue()
+    poller = Poller(sc, resources, interval=0.1, workers=3, queue=results)
+    sweeps = poller.run(sweeps=2)
+    assert [sweep.number for sweep in sweeps] == [1, 2]
+    assert all(sweep.requests == len(resources) for sweep in sweeps)
+    assert all(sweep.errors == 1 for sweep in sweeps)
+    assert sweeps[1].started - sweeps[0].started == pytest.approx(0.1, abs=0.02)
+    assert poller.last_sweep is sweeps[1]
+    delivered = [results.get_nowait() for _ in range(2 * len(resources))]
+    assert results.empty()
+    failed = [item for item in delivered if item.error is not None]
+    assert len(failed) == 2
+    assert isinstance(failed[0].error, steelconnection.InvalidResource)
+    assert {item.result["id"] for item in delivered if item.error is None} == set(nodes)
+
+
+@responses.activate
+def test_requests_are_spread_over_the_interval():
+    add_node_statuses()
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    times = []
+    poller = Poller(
+        sc,
+        ["node/" + node for node in nodes[:4]],
+        interval=0.4,
+        callback=lambda item: times.append(time.time()),
+    )
+    sweep = poller.run(sweeps=1)[0]
+    assert len(times) == 4
+    assert times[-1] - times[0] >= 0.25
+    assert sweep.duration >= 0.25
+    assert sweep.lag < 0.1
+
+
+def test_lag_when_workers_are_busy():
+    class Slow(object):
+        max_workers = 1
+
+        def _size_pool(self, workers):
+            pass
+
+        def _fetch(self, api, resource, params=None):
+            time.sleep(0.05)
+            return {"id": resource}
+
+    poller = Poller(Slow(), ["a", "b", "c", "d"], interval=0.04)
+    sweep = poller.run(sweeps=1)[0]
+    assert sweep.requests == 4
+    assert sweep.duration > 0.04
+    assert sweep.lag >= 0.1
+
+
+def test_failing_callback_does_not_stop_polling():
+    class Fake(object):
+        max_workers = 2
+
+        def _size_pool(self, workers):
+            pass
+
+        def _fetch(self, api, resource, params=None):
+            return {"id": resource}
+
+    def callback(item):
+        raise RuntimeError("bug in callback")
+
+    poller = Poller(Fake(), ["a", "b"], interval=0.01, callback=callback)
+    assert [sweep.requests for sweep in poller.run(sweeps=2)] == [2, 2]
+
+
+def test_start_and_stop():
+    class Fake(object):
+        max_workers = 2
+        calls = 0
+
+        def _size_pool(self, workers):
+            pass
+
+        def _fetch(self, api, resource, params=None):
+            Fake.calls += 1
+            return {"id": resource}
+
+    received = threading.Event()
+    poller = Poller(Fake(), ["a"], interval=0.01, callback=lambda item: received.set())
+    poller.start()
+    assert received.wait(2)
+    with pytest.raises(RuntimeError):
+        poller.start()
+    poller.stop(timeout=2)
+    assert not poller.running
+    calls = Fake.calls
+    time.sleep(0.05)
+    assert Fake.calls == calls
+    assert poller.sweeps
+
+
+def test_system_exit_is_raised_in_calling_thread():
+    class Fake(object):
+        max_workers = 2
+
+        def _size_pool(self, workers):
+            pass
+
+        def _fetch(self, api, resource, params=None):
+            if resource == "b":
+                raise SystemExit(1)  # As from on_error='exit'.
+            return {"id": resource}
+
+    poller = Poller(Fake(), ["a", "b", "c"], interval=0.01)
+    raised = []
+
+    def run():
+        try:
+            poller.run(sweeps=2)
+        except SystemExit as e:
+            raised.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.daemon = True
+    thread.start()
+    thread.join(2)
+    assert not thread.is_alive()
+    assert len(raised) == 1
+    assert not poller.sweeps
+
+
+def test_interval_must_be_positive():
+    with pytest.raises(ValueError):
+        Poller(object(), [], interval=0)
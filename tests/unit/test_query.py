@@ -0,0 +1,122 @@
+# coding: utf-8
+
+import re
+
+import pytest
+import responses
+import steelconnection
+from steelconnection.query import Query, compile_query
+
+
+nodes = [
+    {
+        "id": "node-1",
+        "serial": "XN01",
+        "model": "panda",
+        "state": "online",
+        "uptime": 100,
+        "location": {"city": "Paris"},
+        "uplinks": ["uplink-1"],
+    },
+    {
+        "id": "node-2",
+        "serial": "XN02",
+        "model": "yogi",
+        "state": "offline",
+        "uptime": 5,
+        "location": {"city": None},
+        "uplinks": [],
+    },
+    {"id": "node-3", "serial": "YZ03", "model": "ewok", "state": None, "uptime": "n/a"},
+]
+
+
+def ids(spec):
+    return [obj["id"] for obj in Query(spec).filter(nodes)]
+
+
+def test_equality_and_null():
+    assert ids({"model": "yogi"}) == ["node-2"]
+    assert ids({"model": "yogi", "state": "online"}) == []
+    assert ids({"state": None}) == ["node-3"]
+    assert ids({"location": None}) == ["node-3"]
+    assert ids({"location": {"city": "Paris"}}) == ["node-1"]
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ({"model": {"$eq": "panda"}}, ["node-1"]),
+        ({"model": {"$ne": "panda"}}, ["node-2", "node-3"]),
+        ({"model": {"$in": ["panda", "ewok"]}}, ["node-1", "node-3"]),
+        ({"model": {"$nin": ["panda", "ewok"]}}, ["node-2"]),
+        ({"state": {"$in": ["offline", None]}}, ["node-2", "node-3"]),
+        ({"uptime": {"$gt": 5}}, ["node-1"]),
+        ({"uptime": {"$gte": 5}}, ["node-1", "node-2"]),
+        ({"uptime": {"$lt": 100}}, ["node-2"]),
+        ({"uptime": {"$lte": 100, "$gt": 5}}, ["node-1"]),
+        ({"serial": {"$regex": "^XN"}}, ["node-1", "node-2"]),
+        ({"serial": {"$regex": re.compile("z", re.I)}}, ["node-3"]),
+        ({"serial": {"$not": {"$regex": "^XN"}}}, ["node-3"]),
+        ({"location": {"$exists": False}}, ["node-3"]),
+    ],
+)
+def test_operators(spec, expected):
+    assert ids(spec) == expected
+
+
+def test_dotted_paths():
+    assert ids({"location.city": "Paris"}) == ["node-1"]
+    assert ids({"location.city": None}) == ["node-2", "node-3"]
+    assert ids({"location.city": {"$exists": True}}) == ["node-1", "node-2"]
+    assert ids({"uplinks.0": "uplink-1"}) == ["node-1"]
+    assert ids({"uplinks.0": {"$exists": True}}) == ["node-1"]
+
+
+def test_dotted_paths_on_records():
+    records = steelconnection.records.Compactor().compact("nodes", nodes)
+    query = Query({"location.city": "Paris", "uplinks.0": "uplink-1"})
+    assert [obj["id"] for obj in query.filter(records)] == ["node-1"]
+    assert len(list(Query({"location.city": {"$exists": True}}).filter(records))) == 2
+
+
+def test_combinators():
+    either = {"$or": [{"model": "panda"}, {"state": "offline"}]}
+    assert ids(either) == ["node-1", "node-2"]
+    assert ids({"$and": [either, {"uptime": {"$lt": 50}}]}) == ["node-2"]
+    assert ids({"$not": either}) == ["node-3"]
+    assert ids({}) == ["node-1", "node-2", "node-3"]
+
+
+def test_unknown_operator():
+    with pytest.raises(ValueError):
+        compile_query({"model": {"$like": "pan%"}})
+    with pytest.raises(ValueError):
+        compile_query({"$xor": []})
+
+
+def test_equalities():
+    query = Query({"model": "panda", "id": {"$eq": "node-1"}, "a.b": 1, "c": None})
+    assert query.equalities == {"model": "panda", "id": "node-1"}
+    assert Query({"tags": ["a"]}).equalities == {}
+
+
+base = "https://some.realm/api/scm.config/1.0/"
+
+
+@responses.activate
+def test_lookup_find_with_query():
+    responses.add(responses.GET, base + "nodes", json={"items": nodes}, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    query = steelconnection.Query({"serial": {"$regex": "^XN"}})
+    assert sc.lookup.find("nodes", query) == nodes[:2]
+    assert sc.lookup.find_one("nodes", {"uptime": {"$lt": 10}}) == nodes[1]
+
+
+@responses.activate
+def test_lookup_query_with_inventory():
+    responses.add(responses.GET, base + "nodes", json={"items": nodes}, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, inventory=True)
+    assert sc.lookup.find("nodes", {"model": "yogi", "uptime": 5}) == [nodes[1]]
+    assert sc.lookup.find("nodes", {"model": {"$in": ["yogi"]}}) == [nodes[1]]
+    assert len(responses.calls) == 1
@@ -0,0 +1,69 @@
+# coding: utf-8
+
+import os
+import time
+
+import pytest
+import responses
+import steelconnection
+
+
+@pytest.fixture
+def clock(clock, monkeypatch):
+    # FileTokenBucket also reads time.time, and waiting must not block.
+    monkeypatch.setattr(time, "time", clock)
+    monkeypatch.setattr(time, "sleep", clock.sleep)
+    return clock
+
+
+def test_bucket_allows_burst_then_waits(clock):
+    bucket = steelconnection.TokenBucket(rate=2, burst=3)
+    waits = [bucket.acquire() for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.5)
+    assert waits[4] == pytest.approx(0.5)
+
+
+def test_bucket_refills_over_time(clock):
+    bucket = steelconnection.TokenBucket(rate=10, burst=1)
+    assert bucket.acquire() == 0.0
+    clock.now += 0.1
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.1)
+
+
+def test_bucket_rejects_bad_rate():
+    with pytest.raises(ValueError):
+        steelconnection.TokenBucket(rate=0)
+
+
+def test_bucket_shared_per_realm():
+    first = steelconnection.TokenBucket.for_realm("shared.realm", rate=5)
+    second = steelconnection.TokenBucket.for_realm("shared.realm", rate=50)
+    other = steelconnection.TokenBucket.for_realm("other.realm", rate=5)
+    assert first is second
+    assert first is not other
+    assert second.rate == 5
+
+
+def test_file_bucket_shared_between_instances(clock, tmpdir):
+    path = os.path.join(str(tmpdir), "realm.bucket")
+    first = steelconnection.FileTokenBucket(path, rate=1, burst=2)
+    second = steelconnection.FileTokenBucket(path, rate=1, burst=2)
+    assert first.acquire() == 0.0
+    assert second.acquire() == 0.0
+    assert first.acquire() == pytest.approx(1.0)
+
+
+@responses.activate
+def test_every_request_acquires_a_token(clock):
+    responses.add(
+        responses.GET, "https://some.realm/api/scm.config/1.0/orgs", json={}, status=200
+    )
+    bucket = steelconnection.TokenBucket(rate=1, burst=1)
+    sc = steelconnection.SConnect(
+        "some.realm", connection_attempts=0, rate_limit=bucket
+    )
+    sc.get("orgs")
+    sc.get("orgs")
+    assert clock.sleeps == [pytest.approx(1.0)]
@@ -0,0 +1,83 @@
+# coding: utf-8
+
+import json
+
+import pytest
+import responses
+import steelconnection
+from steelconnection.changes import fingerprint
+from steelconnection.records import Compactor, Record
+
+
+nodes = [
+    {
+        "id": "node-{}".format(index),
+        "org": "org-" + "1" * 3,
+        "model": "panda",
+        "location": None,
+    }
+    for index in range(3)
+]
+
+
+def test_record_reads_like_a_dict():
+    compactor = Compactor()
+    record = compactor.record("nodes", nodes[0])
+    assert isinstance(record, Record)
+    assert type(record).__name__ == "Node"
+    assert record == nodes[0]
+    assert record["id"] == "node-0"
+    assert record.get("location", "x") is None
+    assert record.get("missing") is None
+    assert "org" in record and "missing" not in record
+    assert sorted(record) == sorted(nodes[0])
+    assert len(record) == 4
+    assert record.to_dict() == nodes[0]
+    assert dict(record.items()) == nodes[0]
+    with pytest.raises(KeyError):
+        record["missing"]
+    assert not hasattr(record, "__dict__")
+
+
+def test_records_with_other_fields():
+    compactor = Compactor()
+    first, second = compactor.compact("nodes", [{"a": 1, "b": 2}, {"a": 3, "c": 4}])
+    assert first == {"a": 1, "b": 2}
+    assert second == {"a": 3, "c": 4}
+    assert "b" not in second
+    assert type(first) is type(second)
+
+
+def test_repeated_strings_are_shared():
+    compactor = Compactor()
+    values = [{"org": "".join(["org-", "abc"])} for _ in range(3)]
+    records = compactor.compact("nodes", values)
+    assert records[0]["org"] is records[2]["org"]
+
+
+def test_distinct_strings_stop_pooling():
+    compactor = Compactor()
+    compactor.compact("nodes", [{"serial": "XN{}".format(i)} for i in range(2000)])
+    assert compactor._pools["nodes"]["serial"].values is None
+
+
+def test_fingerprint_of_record():
+    record = Compactor().record("nodes", nodes[1])
+    assert fingerprint(record) == fingerprint(nodes[1])
+
+
+base = "https://some.realm/api/scm.config/1.0/"
+
+
+@responses.activate
+def test_sconnect_compact():
+    responses.add(responses.GET, base + "nodes", json={"items": nodes}, status=200)
+    responses.add(responses.PUT, base + "node/node-1", json=nodes[1], status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, compact=True)
+    result = sc.get("nodes")
+    assert all(isinstance(record, Record) for record in result)
+    assert result == nodes
+    assert list(sc.iter_get("nodes")) == nodes
+    assert sc.lookup.find_one("nodes", {"id": "node-1"}) == nodes[1]
+    sc.put("node/node-1", data=result[1])
+    assert json.loads(responses.calls[-1].request.body) == nodes[1]
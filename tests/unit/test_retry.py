@@ -0,0 +1,141 @@
+# coding: utf-8
+
+import time
+
+import pytest
+import requests
+import responses
+import steelconnection
+from steelconnection.retry import NO_RETRY, Retry, _retry_after
+
+
+url = "https://some.realm/api/scm.config/1.0/orgs"
+orgs = {"items": [{"id": "org-12345", "name": "WineAndCheese"}]}
+
+
+class NameSpace:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(time, "sleep", delays.append)
+    return delays
+
+
+@responses.activate
+def test_no_retry_by_default(sleeps):
+    responses.add(responses.GET, url, status=503)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    with pytest.raises(RuntimeError):
+        sc.get("orgs")
+    assert len(responses.calls) == 1
+    assert sc.retries == 0
+    assert sleeps == []
+
+
+@responses.activate
+def test_retry_on_status_code(sleeps):
+    responses.add(responses.GET, url, status=502)
+    responses.add(responses.GET, url, status=503)
+    responses.add(responses.GET, url, json=orgs, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, retry=3)
+    assert sc.get("orgs") == orgs["items"]
+    assert len(responses.calls) == 3
+    assert sc.retries == 2
+    assert len(sleeps) == 2
+
+
+@responses.activate
+def test_retry_gives_up_after_attempts(sleeps):
+    responses.add(responses.GET, url, status=503)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, retry=2)
+    with pytest.raises(RuntimeError):
+        sc.get("orgs")
+    assert len(responses.calls) == 2
+    assert sc.retries == 1
+
+
+@responses.activate
+def test_retry_on_connection_error(sleeps):
+    responses.add(responses.GET, url, body=requests.ConnectionError("reset"))
+    responses.add(responses.GET, url, json=orgs, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, retry=3)
+    assert sc.get("orgs") == orgs["items"]
+    assert sc.retries == 1
+
+
+@responses.activate
+def test_connection_error_raised_when_attempts_exhausted(sleeps):
+    responses.add(responses.GET, url, body=requests.ConnectionError("reset"))
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, retry=2)
+    with pytest.raises(requests.ConnectionError):
+        sc.get("orgs")
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_post_not_retried_unless_enabled(sleeps):
+    responses.add(responses.POST, url, status=503)
+    responses.add(responses.POST, url, json={}, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, retry=3)
+    with pytest.raises(RuntimeError):
+        sc.post("orgs", data={"name": "new"})
+    assert len(responses.calls) == 1
+    responses.reset()
+    responses.add(responses.POST, url, status=503)
+    responses.add(responses.POST, url, json={}, status=200)
+    sc.retry = Retry(attempts=3, retry_post=True)
+    assert sc.post("orgs", data={"name": "new"}) == {}
+    assert sc.retries == 1
+
+
+@responses.activate
+def test_retry_after_header_is_honored(sleeps):
+    responses.add(responses.GET, url, status=429, headers={"Retry-After": "7"})
+    responses.add(responses.GET, url, json=orgs, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, retry=3)
+    sc.get("orgs")
+    assert sleeps == [7.0]
+
+
+@responses.activate
+def test_long_retry_after_gives_up(sleeps):
+    responses.add(responses.GET, url, status=503, headers={"Retry-After": "3600"})
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, retry=3)
+    with pytest.raises(RuntimeError):
+        sc.get("orgs")
+    assert len(responses.calls) == 1
+
+
+def test_backoff_uses_full_jitter_with_cap():
+    retry = Retry(attempts=10, backoff_base=1, backoff_cap=8)
+    for retries in range(10):
+        delay = retry.backoff(retries)
+        assert 0 <= delay <= min(8, 2 ** retries)
+
+
+def test_retry_after_parses_http_dates():
+    header = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    assert _retry_after(NameSpace(header)) == 0.0
+    assert _retry_after(NameSpace({"Retry-After": "2.5"})) == 2.5
+    assert _retry_after(NameSpace({"Retry-After": "soon"})) is None
+    assert _retry_after(NameSpace({})) is None
+
+
+def test_retry_requires_an_attempt():
+    with pytest.raises(ValueError):
+        Retry(attempts=0)
+
+
+@pytest.mark.parametrize("retry", [False, 0, -1, None])
+def test_retry_disabled_values(retry):
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, retry=retry)
+    assert sc.retry is NO_RETRY
+
+
+def test_retry_true_uses_default_policy():
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, retry=True)
+    assert sc.retry.attempts == Retry().attempts
@@ -0,0 +1,91 @@
+# coding: utf-8
+
+import pytest
+import responses
+import steelconnection
+from steelconnection.search import SearchIndex
+
+
+nodes = [
+    {"id": "node-1", "serial": "XNABCD0123456789", "name": "Skypad North"},
+    {"id": "node-2", "serial": "XNABCD9876543210", "name": "skypad south"},
+    {"id": "node-3", "serial": "XNZZZZ0000000000", "name": "Hoth"},
+    {"id": "node-4", "serial": None, "name": ["not", "text"]},
+    {"id": "node-5"},
+]
+
+
+def ids(objects):
+    return [obj["id"] for obj in objects]
+
+
+def test_startswith():
+    index = SearchIndex(nodes, ("serial", "name"))
+    assert ids(index.startswith("xnabcd")) == ["node-1", "node-2"]
+    assert ids(index.startswith("XNABCD98")) == ["node-2"]
+    assert ids(index.startswith("sky")) == ["node-1", "node-2"]
+    assert ids(index.startswith("XN", limit=2)) == ["node-1", "node-2"]
+    assert index.startswith("Endor") == []
+    assert ids(index.startswith("")) == ["node-3", "node-1", "node-2"]  # By value.
+
+
+def test_startswith_reports_each_object_once():
+    index = SearchIndex(
+        [{"id": "a", "serial": "XN1", "name": "xn1"}], ("serial", "name")
+    )
+    assert ids(index.startswith("xn")) == ["a"]
+
+
+def test_contains():
+    index = SearchIndex(nodes, ("serial", "name"), substring=True)
+    assert ids(index.contains("PAD")) == ["node-1", "node-2"]
+    assert ids(index.contains("pad no")) == ["node-1"]
+    assert ids(index.contains("0000")) == ["node-3"]
+    assert ids(index.contains("oth")) == ["node-3"]
+    assert ids(index.contains("ot")) == ["node-3"]  # Shorter than an n-gram.
+    assert ids(index.contains("XNABCD", limit=1)) == ["node-1"]
+    assert index.contains("padx") == []
+    assert index.contains("yoda") == []
+
+
+def test_contains_checks_candidates():
+    # Both n-grams of 'abcab' are in 'xabcx cabx', but not the text itself.
+    index = SearchIndex([{"id": "a", "name": "xabcx cabx"}], ("name",), substring=True)
+    assert index.contains("abcab") == []
+    assert ids(index.contains("abcx c")) == ["a"]
+
+
+def test_contains_needs_substring_index():
+    index = SearchIndex(nodes, ("serial",))
+    with pytest.raises(ValueError):
+        index.contains("abcd")
+
+
+@responses.activate
+def test_lookup_search_index_with_inventory():
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, inventory=True)
+    responses.add(
+        responses.GET,
+        "https://some.realm/api/scm.config/1.0/nodes",
+        json={"items": nodes},
+        status=200,
+    )
+    index = sc.lookup.search_index("nodes", substring=True)
+    assert ids(index.startswith("xnzz")) == ["node-3"]
+    assert sc.lookup.search_index("nodes", substring=True) is index
+    assert sc.lookup.search_index("nodes") is not index
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_lookup_search_index_without_inventory():
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    responses.add(
+        responses.GET,
+        "https://some.realm/api/scm.config/1.0/nodes",
+        json={"items": nodes},
+        status=200,
+    )
+    index = sc.lookup.search_index("nodes", fields=("name",))
+    assert ids(index.startswith("SKY")) == ["node-1", "node-2"]
+    assert index.startswith("XN") == []
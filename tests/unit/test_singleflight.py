@@ -0,0 +1,87 @@
+# coding: utf-8
+
+import json
+import threading
+import time
+
+import pytest
+import responses
+import steelconnection
+from steelconnection.singleflight import SingleFlight
+
+
+url = "https://some.realm/api/scm.config/1.0/orgs"
+orgs = {"items": [{"id": "org-12345", "name": "WineAndCheese"}]}
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.001)
+
+
+def run_threads(target, count):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+
+@responses.activate
+def test_concurrent_identical_gets_are_coalesced():
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, coalesce=True)
+
+    def callback(request):
+        wait_for(lambda: sc.singleflight.collapsed == 9)
+        return 200, {"Content-Type": "application/json"}, json.dumps(orgs)
+
+    responses.add_callback(responses.GET, url, callback=callback)
+    results = []
+    run_threads(lambda: results.append(sc.lookup.org("WineAndCheese")), 10)
+    assert len(responses.calls) == 1
+    assert results == [orgs["items"][0]] * 10
+    assert sc.singleflight.stats() == {"executed": 1, "collapsed": 9, "in_flight": 0}
+
+
+@responses.activate
+def test_errors_are_shared_with_waiters():
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, coalesce=True)
+
+    def callback(request):
+        wait_for(lambda: sc.singleflight.collapsed == 4)
+        return 404, {}, ""
+
+    responses.add_callback(responses.GET, url, callback=callback)
+    errors = []
+
+    def get_orgs():
+        try:
+            sc.get("orgs")
+        except steelconnection.InvalidResource as e:
+            errors.append(e)
+
+    run_threads(get_orgs, 5)
+    assert len(responses.calls) == 1
+    assert len(errors) == 5
+
+
+@responses.activate
+def test_sequential_gets_are_not_coalesced():
+    responses.add(responses.GET, url, json=orgs, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, coalesce=True)
+    sc.get("orgs")
+    sc.get("orgs")
+    assert len(responses.calls) == 2
+    assert sc.singleflight.collapsed == 0
+
+
+def test_leader_exception_propagates():
+    group = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        group.do("key", fail)
+    assert group.do("key", lambda: 42) == 42
@@ -0,0 +1,142 @@
+# coding: utf-8
+
+import pytest
+import responses
+import steelconnection
+from steelconnection import snapshot as snapshot_module
+from steelconnection.snapshot import Snapshot
+
+
+nodes = [
+    {
+        "id": "node-{}".format(index),
+        "site": "site-{}".format(index % 3),
+        "model": ("panda", "yogi")[index % 2],
+        "state": "offline" if index % 5 == 0 else "online",
+        "uptime": index * 10,
+        "uplinks": ["uplink-{}".format(index)] if index % 4 == 0 else None,
+        "enabled": index % 3 != 0,
+    }
+    for index in range(400)
+]
+nodes.append({"id": "node-odd", "model": "ewok"})
+
+backends = [False]
+if snapshot_module.numpy is not None:
+    backends.append(True)
+
+
+@pytest.fixture(params=backends, ids=lambda value: "numpy" if value else "array")
+def snap(request):
+    return Snapshot.from_objects(nodes, use_numpy=request.param)
+
+
+def expected_count(predicate):
+    return sum(1 for node in nodes if predicate(node))
+
+
+def test_columns(snap):
+    assert len(snap) == len(nodes)
+    assert snap.fields == [
+        "id",
+        "site",
+        "model",
+        "state",
+        "uptime",
+        "uplinks",
+        "enabled",
+    ]
+    assert snap["model"] == [node["model"] for node in nodes]
+    assert snap["uptime"] == [node.get("uptime") for node in nodes]
+    assert snap["uplinks"] == [node.get("uplinks") for node in nodes]
+    assert list(snap.rows())[-1] == {"id": "node-odd", "model": "ewok"}
+    assert "site" in snap
+
+
+def test_filter_and_count(snap):
+    offline = snap.filter(state="offline")
+    assert len(offline) == expected_count(lambda n: n.get("state") == "offline")
+    assert offline.count(model="panda") == expected_count(
+        lambda n: n.get("state") == "offline" and n["model"] == "panda"
+    )
+    assert snap.count(site=["site-1", "site-2"]) == expected_count(
+        lambda n: n.get("site") in ("site-1", "site-2")
+    )
+    assert snap.count(enabled=True) == expected_count(
+        lambda n: n.get("enabled") is True
+    )
+    assert snap.count(site=None) == 1
+    assert snap.count() == len(nodes)
+
+
+@pytest.mark.parametrize(
+    "op, value, predicate",
+    [
+        (">", 3000, lambda v: v is not None and v > 3000),
+        ("<=", 100, lambda v: v is not None and v <= 100),
+        ("==", None, lambda v: v is None),
+        ("!=", 10, lambda v: v != 10),
+        ("in", [0, 10, 20], lambda v: v in (0, 10, 20)),
+    ],
+)
+def test_where_numbers(snap, op, value, predicate):
+    assert len(snap.where("uptime", op, value)) == expected_count(
+        lambda n: predicate(n.get("uptime"))
+    )
+
+
+@pytest.mark.parametrize("field", ["uptime", "model", "uplinks"])
+@pytest.mark.parametrize("op", ["<", "<=", ">", ">="])
+def test_where_none_is_never_ordered(snap, field, op):
+    assert len(snap.where(field, op, None)) == 0
+
+
+def test_where_none_equality(snap):
+    assert len(snap.where("uptime", "!=", None)) == 400
+    assert len(snap.where("model", "!=", None)) == 401
+    assert len(snap.where("model", "==", None)) == 0
+
+def test_where_unknown_operator(snap):
+    with pytest.raises(ValueError):
+        snap.where("model", "~", "panda")
+
+
+def test_group_count(snap):
+    assert snap.group_count("model") == {"panda": 200, "yogi": 200, "ewok": 1}
+    by_site_state = snap.group_count("site", "state")
+    assert sum(by_site_state.values()) == len(nodes)
+    assert by_site_state[("site-0", "offline")] == expected_count(
+        lambda n: n.get("site") == "site-0" and n.get("state") == "offline"
+    )
+    assert by_site_state[(None, None)] == 1
+
+
+def test_map(snap):
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    translated = snap.map("model", sc.lookup.model, name="model_name")
+    assert translated.group_count("model_name") == {
+        "SDI-130": 200,
+        "SDI-VGW": 200,
+        "SDI-330": 1,
+    }
+    merged = snap.map("model", {"panda": "small", "yogi": "small"})
+    assert merged.group_count("model") == {"small": 400, "ewok": 1}
+
+
+def test_memory_is_compact(snap):
+    assert snap.nbytes < sum(len(repr(node)) for node in nodes)
+
+
+@responses.activate
+def test_lookup_snapshot():
+    responses.add(
+        responses.GET,
+        "https://some.realm/api/scm.config/1.0/nodes",
+        json={"items": nodes},
+        status=200,
+    )
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    snap = sc.lookup.snapshot("nodes", fields=["model", "missing"])
+    assert snap.fields == ["model", "missing"]
+    assert snap.group_count("model")["ewok"] == 1
+    assert snap.count(missing=None) == len(nodes)
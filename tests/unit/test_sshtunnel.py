@@ -0,0 +1,123 @@
+# coding: utf-8
+
+import json
+import time
+
+import pytest
+import responses
+import steelconnection
+from steelconnection import api
+
+
+config = "https://some.realm/api/scm.config/1.0/"
+reporting = "https://some.realm/api/scm.reporting/1.0/"
+
+
+@pytest.fixture
+def fast_polls(monkeypatch):
+    monkeypatch.setattr(api, "SSHTUNNEL_POLL", 0.01)
+    monkeypatch.setattr(api, "SSHTUNNEL_MAX_POLL", 0.04)
+
+
+def add_node(node_id, state="online", polls_until_connected=2):
+    """Answer 404 until a POST, then 'pending' until connected."""
+    polls = {"count": 0, "posted": False}
+
+    def get_tunnel(request):
+        if not polls["posted"]:
+            return 404, {}, json.dumps({"error": {"message": "no tunnel"}})
+        polls["count"] += 1
+        status = "connected" if polls["count"] >= polls_until_connected else "pending"
+        return 200, {}, json.dumps({"status": status})
+
+    def post_tunnel(request):
+        polls["posted"] = True
+        return 200, {}, json.dumps({"status": "pending"})
+
+    responses.add(responses.GET, reporting + "node/" + node_id, json={"state": state})
+    responses.add_callback(responses.GET, config + "sshtunnel/" + node_id, get_tunnel)
+    responses.add_callback(responses.POST, config + "sshtunnel/" + node_id, post_tunnel)
+    responses.add(responses.DELETE, config + "sshtunnel/" + node_id, json={})
+    return polls
+
+
+@responses.activate
+def test_sshtunnel_backs_off(fast_polls, monkeypatch):
+    waits = []
+    monkeypatch.setattr(api.time, "sleep", waits.append)
+    polls = add_node("node-1", polls_until_connected=4)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    assert sc.sshtunnel("node-1") == {"status": "connected"}
+    assert polls["count"] == 4
+    assert waits == [0.01, 0.02, 0.04, 0.04]
+
+
+@responses.activate
+def test_sshtunnel_times_out(fast_polls):
+    add_node("node-1", polls_until_connected=1000)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    assert sc.sshtunnel("node-1", timeout=0.1) == {"status": "pending"}
+
+
+@responses.activate
+def test_sshtunnel_restart_delay(fast_polls, monkeypatch):
+    waits = []
+    monkeypatch.setattr(api.time, "sleep", waits.append)
+    add_node("node-1", polls_until_connected=1)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    assert (
+        sc.sshtunnel("node-1", restart=True, restart_delay=1.5)["status"] == "connected"
+    )
+    assert waits[0] == 1.5
+    assert responses.calls[1].request.method == "DELETE"
+
+
+@responses.activate
+def test_sshtunnels(fast_polls):
+    for index in range(6):
+        add_node("node-{}".format(index), polls_until_connected=index % 3 + 1)
+    add_node("node-off", state="offline")
+    responses.add(
+        responses.GET,
+        reporting + "node/nonesuch",
+        json={"error": {"message": "not found"}},
+        status=404,
+    )
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    node_ids = ["node-{}".format(index) for index in range(6)]
+    node_ids += ["node-off", "nonesuch"]
+    results = sc.sshtunnels(node_ids, timeout=5, workers=4)
+    assert [item.node_id for item in results] == node_ids
+    assert [item.status for item in results] == ["connected"] * 6 + ["offline", "error"]
+    assert all(item.error is None for item in results[:7])
+    assert isinstance(results[7].error, steelconnection.InvalidResource)
+    assert all(0 <= item.elapsed < 5 for item in results)
+    assert results[0].tunnel == {"status": "connected"}
+
+
+@responses.activate
+def test_sshtunnels_share_one_deadline(fast_polls):
+    for index in range(4):
+        add_node("node-{}".format(index), polls_until_connected=1000)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    node_ids = ["node-{}".format(index) for index in range(4)]
+    results = sc.sshtunnels(node_ids, timeout=0.2, workers=2)
+    # The last two are reached when the first two give up, with no time left.
+    assert [item.status for item in results] == ["pending"] * 2 + ["timeout"] * 2
+    assert all(item.elapsed < 0.3 for item in results)
+    assert [item.tunnel for item in results[2:]] == [None, None]
+    assert not [call for call in responses.calls if "node-2" in call.request.url]
+
+
+@responses.activate
+def test_sshtunnels_restart_delay_ends_at_deadline(fast_polls):
+    for index in range(3):
+        add_node("node-{}".format(index), polls_until_connected=1000)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    node_ids = ["node-{}".format(index) for index in range(3)]
+    started = time.time()
+    results = sc.sshtunnels(
+        node_ids, timeout=0.2, restart=True, restart_delay=0.5, workers=1
+    )
+    assert time.time() - started < 0.4
+    assert [item.status for item in results] == ["pending", "timeout", "timeout"]
@@ -0,0 +1,80 @@
+# coding: utf-8
+
+import json
+
+import pytest
+import responses
+import steelconnection
+from steelconnection.exceptions import InvalidResource
+from steelconnection.streaming import _iter_items
+
+
+base = "https://some.realm/api/scm.config/1.0/"
+nodes = {
+    "items": [
+        {"id": "node-{}".format(index), "serial": "XN{:014d}".format(index)}
+        for index in range(200)
+    ]
+}
+
+
+def chunked(document, size):
+    data = json.dumps(document).encode("utf-8")
+    return [data[index : index + size] for index in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64, 100000])
+def test_iter_items_across_chunk_boundaries(size):
+    document = {"total": 12345, "items": [{"name": "Café", "n": -1.5e3}, 12345, None]}
+    assert list(_iter_items(chunked(document, size))) == document["items"]
+
+
+def test_iter_items_other_documents():
+    assert list(_iter_items(chunked([1, 2, 3], 2))) == [1, 2, 3]
+    assert list(_iter_items(chunked({"a": 1}, 3))) == [{"a": 1}]
+    assert list(_iter_items(chunked({"items": []}, 3))) == []
+    assert list(_iter_items(chunked({}, 3))) == []
+
+
+def test_iter_items_stops_reading_early():
+    chunks = iter(chunked(nodes, 16))
+    items = _iter_items(chunks)
+    assert next(items) == nodes["items"][0]
+    assert len(list(chunks)) > 100  # The rest was never read.
+
+
+def test_iter_items_truncated_document():
+    with pytest.raises(ValueError):
+        list(_iter_items([b'{"items": [{"id": 1}, ']))
+
+
+@responses.activate
+def test_iter_get_yields_items():
+    responses.add(responses.GET, base + "nodes", json=nodes, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    assert list(sc.iter_get("nodes")) == nodes["items"]
+    assert sc.response.status_code == 200
+
+
+@responses.activate
+def test_iter_get_raises_on_error():
+    responses.add(responses.GET, base + "nodes", json={"error": "nope"}, status=404)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    with pytest.raises(InvalidResource):
+        list(sc.iter_get("nodes"))
+
+
+@responses.activate
+def test_iter_get_uses_cache():
+    responses.add(responses.GET, base + "nodes", json=nodes, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, cache=True)
+    assert list(sc.iter_get("nodes")) == nodes["items"]
+    assert list(sc.iter_get("nodes")) == nodes["items"]
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_lookup_short_circuits_on_stream():
+    responses.add(responses.GET, base + "nodes", json=nodes, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    assert sc.lookup.node("xn00000000000003") == nodes["items"][3]
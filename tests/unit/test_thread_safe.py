@@ -0,0 +1,81 @@
+# coding: utf-8
+
+import threading
+
+import responses
+import steelconnection
+
+
+get_orgs = responses.Response(
+    method="GET",
+    url="https://some.realm/api/scm.config/1.0/orgs",
+    json={"items": [{"id": "org-12345", "name": "WineAndCheese"}]},
+    status=200,
+)
+
+get_nonesuch = responses.Response(
+    method="GET",
+    url="https://some.realm/api/scm.config/1.0/nonesuch",
+    json={"error": {"message": "nonesuch", "code": 404}},
+    status=404,
+)
+
+
+def interleave(sc):
+    """Succeed in one thread while another fails, then inspect both."""
+    first_done = threading.Event()
+    second_done = threading.Event()
+    seen = {}
+
+    def succeed():
+        sc.get("orgs")
+        first_done.set()
+        second_done.wait(5)
+        seen["ok"] = (bool(sc), sc.response.url, sc.result)
+
+    def fail():
+        first_done.wait(5)
+        try:
+            sc.get("nonesuch")
+        except steelconnection.InvalidResource as e:
+            seen["error"] = str(e)
+        seen["failed"] = (bool(sc), sc.received)
+        second_done.set()
+
+    threads = [threading.Thread(target=succeed), threading.Thread(target=fail)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return seen
+
+
+@responses.activate
+def test_thread_safe_keeps_response_per_thread():
+    responses.add(get_orgs)
+    responses.add(get_nonesuch)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, thread_safe=True)
+    seen = interleave(sc)
+    ok, url, result = seen["ok"]
+    assert ok
+    assert url.endswith("/orgs")
+    assert result == [{"id": "org-12345", "name": "WineAndCheese"}]
+    failed, received = seen["failed"]
+    assert not failed
+    assert "nonesuch" in received
+    assert "nonesuch" in seen["error"]
+    # The main thread has made no requests of its own.
+    assert sc.response is None
+    assert not sc
+
+
+@responses.activate
+def test_default_mode_shares_last_response():
+    responses.add(get_orgs)
+    responses.add(get_nonesuch)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    seen = interleave(sc)
+    ok, url, result = seen["ok"]
+    assert not ok
+    assert url.endswith("/nonesuch")
+    assert sc.response is not None
@@ -0,0 +1,182 @@
+# coding: utf-8
+
+import os
+
+import pytest
+from steelconnection import timeseries
+from steelconnection.timeseries import Recorder
+
+
+def samples(count, start=1000.0, step=60):
+    for index in range(count):
+        yield start + index * step, {
+            "link": index % 7 != 0,
+            "speed": 1000 if index % 2 else 100,
+            "state": ("online", "offline", "unknown")[index % 3],
+            "latency": index / 4.0,
+            "ignored": {"nested": True},
+            "missing": None,
+        }
+
+
+def test_query_and_kinds():
+    recorder = Recorder()
+    for timestamp, sample in samples(10):
+        recorder.record("port/port-1", sample, timestamp=timestamp)
+    assert recorder.metrics() == [
+        ("port/port-1", "latency"),
+        ("port/port-1", "link"),
+        ("port/port-1", "speed"),
+        ("port/port-1", "state"),
+    ]
+    assert recorder.query("port/port-1", "link")[:2] == [
+        (1000.0, False),
+        (1060.0, True),
+    ]
+    assert recorder.query("port/port-1", "speed", start=1060, end=1180) == [
+        (1060.0, 1000),
+        (1120.0, 100),
+    ]
+    assert recorder.query("port/port-1", "state", start=1170)[0] == (1180.0, "online")
+    assert recorder.query("port/port-1", "latency")[-1] == (1540.0, 2.25)
+    assert recorder.query("port/port-2", "link") == []
+    assert len(recorder) == 40
+
+
+def test_ring_keeps_latest_samples():
+    recorder = Recorder(capacity=5)
+    for timestamp, sample in samples(12):
+        recorder.record("node/node-1", sample, timestamp=timestamp, fields=("speed",))
+    times = [t for t, _ in recorder.query("node/node-1", "speed")]
+    assert times == [1000.0 + 60 * index for index in range(7, 12)]
+    assert [
+        t for t, _ in recorder.query("node/node-1", "speed", start=1500, end=1630)
+    ] == [
+        1540.0,
+        1600.0,
+    ]
+
+
+def test_out_of_order_and_wrong_kind():
+    recorder = Recorder()
+    recorder.add("node/node-1", "state", "online", timestamp=100)
+    with pytest.raises(ValueError):
+        recorder.add("node/node-1", "state", "online", timestamp=99)
+    with pytest.raises(TypeError):
+        recorder.add("node/node-1", "state", 3, timestamp=101)
+    with pytest.raises(TypeError):
+        recorder.add("node/node-1", "uplinks", ["a"], timestamp=101)
+
+
+def test_downsample():
+    recorder = Recorder()
+    for timestamp, sample in samples(120, start=0):
+        recorder.record("port/port-1", sample, timestamp=timestamp)
+    hourly = recorder.downsample("port/port-1", "speed", step=3600)
+    assert hourly == [(0, 550.0), (3600, 550.0)]
+    assert recorder.downsample("port/port-1", "speed", 3600, how="max") == [
+        (0, 1000),
+        (3600, 1000),
+    ]
+    assert recorder.downsample("port/port-1", "state", 3600) == [
+        (0, "unknown"),
+        (3600, "unknown"),
+    ]
+    assert recorder.downsample(
+        "port/port-1", "link", 3600, how="count", start=3600
+    ) == [(3600, 60)]
+    assert recorder.downsample("port/port-1", "link", 3600, how="first") == [
+        (0, False),
+        (3600, True),
+    ]
+    with pytest.raises(ValueError):
+        recorder.downsample("port/port-1", "state", 3600, how="mean")
+    with pytest.raises(ValueError):
+        recorder.downsample("port/port-1", "speed", 3600, how="median")
+
+
+def test_file_round_trip(tmpdir):
+    path = str(tmpdir.join("fleet.tsr"))
+    with Recorder(path, block_size=16) as recorder:
+        for timestamp, sample in samples(50):
+            recorder.record("port/port-1", sample, timestamp=timestamp)
+            recorder.record("port/port-2", sample, timestamp=timestamp + 1)
+        expected = recorder.query("port/port-2", "state")
+    loaded = Recorder(path)
+    assert loaded.metrics() == recorder.metrics()
+    assert loaded.query("port/port-2", "state") == expected
+    assert loaded.query("port/port-1", "latency") == recorder.query(
+        "port/port-1", "latency"
+    )
+    assert loaded.query("port/port-1", "link") == recorder.query("port/port-1", "link")
+
+    # Appending after a reload keeps the string and metric codes.
+    loaded.add("port/port-1", "state", "degraded", timestamp=10000)
+    loaded.add("port/port-9", "state", "online", timestamp=10000)
+    loaded.close()
+    again = Recorder(path)
+    assert again.query("port/port-1", "state")[-1] == (10000.0, "degraded")
+    assert again.query("port/port-9", "state") == [(10000.0, "online")]
+    again.close()
+
+
+def test_compact_on_disk(tmpdir):
+    path = str(tmpdir.join("fleet.tsr"))
+    with Recorder(path) as recorder:
+        for timestamp, sample in samples(1000):
+            recorder.record(
+                "port/port-1", sample, timestamp=timestamp, fields=("link", "state")
+            )
+    # Two metrics of 1000 samples: 1 byte per steady timestamp, 1 per value.
+    assert os.path.getsize(path) < 2 * 1000 * 2 + 400
+
+
+def test_read_range_from_file(tmpdir):
+    path = str(tmpdir.join("fleet.tsr"))
+    with Recorder(path, block_size=10) as recorder:
+        for timestamp, sample in samples(100):
+            recorder.record("port/port-1", sample, timestamp=timestamp)
+            recorder.record("port/port-2", sample, timestamp=timestamp)
+    rows = list(
+        timeseries.read(path, series="port/port-2", field="speed", start=2200, end=2500)
+    )
+    assert rows == [
+        ("port/port-2", "speed", 2200.0, 100),
+        ("port/port-2", "speed", 2260.0, 1000),
+        ("port/port-2", "speed", 2320.0, 100),
+        ("port/port-2", "speed", 2380.0, 1000),
+        ("port/port-2", "speed", 2440.0, 100),
+    ]
+    assert len(list(timeseries.read(path, field="state"))) == 200
+
+
+def test_truncated_file_is_repaired(tmpdir):
+    path = str(tmpdir.join("fleet.tsr"))
+    with Recorder(path, block_size=5) as recorder:
+        for timestamp, sample in samples(20):
+            recorder.record(
+                "port/port-1", sample, timestamp=timestamp, fields=("speed",)
+            )
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.truncate(size - 3)
+    recorder = Recorder(path)
+    assert len(recorder.query("port/port-1", "speed")) == 15
+    recorder.add("port/port-1", "speed", 10, timestamp=5000)
+    recorder.close()
+    assert Recorder(path).query("port/port-1", "speed")[-1] == (5000.0, 10)
+
+
+def test_not_a_recorder_file(tmpdir):
+    path = tmpdir.join("other.txt")
+    path.write("hello")
+    with pytest.raises(ValueError):
+        Recorder(str(path))
+
+
+def test_varints():
+    for number in (0, 1, -1, 63, -64, 127, 128, 60000, -60000, 2**40):
+        encoded = timeseries._varint(timeseries._zigzag(number))
+        decoded, offset = timeseries._read_varint(bytearray(encoded), 0)
+        assert timeseries._unzigzag(decoded) == number
+        assert offset == len(encoded)
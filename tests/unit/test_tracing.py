@@ -0,0 +1,74 @@
+# coding: utf-8
+
+import logging
+
+import responses
+import steelconnection
+from steelconnection.tracing import RequestLogger
+
+
+url = "https://some.realm/api/scm.config/1.0/nodes"
+nodes = {"items": [{"id": "node-{}".format(index)} for index in range(200)]}
+
+
+class ExplodingResponse(object):
+    """Fails the test if anything touches the response."""
+
+    def __getattr__(self, name):
+        raise AssertionError("response." + name + " accessed")
+
+
+def test_nothing_evaluated_when_disabled():
+    logger = logging.getLogger("test_tracing.disabled")
+    logger.setLevel(logging.WARNING)
+    RequestLogger(logger).log(ExplodingResponse())
+
+
+@responses.activate
+def test_structured_fields_at_info(caplog):
+    responses.add(responses.GET, url, json=nodes, status=200)
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0)
+    with caplog.at_level(logging.INFO, logger="steelconnection"):
+        sc.get("nodes")
+    records = [r for r in caplog.records if hasattr(r, "steelconnection")]
+    assert len(records) == 1
+    fields = records[0].steelconnection
+    assert fields["method"] == "GET"
+    assert fields["url"] == url
+    assert fields["status"] == 200
+    assert fields["bytes_received"] == len(sc.response.content)
+    assert fields["bytes_sent"] == 0
+    assert "REQUEST: GET " + url + " -> 200 OK" in records[0].getMessage()
+
+
+@responses.activate
+def test_sampling_keeps_failures(caplog):
+    responses.add(responses.GET, url, json=nodes, status=200)
+    responses.add(
+        responses.GET, "https://some.realm/api/scm.config/1.0/nonesuch", status=404
+    )
+    tracer = RequestLogger(logging.getLogger("test_tracing.sampled"), sample_rate=5)
+    sc = steelconnection.SConnect(
+        "some.realm", connection_attempts=0, on_error=None, request_logger=tracer
+    )
+    with caplog.at_level(logging.INFO, logger="test_tracing.sampled"):
+        for _ in range(10):
+            sc.get("nodes")
+        sc.get("nonesuch")
+    statuses = [r.steelconnection["status"] for r in caplog.records]
+    assert statuses == [200, 200, 404]
+
+
+@responses.activate
+def test_debug_bodies_truncated(caplog):
+    responses.add(responses.GET, url, json=nodes, status=200)
+    tracer = RequestLogger(logging.getLogger("test_tracing.debug"), body_limit=20)
+    sc = steelconnection.SConnect(
+        "some.realm", connection_attempts=0, request_logger=tracer
+    )
+    with caplog.at_level(logging.DEBUG, logger="test_tracing.debug"):
+        sc.get("nodes")
+    text = [r.getMessage() for r in caplog.records if "RESPONSE.text" in r.getMessage()]
+    assert len(text) == 1
+    assert text[0].startswith("RESPONSE.text: '{\"items\": [{\"id\": \"n'...")
+    assert "more bytes" in text[0]
@@ -0,0 +1,88 @@
+# coding: utf-8
+
+import pytest
+import responses
+import steelconnection
+from steelconnection import watch as watch_module
+from steelconnection.watch import _watch
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    waits = []
+    monkeypatch.setattr(watch_module, "_sleep", waits.append)
+    return waits
+
+
+def replay(*versions):
+    versions = list(versions)
+
+    def fetch():
+        return versions.pop(0) if len(versions) > 1 else versions[0]
+
+    return fetch
+
+
+def test_yields_only_changes(sleeps):
+    fetch = replay(
+        [{"id": "node-1", "state": "online"}, {"id": "node-2", "state": "online"}],
+        [{"id": "node-1", "state": "online"}, {"id": "node-2", "state": "online"}],
+        [{"id": "node-1", "state": "offline"}, {"id": "node-3", "state": "online"}],
+    )
+    changes = next(_watch(fetch, "nodes", "id", 1, 8, 2))
+    assert [obj["id"] for obj in changes.added] == ["node-3"]
+    assert [obj["id"] for obj in changes.removed] == ["node-2"]
+    assert changes.changed[0].id == "node-1"
+    assert changes.changed[0].fields == {"state": ("online", "offline")}
+    assert sleeps == [1, 2]
+
+
+def test_interval_backs_off_and_resets(sleeps):
+    online = [{"id": "node-1", "state": "online"}]
+    offline = [{"id": "node-1", "state": "offline"}]
+    fetch = replay(*([online] * 6 + [offline, offline, online]))
+    watcher = _watch(fetch, "nodes", "id", 1, 8, 2)
+    next(watcher)
+    assert sleeps == [1, 2, 4, 8, 8, 8]
+    next(watcher)
+    assert sleeps[6:] == [1, 2]
+
+
+def test_single_object_changes_fields(sleeps):
+    fetch = replay(
+        {"state": "online", "uptime": 10}, {"state": "offline", "uptime": 10}
+    )
+    changes = next(_watch(fetch, "node/node-1", "id", 1, 8, 2))
+    assert not changes.added and not changes.removed
+    assert changes.changed[0].id == "node/node-1"
+    assert changes.changed[0].fields == {"state": ("online", "offline")}
+
+
+def test_initial(sleeps):
+    fetch = replay([{"id": "node-1"}])
+    changes = next(_watch(fetch, "nodes", "id", 1, 8, 2, initial=True))
+    assert changes.added == [{"id": "node-1"}]
+    assert sleeps == []
+
+
+def test_invalid_intervals():
+    with pytest.raises(ValueError):
+        next(_watch(list, "nodes", "id", 10, 5, 2))
+    with pytest.raises(ValueError):
+        next(_watch(list, "nodes", "id", 1, 5, 0.5))
+
+
+@responses.activate
+def test_sconnect_watch(sleeps):
+    url = "https://some.realm/api/scm.reporting/1.0/node/node-1"
+    responses.add(
+        responses.GET, url, json={"id": "node-1", "state": "online"}, status=200
+    )
+    responses.add(
+        responses.GET, url, json={"id": "node-1", "state": "offline"}, status=200
+    )
+    sc = steelconnection.SConnect("some.realm", connection_attempts=0, cache=True)
+    changes = next(sc.watch("node/node-1", api="scm.reporting", min_interval=0.5))
+    assert changes.changed[0].fields == {"state": ("online", "offline")}
+    assert len(responses.calls) == 2
+    assert sleeps == [0.5]